@@ -2,7 +2,12 @@ import os
 import streamlit as st
 from langchain.globals import set_debug
 from langchain_aws import ChatBedrock
-from langchain_core.messages import AIMessage, HumanMessage, SystemMessage
+from langchain_core.messages import (
+    AIMessage,
+    HumanMessage,
+    SystemMessage,
+    trim_messages,
+)
 from langchain_community.chat_message_histories import DynamoDBChatMessageHistory
 from langchain_core.prompts import ChatPromptTemplate, MessagesPlaceholder
 from langsmith import traceable
@@ -26,6 +31,9 @@ st.title("Bedrock チャット")
 if "session_id" not in st.session_state:
     st.session_state.session_id = "session_id"
 
+# プロンプトに含める履歴の文字数の上限
+HISTORY_MAX_CHARS = 8000
+
 # セッションに履歴を定義
 if "history" not in st.session_state:
     st.session_state.history = DynamoDBChatMessageHistory(
@@ -69,12 +77,22 @@ if prompt := st.chat_input("何でも聞いてください。"):
     with st.chat_message("user"):
         st.markdown(prompt)
     
+    # 文字数の上限に収まる直近の履歴だけをプロンプトに含める
+    # (ユーザーの発言から始まるように切り詰める)
+    recent_messages = trim_messages(
+        st.session_state.history.messages,
+        max_tokens=HISTORY_MAX_CHARS,
+        token_counter=lambda messages: sum(len(str(m.content)) for m in messages),
+        strategy="last",
+        start_on="human",
+    )
+
     # モデルの呼び出しと結果の画面表示
     with st.chat_message("assistant"):
         response = st.write_stream(
             st.session_state.chain.stream(
                 {
-                    "messages": st.session_state.history.messages,
+                    "messages": recent_messages,
                     "human_message": [HumanMessage(content=prompt)],
                 },
                 config={"configurable": {"session_id": st.session_state.session_id}},
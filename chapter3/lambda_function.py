@@ -1,5 +1,9 @@
 from langchain_aws import ChatBedrock
 from langchain_core.messages import HumanMessage, SystemMessage
+from langchain_core.tracers.langchain import wait_for_all_tracers
+
+# トレースの送信に使う最大秒数
+TRACE_FLUSH_TIMEOUT = 2.0
 
 
 # Bedrock呼び出し関数
@@ -22,5 +26,10 @@ def invoke_bedrock(prompt: str):
 
 # Lambda実行時に呼ばれる関数
 def lambda_handler(event, context):
-    result = invoke_bedrock("空が青いのは何故ですか？")
+    try:
+        result = invoke_bedrock("空が青いのは何故ですか？")
+    finally:
+        # 実行環境が凍結される前に、短い時間だけトレースを送信
+        # （送りきれなかったトレースはスプールに残り、次の起動時に再送される）
+        wait_for_all_tracers(timeout=TRACE_FLUSH_TIMEOUT)
     return {"statusCode": 200, "body": result}
\ No newline at end of file
@@ -5,8 +5,10 @@ from __future__ import annotations
 import asyncio
 import json
 import logging
+import threading
 import time
 from abc import abstractmethod
+from concurrent.futures import TimeoutError as FutureTimeoutError
 from pathlib import Path
 from typing import (
     Any,
@@ -27,11 +29,14 @@ from langchain_core.agents import AgentAction, AgentFinish, AgentStep
 from langchain_core.callbacks import (
     AsyncCallbackManagerForChainRun,
     AsyncCallbackManagerForToolRun,
+    BaseCallbackHandler,
     BaseCallbackManager,
+    CallbackManager,
     CallbackManagerForChainRun,
     CallbackManagerForToolRun,
     Callbacks,
 )
+from langchain_core.callbacks.manager import handle_event
 from langchain_core.exceptions import OutputParserException
 from langchain_core.language_models import BaseLanguageModel
 from langchain_core.messages import BaseMessage
@@ -41,8 +46,10 @@ from langchain_core.prompts.few_shot import FewShotPromptTemplate
 from langchain_core.prompts.prompt import PromptTemplate
 from langchain_core.pydantic_v1 import BaseModel, root_validator
 from langchain_core.runnables import Runnable, RunnableConfig, ensure_config
+from langchain_core.runnables.config import ContextThreadPoolExecutor
 from langchain_core.runnables.utils import AddableDict
 from langchain_core.tools import BaseTool
+from langchain_core.tracers.base import BaseTracer
 from langchain_core.utils.input import get_color_mapping
 
 from langchain.agents.agent_iterator import AgentExecutorIterator
@@ -913,6 +920,126 @@ class ExceptionTool(BaseTool):
 NextStepOutput = List[Union[AgentFinish, AgentAction, AgentStep]]
 
 
+_IGNORE_CONDITIONS: Dict[str, Optional[str]] = {
+    "on_llm_start": "ignore_llm",
+    "on_llm_new_token": "ignore_llm",
+    "on_llm_end": "ignore_llm",
+    "on_llm_error": "ignore_llm",
+    "on_chat_model_start": "ignore_chat_model",
+    "on_chain_start": "ignore_chain",
+    "on_chain_end": "ignore_chain",
+    "on_chain_error": "ignore_chain",
+    "on_agent_action": "ignore_agent",
+    "on_agent_finish": "ignore_agent",
+    "on_tool_start": "ignore_agent",
+    "on_tool_end": "ignore_agent",
+    "on_tool_error": "ignore_agent",
+    "on_retriever_start": "ignore_retriever",
+    "on_retriever_end": "ignore_retriever",
+    "on_retriever_error": "ignore_retriever",
+    "on_retry": "ignore_retry",
+    "on_custom_event": "ignore_custom_event",
+    "on_text": None,
+}
+
+
+class _CallbackSequencer:
+    """Emit the callbacks of concurrent tool runs in the order of their actions.
+
+    Callbacks of the earliest unfinished action are emitted as they happen,
+    those of later actions are held until every earlier action is finished.
+    """
+
+    def __init__(self, num_actions: int) -> None:
+        self._lock = threading.Lock()
+        self._head = 0
+        self._held: List[List[Tuple[BaseCallbackHandler, str, tuple, dict]]] = [
+            [] for _ in range(num_actions)
+        ]
+
+    def emit(
+        self,
+        index: int,
+        handler: BaseCallbackHandler,
+        event_name: str,
+        args: tuple,
+        kwargs: dict,
+    ) -> None:
+        with self._lock:
+            if index > self._head:
+                self._held[index].append((handler, event_name, args, kwargs))
+                return
+            handle_event(
+                [handler], event_name, _IGNORE_CONDITIONS[event_name], *args, **kwargs
+            )
+
+    def finish(self, index: int) -> None:
+        """Mark an action finished. Must be called in the order of the actions."""
+        with self._lock:
+            self._head = index + 1
+            if self._head == len(self._held):
+                return
+            held, self._held[self._head] = self._held[self._head], []
+            for handler, event_name, args, kwargs in held:
+                handle_event(
+                    [handler],
+                    event_name,
+                    _IGNORE_CONDITIONS[event_name],
+                    *args,
+                    **kwargs,
+                )
+
+    def callbacks(
+        self, index: int, run_manager: CallbackManagerForChainRun
+    ) -> CallbackManager:
+        """The callbacks of the tool run of the action at `index`.
+
+        Tracers are left as they are, since they order runs by their ids.
+        """
+        child = run_manager.get_child()
+        wrapped: Dict[int, BaseCallbackHandler] = {}
+
+        def wrap(handler: BaseCallbackHandler) -> BaseCallbackHandler:
+            if isinstance(handler, BaseTracer):
+                return handler
+            if id(handler) not in wrapped:
+                wrapped[id(handler)] = _SequencedHandler(self, index, handler)
+            return wrapped[id(handler)]
+
+        child.handlers = [wrap(h) for h in child.handlers]
+        child.inheritable_handlers = [wrap(h) for h in child.inheritable_handlers]
+        return child
+
+
+class _SequencedHandler(BaseCallbackHandler):
+    """Pass the callbacks of a tool run through a `_CallbackSequencer`."""
+
+    run_inline = True
+
+    def __init__(
+        self,
+        sequencer: _CallbackSequencer,
+        index: int,
+        handler: BaseCallbackHandler,
+    ) -> None:
+        self.sequencer = sequencer
+        self.index = index
+        self.handler = handler
+        self.raise_error = handler.raise_error
+
+
+def _make_sequenced_event(event_name: str) -> Callable[..., None]:
+    def event(self: _SequencedHandler, *args: Any, **kwargs: Any) -> None:
+        self.sequencer.emit(self.index, self.handler, event_name, args, kwargs)
+
+    event.__name__ = event_name
+    return event
+
+
+for _event_name in _IGNORE_CONDITIONS:
+    setattr(_SequencedHandler, _event_name, _make_sequenced_event(_event_name))
+
+
 class AgentExecutor(Chain):
     """Agent that is using tools."""
 
@@ -957,6 +1084,26 @@ class AgentExecutor(Chain):
     trim_intermediate_steps: Union[
         int, Callable[[List[Tuple[AgentAction, str]]], List[Tuple[AgentAction, str]]]
     ] = -1
+    max_tool_concurrency: Optional[int] = 1
+    """The maximum number of tool calls of a single step to run at the same time
+    in the synchronous execution loop.
+
+    Multi-action agents can return several independent actions in one step. With
+    a value above 1 these are run on a bounded thread pool, so the step takes as
+    long as its slowest tool rather than the sum of all of them, and the tools
+    must be thread-safe. Their callbacks are still emitted in the order of the
+    actions. `None` runs all actions of a step concurrently. Defaults to `1`,
+    which runs them one after another."""
+    tool_concurrency_limits: Dict[str, int] = {}
+    """The maximum number of concurrent calls per tool name within a step, for
+    tools backed by rate limited or non thread-safe services."""
+    tool_timeout: Union[None, float, Dict[str, float]] = None
+    """The number of seconds to wait for a tool observation in the synchronous
+    execution loop, either for all tools or as a mapping of tool name to timeout.
+
+    The timeout is measured from the moment the step dispatches its tool calls.
+    A call that does not finish in time is reported back to the agent as an
+    observation. The thread running it is not interrupted."""
 
     @classmethod
     def from_agent_and_tools(
@@ -1220,11 +1367,96 @@ class AgentExecutor(Chain):
             actions = output
         for agent_action in actions:
             yield agent_action
-        for agent_action in actions:
-            yield self._perform_agent_action(
-                name_to_tool_map, color_mapping, agent_action, run_manager
+        if all(self._get_tool_timeout(a.tool) is None for a in actions) and (
+            len(actions) == 1 or self.max_tool_concurrency == 1
+        ):
+            for agent_action in actions:
+                yield self._perform_agent_action(
+                    name_to_tool_map, color_mapping, agent_action, run_manager
+                )
+        else:
+            yield from self._perform_agent_actions(
+                name_to_tool_map, color_mapping, actions, run_manager
             )
 
+    def _get_tool_timeout(self, tool_name: str) -> Optional[float]:
+        if isinstance(self.tool_timeout, dict):
+            return self.tool_timeout.get(tool_name)
+        return self.tool_timeout
+
+    def _perform_agent_actions(
+        self,
+        name_to_tool_map: Dict[str, BaseTool],
+        color_mapping: Dict[str, str],
+        actions: List[AgentAction],
+        run_manager: Optional[CallbackManagerForChainRun] = None,
+    ) -> Iterator[AgentStep]:
+        """Run the tool calls of a step on a bounded thread pool.
+
+        Agent action callbacks fire on the calling thread and steps are yielded
+        in the order the agent planned them, whichever tool finishes first. The
+        callbacks of the tool runs are emitted in that order too.
+        """
+        if run_manager:
+            for agent_action in actions:
+                run_manager.on_agent_action(agent_action, color="green")
+        sequencer = _CallbackSequencer(len(actions))
+        semaphores = {
+            name: threading.BoundedSemaphore(limit)
+            for name, limit in self.tool_concurrency_limits.items()
+        }
+
+        def run(index: int, agent_action: AgentAction) -> AgentStep:
+            callbacks = sequencer.callbacks(index, run_manager) if run_manager else None
+            semaphore = semaphores.get(agent_action.tool)
+            if semaphore is None:
+                return self._run_agent_action(
+                    name_to_tool_map,
+                    color_mapping,
+                    agent_action,
+                    run_manager,
+                    callbacks,
+                )
+            with semaphore:
+                return self._run_agent_action(
+                    name_to_tool_map,
+                    color_mapping,
+                    agent_action,
+                    run_manager,
+                    callbacks,
+                )
+
+        max_workers = min(len(actions), self.max_tool_concurrency or len(actions))
+        executor = ContextThreadPoolExecutor(max_workers=max_workers)
+        try:
+            dispatched_at = time.monotonic()
+            futures = [
+                executor.submit(run, index, agent_action)
+                for index, agent_action in enumerate(actions)
+            ]
+            for index, (agent_action, future) in enumerate(zip(actions, futures)):
+                timeout = self._get_tool_timeout(agent_action.tool)
+                if timeout is None:
+                    step = future.result()
+                else:
+                    remaining = dispatched_at + timeout - time.monotonic()
+                    try:
+                        step = future.result(timeout=max(0.0, remaining))
+                    except FutureTimeoutError:
+                        future.cancel()
+                        step = AgentStep(
+                            action=agent_action,
+                            observation=(
+                                f"{agent_action.tool} did not return an observation "
+                                f"within {timeout} seconds."
+                            ),
+                        )
+                sequencer.finish(index)
+                yield step
+        finally:
+            # Do not block on tool calls that timed out.
+            executor.shutdown(wait=False)
+
     def _perform_agent_action(
         self,
         name_to_tool_map: Dict[str, BaseTool],
@@ -1234,6 +1466,20 @@ class AgentExecutor(Chain):
     ) -> AgentStep:
         if run_manager:
             run_manager.on_agent_action(agent_action, color="green")
+        return self._run_agent_action(
+            name_to_tool_map, color_mapping, agent_action, run_manager
+        )
+
+    def _run_agent_action(
+        self,
+        name_to_tool_map: Dict[str, BaseTool],
+        color_mapping: Dict[str, str],
+        agent_action: AgentAction,
+        run_manager: Optional[CallbackManagerForChainRun] = None,
+        callbacks: Callbacks = None,
+    ) -> AgentStep:
+        if callbacks is None and run_manager:
+            callbacks = run_manager.get_child()
         # Otherwise we lookup the tool
         if agent_action.tool in name_to_tool_map:
             tool = name_to_tool_map[agent_action.tool]
@@ -1247,7 +1493,7 @@ class AgentExecutor(Chain):
                 agent_action.tool_input,
                 verbose=self.verbose,
                 color=color,
-                callbacks=run_manager.get_child() if run_manager else None,
+                callbacks=callbacks,
                 **tool_run_kwargs,
             )
         else:
@@ -1259,7 +1505,7 @@ class AgentExecutor(Chain):
                 },
                 verbose=self.verbose,
                 color=None,
-                callbacks=run_manager.get_child() if run_manager else None,
+                callbacks=callbacks,
                 **tool_run_kwargs,
             )
         return AgentStep(action=agent_action, observation=observation)
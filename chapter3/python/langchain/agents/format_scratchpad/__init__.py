@@ -5,6 +5,7 @@ that result from previous iterations of the agent.
 Depending on the prompting strategy you are using, you may want to format these
 differently before passing them into the LLM.
 """
+from langchain.agents.format_scratchpad.incremental import IncrementalScratchpad
 from langchain.agents.format_scratchpad.log import format_log_to_str
 from langchain.agents.format_scratchpad.log_to_messages import format_log_to_messages
 from langchain.agents.format_scratchpad.openai_functions import (
@@ -15,6 +16,7 @@ from langchain.agents.format_scratchpad.tools import format_to_tool_messages
 from langchain.agents.format_scratchpad.xml import format_xml
 
 __all__ = [
+    "IncrementalScratchpad",
     "format_xml",
     "format_to_openai_function_messages",
     "format_to_openai_functions",
@@ -0,0 +1,131 @@
+import threading
+from collections import OrderedDict
+from typing import Callable, List, Optional, Sequence, Tuple
+
+from langchain_core.agents import AgentAction
+
+
+class IncrementalScratchpad:
+    """Render intermediate steps into a string scratchpad one step at a time.
+
+    The stateless formatters such as `format_xml` re-render every step on every
+    iteration of the agent loop. This formatter remembers the rendered scratchpad
+    of each run and only renders the steps that were added since the last call,
+    so the work done per iteration is proportional to the new step.
+
+    Runs are told apart by the first action of their intermediate steps, which
+    the agent executor keeps the same for the duration of a run. Rendered steps
+    are also cached individually, so a sliding window of steps (see
+    `AgentExecutor.trim_intermediate_steps`) does not render a step twice.
+
+    Long observations can be bounded with `max_observation_length`. When
+    `summarize_observation` is given, observations over the budget are
+    summarized instead of truncated. Either way this happens once per step.
+
+    Example:
+
+        .. code-block:: python
+
+            from langchain.agents.format_scratchpad import (
+                IncrementalScratchpad,
+            )
+            from langchain.agents.format_scratchpad.xml import format_xml_step
+
+            scratchpad = IncrementalScratchpad(
+                format_xml_step, max_observation_length=4000
+            )
+            agent = create_xml_agent(llm, tools, prompt, format_scratchpad=scratchpad)
+    """
+
+    def __init__(
+        self,
+        format_step: Callable[[AgentAction, str], str],
+        *,
+        max_observation_length: Optional[int] = None,
+        summarize_observation: Optional[Callable[[str], str]] = None,
+        max_cached_runs: int = 8,
+        max_cached_steps: int = 256,
+    ) -> None:
+        """Create an incremental scratchpad.
+
+        Args:
+            format_step: Renders a single (action, observation) step.
+            max_observation_length: The maximum number of characters of an
+                observation to keep. Defaults to None, which keeps everything.
+            summarize_observation: Called with observations longer than
+                `max_observation_length` (or with every observation, if no
+                length is set) and returns the text to render instead.
+            max_cached_runs: The number of runs to keep a rendered prefix for.
+            max_cached_steps: The number of rendered steps to keep.
+        """
+        self.format_step = format_step
+        self.max_observation_length = max_observation_length
+        self.summarize_observation = summarize_observation
+        self.max_cached_runs = max_cached_runs
+        self.max_cached_steps = max_cached_steps
+        self._lock = threading.Lock()
+        self._runs: "OrderedDict[int, Tuple[List[AgentAction], str]]" = OrderedDict()
+        self._steps: "OrderedDict[int, Tuple[AgentAction, str, str]]" = OrderedDict()
+
+    def __call__(self, intermediate_steps: Sequence[Tuple[AgentAction, str]]) -> str:
+        """Render the scratchpad for the given intermediate steps."""
+        if not intermediate_steps:
+            return ""
+        key = id(intermediate_steps[0][0])
+        with self._lock:
+            actions: List[AgentAction] = []
+            rendered = ""
+            cached = self._runs.get(key)
+            if cached is not None:
+                cached_actions, cached_rendered = cached
+                if len(cached_actions) <= len(intermediate_steps) and all(
+                    cached_action is action
+                    for cached_action, (action, _) in zip(
+                        cached_actions, intermediate_steps
+                    )
+                ):
+                    actions, rendered = cached_actions, cached_rendered
+            new_steps = intermediate_steps[len(actions) :]
+            if new_steps:
+                rendered += "".join(
+                    self._render_step(action, observation)
+                    for action, observation in new_steps
+                )
+                actions = actions + [action for action, _ in new_steps]
+            self._runs[key] = (actions, rendered)
+            self._runs.move_to_end(key)
+            while len(self._runs) > self.max_cached_runs:
+                self._runs.popitem(last=False)
+            return rendered
+
+    def clear(self) -> None:
+        """Drop all cached runs and steps."""
+        with self._lock:
+            self._runs.clear()
+            self._steps.clear()
+
+    def _render_step(self, action: AgentAction, observation: str) -> str:
+        key = id(action)
+        cached = self._steps.get(key)
+        if cached is not None and cached[0] is action and cached[1] is observation:
+            self._steps.move_to_end(key)
+            return cached[2]
+        rendered = self.format_step(action, self._prepare_observation(observation))
+        self._steps[key] = (action, observation, rendered)
+        while len(self._steps) > self.max_cached_steps:
+            self._steps.popitem(last=False)
+        return rendered
+
+    def _prepare_observation(self, observation: str) -> str:
+        observation = str(observation)
+        limit = self.max_observation_length
+        if limit is not None and len(observation) <= limit:
+            return observation
+        if self.summarize_observation is not None:
+            return self.summarize_observation(observation)
+        if limit is None:
+            return observation
+        return (
+            f"{observation[:limit]}"
+            f"... [truncated {len(observation) - limit} characters]"
+        )
@@ -3,14 +3,23 @@ from typing import List, Tuple
 from langchain_core.agents import AgentAction
 
 
+def format_log_step(
+    action: AgentAction,
+    observation: str,
+    observation_prefix: str = "Observation: ",
+    llm_prefix: str = "Thought: ",
+) -> str:
+    """Format a single intermediate step of the agent's thought process."""
+    return f"{action.log}\n{observation_prefix}{observation}\n{llm_prefix}"
+
+
 def format_log_to_str(
     intermediate_steps: List[Tuple[AgentAction, str]],
     observation_prefix: str = "Observation: ",
     llm_prefix: str = "Thought: ",
 ) -> str:
     """Construct the scratchpad that lets the agent continue its thought process."""
-    thoughts = ""
-    for action, observation in intermediate_steps:
-        thoughts += action.log
-        thoughts += f"\n{observation_prefix}{observation}\n{llm_prefix}"
-    return thoughts
+    return "".join(
+        format_log_step(action, observation, observation_prefix, llm_prefix)
+        for action, observation in intermediate_steps
+    )
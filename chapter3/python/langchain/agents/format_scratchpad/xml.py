@@ -3,6 +3,22 @@ from typing import List, Tuple
 from langchain_core.agents import AgentAction
 
 
+def format_xml_step(action: AgentAction, observation: str) -> str:
+    """Format a single intermediate step as XML.
+
+    Args:
+        action: The agent action.
+        observation: The observation returned by the tool.
+
+    Returns:
+        The step as XML.
+    """
+    return (
+        f"<tool>{action.tool}</tool><tool_input>{action.tool_input}"
+        f"</tool_input><observation>{observation}</observation>"
+    )
+
+
 def format_xml(
     intermediate_steps: List[Tuple[AgentAction, str]],
 ) -> str:
@@ -14,10 +30,7 @@ def format_xml(
     Returns:
         The intermediate steps as XML.
     """
-    log = ""
-    for action, observation in intermediate_steps:
-        log += (
-            f"<tool>{action.tool}</tool><tool_input>{action.tool_input}"
-            f"</tool_input><observation>{observation}</observation>"
-        )
-    return log
+    return "".join(
+        format_xml_step(action, observation)
+        for action, observation in intermediate_steps
+    )
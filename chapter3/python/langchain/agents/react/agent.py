@@ -1,14 +1,16 @@
 from __future__ import annotations
 
-from typing import List, Optional, Sequence, Union
+from typing import Callable, List, Optional, Sequence, Tuple, Union
 
+from langchain_core.agents import AgentAction
 from langchain_core.language_models import BaseLanguageModel
 from langchain_core.prompts import BasePromptTemplate
 from langchain_core.runnables import Runnable, RunnablePassthrough
 from langchain_core.tools import BaseTool
 
 from langchain.agents import AgentOutputParser
-from langchain.agents.format_scratchpad import format_log_to_str
+from langchain.agents.format_scratchpad import IncrementalScratchpad
+from langchain.agents.format_scratchpad.log import format_log_step
 from langchain.agents.output_parsers import ReActSingleInputOutputParser
 from langchain.tools.render import ToolsRenderer, render_text_description
 
@@ -21,6 +23,9 @@ def create_react_agent(
     tools_renderer: ToolsRenderer = render_text_description,
     *,
     stop_sequence: Union[bool, List[str]] = True,
+    format_scratchpad: Optional[
+        Callable[[List[Tuple[AgentAction, str]]], str]
+    ] = None,
 ) -> Runnable:
     """Create an agent that uses ReAct prompting.
 
@@ -38,6 +43,10 @@ def create_react_agent(
 
             Default is True. You may to set this to False if the LLM you are using
             does not support stop sequences.
+        format_scratchpad: Renders the intermediate steps into the
+            `agent_scratchpad` string. Defaults to an `IncrementalScratchpad`
+            with the same output as `format_log_to_str`, which only renders the
+            steps added since the previous iteration.
 
     Returns:
         A Runnable sequence representing an agent. It takes as input all the same input
@@ -123,9 +132,10 @@ def create_react_agent(
     else:
         llm_with_stop = llm
     output_parser = output_parser or ReActSingleInputOutputParser()
+    scratchpad = format_scratchpad or IncrementalScratchpad(format_log_step)
     agent = (
         RunnablePassthrough.assign(
-            agent_scratchpad=lambda x: format_log_to_str(x["intermediate_steps"]),
+            agent_scratchpad=lambda x: scratchpad(x["intermediate_steps"]),
         )
         | prompt
         | llm_with_stop
@@ -1,4 +1,4 @@
-from typing import Any, List, Sequence, Tuple, Union
+from typing import Any, Callable, List, Optional, Sequence, Tuple, Union
 
 from langchain_core._api import deprecated
 from langchain_core.agents import AgentAction, AgentFinish
@@ -10,7 +10,8 @@ from langchain_core.runnables import Runnable, RunnablePassthrough
 from langchain_core.tools import BaseTool
 
 from langchain.agents.agent import BaseSingleActionAgent
-from langchain.agents.format_scratchpad import format_xml
+from langchain.agents.format_scratchpad import IncrementalScratchpad
+from langchain.agents.format_scratchpad.xml import format_xml_step
 from langchain.agents.output_parsers import XMLAgentOutputParser
 from langchain.agents.xml.prompt import agent_instructions
 from langchain.chains.llm import LLMChain
@@ -114,6 +115,9 @@ def create_xml_agent(
     tools_renderer: ToolsRenderer = render_text_description,
     *,
     stop_sequence: Union[bool, List[str]] = True,
+    format_scratchpad: Optional[
+        Callable[[List[Tuple[AgentAction, str]]], str]
+    ] = None,
 ) -> Runnable:
     """Create an agent that uses XML to format its logic.
 
@@ -132,6 +136,10 @@ def create_xml_agent(
 
             Default is True. You may to set this to False if the LLM you are using
             does not support stop sequences.
+        format_scratchpad: Renders the intermediate steps into the
+            `agent_scratchpad` string. Defaults to an `IncrementalScratchpad`
+            with the same output as `format_xml`, which only renders the steps
+            added since the previous iteration.
 
     Returns:
         A Runnable sequence representing an agent. It takes as input all the same input
@@ -219,9 +227,10 @@ def create_xml_agent(
     else:
         llm_with_stop = llm
 
+    scratchpad = format_scratchpad or IncrementalScratchpad(format_xml_step)
     agent = (
         RunnablePassthrough.assign(
-            agent_scratchpad=lambda x: format_xml(x["intermediate_steps"]),
+            agent_scratchpad=lambda x: scratchpad(x["intermediate_steps"]),
         )
         | prompt
         | llm_with_stop
@@ -9,11 +9,13 @@ The text is hashed and the hash is used as the key in the cache.
 
 from __future__ import annotations
 
+import asyncio
 import hashlib
 import json
 import uuid
+from concurrent.futures import ThreadPoolExecutor
 from functools import partial
-from typing import Callable, List, Optional, Sequence, Union, cast
+from typing import Callable, Dict, List, Optional, Sequence, Union, cast
 
 from langchain_core.embeddings import Embeddings
 from langchain_core.stores import BaseStore, ByteStore
@@ -50,6 +52,21 @@ def _value_deserializer(serialized_value: bytes) -> List[float]:
     return cast(List[float], json.loads(serialized_value.decode()))
 
 
+def _expand(
+    texts: List[str],
+    unique_texts: List[str],
+    vectors: List[Union[List[float], None]],
+) -> List[List[float]]:
+    """Map the vectors of the unique texts back to every text."""
+    if len(unique_texts) == len(texts):
+        # Nones should have been resolved by now
+        return cast(List[List[float]], vectors)
+    by_text: Dict[str, List[float]] = dict(
+        zip(unique_texts, cast(List[List[float]], vectors))
+    )
+    return [by_text[text] for text in texts]
+
+
 class CacheBackedEmbeddings(Embeddings):
     """Interface for caching results from embedding models.
 
@@ -63,6 +80,14 @@ class CacheBackedEmbeddings(Embeddings):
     Note that by default only document embeddings are cached. To cache query
     embeddings too, pass in a query_embedding_store to constructor.
 
+    Texts that occur more than once in a call are embedded once. The missing
+    embeddings are computed in batches of `batch_size`, up to `max_concurrency`
+    batches at a time.
+
+    For a compact on-disk cache, use a
+    `langchain.storage.SegmentedEmbeddingStore` as the store. It keeps float32
+    vectors in a few segment files, rather than a JSON file per embedding.
+
     Examples:
 
         .. code-block: python
@@ -92,6 +117,7 @@ class CacheBackedEmbeddings(Embeddings):
         *,
         batch_size: Optional[int] = None,
         query_embedding_store: Optional[BaseStore[str, List[float]]] = None,
+        max_concurrency: int = 1,
     ) -> None:
         """Initialize the embedder.
 
@@ -101,12 +127,27 @@ class CacheBackedEmbeddings(Embeddings):
             batch_size: The number of documents to embed between store updates.
             query_embedding_store: The store to use for caching query embeddings.
                 If None, query embeddings are not cached.
+            max_concurrency: The number of batches to embed at the same time.
         """
         super().__init__()
         self.document_embedding_store = document_embedding_store
         self.query_embedding_store = query_embedding_store
         self.underlying_embeddings = underlying_embeddings
         self.batch_size = batch_size
+        self.max_concurrency = max_concurrency
+
+    def _embed_missing(self, texts: List[str]) -> List[List[float]]:
+        vectors = self.underlying_embeddings.embed_documents(texts)
+        self.document_embedding_store.mset(list(zip(texts, vectors)))
+        return vectors
+
+    async def _aembed_missing(
+        self, texts: List[str], semaphore: asyncio.Semaphore
+    ) -> List[List[float]]:
+        async with semaphore:
+            vectors = await self.underlying_embeddings.aembed_documents(texts)
+            await self.document_embedding_store.amset(list(zip(texts, vectors)))
+        return vectors
 
     def embed_documents(self, texts: List[str]) -> List[List[float]]:
         """Embed a list of texts.
@@ -121,25 +162,28 @@ class CacheBackedEmbeddings(Embeddings):
         Returns:
             A list of embeddings for the given texts.
         """
+        unique_texts = list(dict.fromkeys(texts))
         vectors: List[Union[List[float], None]] = self.document_embedding_store.mget(
-            texts
+            unique_texts
         )
         all_missing_indices: List[int] = [
             i for i, vector in enumerate(vectors) if vector is None
         ]
 
-        for missing_indices in batch_iterate(self.batch_size, all_missing_indices):
-            missing_texts = [texts[i] for i in missing_indices]
-            missing_vectors = self.underlying_embeddings.embed_documents(missing_texts)
-            self.document_embedding_store.mset(
-                list(zip(missing_texts, missing_vectors))
-            )
+        batches = list(batch_iterate(self.batch_size, all_missing_indices))
+        batch_texts = [[unique_texts[i] for i in batch] for batch in batches]
+        if self.max_concurrency > 1 and len(batches) > 1:
+            with ThreadPoolExecutor(
+                max_workers=min(self.max_concurrency, len(batches))
+            ) as executor:
+                batch_vectors = list(executor.map(self._embed_missing, batch_texts))
+        else:
+            batch_vectors = [self._embed_missing(texts_) for texts_ in batch_texts]
+        for missing_indices, missing_vectors in zip(batches, batch_vectors):
             for index, updated_vector in zip(missing_indices, missing_vectors):
                 vectors[index] = updated_vector
 
-        return cast(
-            List[List[float]], vectors
-        )  # Nones should have been resolved by now
+        return _expand(texts, unique_texts, vectors)
 
     async def aembed_documents(self, texts: List[str]) -> List[List[float]]:
         """Embed a list of texts.
@@ -154,29 +198,29 @@ class CacheBackedEmbeddings(Embeddings):
         Returns:
             A list of embeddings for the given texts.
         """
+        unique_texts = list(dict.fromkeys(texts))
         vectors: List[
             Union[List[float], None]
-        ] = await self.document_embedding_store.amget(texts)
+        ] = await self.document_embedding_store.amget(unique_texts)
         all_missing_indices: List[int] = [
             i for i, vector in enumerate(vectors) if vector is None
         ]
 
         # batch_iterate supports None batch_size which returns all elements at once
         # as a single batch.
-        for missing_indices in batch_iterate(self.batch_size, all_missing_indices):
-            missing_texts = [texts[i] for i in missing_indices]
-            missing_vectors = await self.underlying_embeddings.aembed_documents(
-                missing_texts
-            )
-            await self.document_embedding_store.amset(
-                list(zip(missing_texts, missing_vectors))
+        batches = list(batch_iterate(self.batch_size, all_missing_indices))
+        semaphore = asyncio.Semaphore(max(self.max_concurrency, 1))
+        batch_vectors = await asyncio.gather(
+            *(
+                self._aembed_missing([unique_texts[i] for i in batch], semaphore)
+                for batch in batches
             )
+        )
+        for missing_indices, missing_vectors in zip(batches, batch_vectors):
             for index, updated_vector in zip(missing_indices, missing_vectors):
                 vectors[index] = updated_vector
 
-        return cast(
-            List[List[float]], vectors
-        )  # Nones should have been resolved by now
+        return _expand(texts, unique_texts, vectors)
 
     def embed_query(self, text: str) -> List[float]:
         """Embed query text.
@@ -233,6 +277,7 @@ class CacheBackedEmbeddings(Embeddings):
         namespace: str = "",
         batch_size: Optional[int] = None,
         query_embedding_cache: Union[bool, ByteStore] = False,
+        max_concurrency: int = 1,
     ) -> CacheBackedEmbeddings:
         """On-ramp that adds the necessary serialization and encoding to the store.
 
@@ -247,6 +292,7 @@ class CacheBackedEmbeddings(Embeddings):
             query_embedding_cache: The cache to use for storing query embeddings.
                 True to use the same cache as document embeddings.
                 False to not cache query embeddings.
+            max_concurrency: The number of batches to embed at the same time.
         """
         namespace = namespace
         key_encoder = _create_key_encoder(namespace)
@@ -273,4 +319,5 @@ class CacheBackedEmbeddings(Embeddings):
             document_embedding_store,
             batch_size=batch_size,
             query_embedding_store=query_embedding_store,
+            max_concurrency=max_concurrency,
         )
@@ -0,0 +1,153 @@
+"""Run the calls of a retriever to its children concurrently."""
+
+from __future__ import annotations
+
+import asyncio
+import concurrent.futures
+import logging
+import threading
+import time
+from typing import Awaitable, Callable, List, Optional, Sequence, TypeVar
+
+from langchain_core.runnables.config import ContextThreadPoolExecutor
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+MAX_WORKERS = 32
+"""The number of threads shared by all retrievers that fan out."""
+
+_executor: Optional[ContextThreadPoolExecutor] = None
+_executor_lock = threading.Lock()
+_local = threading.local()
+
+
+def _get_executor() -> ContextThreadPoolExecutor:
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ContextThreadPoolExecutor(
+                max_workers=MAX_WORKERS,
+                thread_name_prefix="retriever-fan-out",
+                initializer=_mark_worker,
+            )
+        return _executor
+
+
+def _mark_worker() -> None:
+    _local.is_worker = True
+
+
+class _Failure:
+    def __init__(self, error: BaseException) -> None:
+        self.error = error
+
+
+def _collect(
+    names: Sequence[str], outcomes: Sequence[object], tolerate_errors: bool
+) -> List[Optional[T]]:
+    """Return the results of the calls, raising or logging their failures."""
+    results: List[Optional[T]] = []
+    failures = 0
+    for name, outcome in zip(names, outcomes):
+        if not isinstance(outcome, _Failure):
+            results.append(outcome)  # type: ignore[arg-type]
+            continue
+        if not tolerate_errors:
+            raise outcome.error
+        logger.warning(f"Ignoring the results of {name}: {outcome.error!r}")
+        results.append(None)
+        failures += 1
+    if failures and failures == len(outcomes):
+        raise next(o.error for o in outcomes if isinstance(o, _Failure))
+    return results
+
+
+def fan_out(
+    calls: Sequence[Callable[[], T]],
+    *,
+    names: Sequence[str],
+    timeout: Optional[float] = None,
+    tolerate_errors: bool = False,
+) -> List[Optional[T]]:
+    """Run calls on the shared executor and wait for all of them.
+
+    Args:
+        calls: The calls to run.
+        names: The names of the calls, for logging.
+        timeout: The seconds to wait for the calls. Calls that have not finished
+            by then are abandoned and count as failed. Calls made from the
+            shared executor run one after the other on the calling thread and
+            cannot be interrupted: a call that finishes after the deadline, and
+            the calls after it, count as timed out, but the wait is not cut
+            short.
+        tolerate_errors: Whether failed calls give None instead of raising,
+            as long as at least one call succeeds.
+
+    Returns:
+        The results of the calls, in order.
+    """
+    if getattr(_local, "is_worker", False) or (len(calls) <= 1 and timeout is None):
+        # a single call gains nothing from a thread unless it has to be
+        # abandoned, and calls made from the shared executor run inline so
+        # nested fan-outs cannot exhaust it
+        deadline = None if timeout is None else time.monotonic() + timeout
+        futures = [_run_inline(call, deadline) for call in calls]
+    else:
+        executor = _get_executor()
+        futures = [executor.submit(call) for call in calls]
+        concurrent.futures.wait(futures, timeout=timeout)
+    outcomes: List[object] = []
+    for name, future in zip(names, futures):
+        if not future.done():
+            future.cancel()
+            error = TimeoutError(f"{name} timed out after {timeout}s")
+            outcomes.append(_Failure(error))
+        elif future.exception() is not None:
+            outcomes.append(_Failure(future.exception()))  # type: ignore[arg-type]
+        else:
+            outcomes.append(future.result())
+    return _collect(names, outcomes, tolerate_errors)
+
+
+def _run_inline(
+    call: Callable[[], T], deadline: Optional[float]
+) -> concurrent.futures.Future:
+    """Run a call, leaving its future pending if it ends past the deadline."""
+    future: concurrent.futures.Future = concurrent.futures.Future()
+    if deadline is not None and time.monotonic() >= deadline:
+        return future
+    try:
+        result = call()
+    except Exception as e:
+        if deadline is None or time.monotonic() < deadline:
+            future.set_exception(e)
+        return future
+    if deadline is None or time.monotonic() < deadline:
+        future.set_result(result)
+    return future
+
+
+async def afan_out(
+    calls: Sequence[Awaitable[T]],
+    *,
+    names: Sequence[str],
+    timeout: Optional[float] = None,
+    tolerate_errors: bool = False,
+) -> List[Optional[T]]:
+    """Await calls concurrently, with the same semantics as `fan_out`."""
+    gathered = await asyncio.gather(
+        *(asyncio.wait_for(call, timeout) for call in calls),
+        return_exceptions=True,
+    )
+    outcomes: List[object] = []
+    for name, outcome in zip(names, gathered):
+        if isinstance(outcome, asyncio.TimeoutError):
+            outcome = _Failure(TimeoutError(f"{name} timed out after {timeout}s"))
+        elif isinstance(outcome, Exception):
+            outcome = _Failure(outcome)
+        elif isinstance(outcome, BaseException):
+            raise outcome
+        outcomes.append(outcome)
+    return _collect(names, outcomes, tolerate_errors)
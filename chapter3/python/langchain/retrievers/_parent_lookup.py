@@ -0,0 +1,145 @@
+"""Fetch the parent documents of a multi-vector retriever's search results."""
+
+from __future__ import annotations
+
+import threading
+from collections import OrderedDict
+from typing import Dict, List, Optional, Sequence
+
+from langchain_core.documents import Document
+from langchain_core.stores import BaseStore
+from langchain_core.vectorstores.batching import AsyncQueryBatcher, QueryBatcher
+
+
+class ParentLookup:
+    """Fetch parent documents from a docstore through an LRU cache.
+
+    Lookups of concurrent queries that arrive within `max_wait` of each other
+    are merged: the ids they miss in the cache are deduplicated and fetched
+    with a single `mget`. The cache holds and hands out copies, so callers may
+    modify the documents they get.
+    """
+
+    def __init__(
+        self,
+        docstore: BaseStore[str, Document],
+        *,
+        cache_size: int = 0,
+        max_batch_size: int = 1,
+        max_wait: float = 0.005,
+    ) -> None:
+        """Create a lookup.
+
+        Args:
+            docstore: The store of the parent documents.
+            cache_size: The number of parent documents to cache. 0 disables
+                the cache.
+            max_batch_size: The most lookups to merge into one `mget`. 1
+                fetches the parents of every lookup on their own.
+            max_wait: The seconds to wait for lookups to merge.
+        """
+        self.docstore = docstore
+        self.cache_size = cache_size
+        self._cache: OrderedDict[str, Document] = OrderedDict()
+        self._lock = threading.Lock()
+        # incremented by every forget, so fetches that overlap one are not cached
+        self._generation = 0
+        self._batcher: Optional[QueryBatcher[List[str], Dict[str, Document]]] = None
+        self._abatcher: Optional[
+            AsyncQueryBatcher[List[str], Dict[str, Document]]
+        ] = None
+        if max_batch_size > 1:
+            self._batcher = QueryBatcher(
+                self._fetch_batch, max_batch_size=max_batch_size, max_wait=max_wait
+            )
+            self._abatcher = AsyncQueryBatcher(
+                self._afetch_batch, max_batch_size=max_batch_size, max_wait=max_wait
+            )
+
+    def get(self, ids: Sequence[str]) -> List[Optional[Document]]:
+        """Get the parent documents with the given ids, None where missing."""
+        found = self._cached(ids)
+        missing = [id_ for id_ in ids if id_ not in found]
+        if missing:
+            if self._batcher is not None:
+                found.update(self._batcher(missing))
+            else:
+                found.update(self._fetch(missing))
+        return [found.get(id_) for id_ in ids]
+
+    async def aget(self, ids: Sequence[str]) -> List[Optional[Document]]:
+        """Get the parent documents with the given ids, None where missing."""
+        found = self._cached(ids)
+        missing = [id_ for id_ in ids if id_ not in found]
+        if missing:
+            if self._abatcher is not None:
+                found.update(await self._abatcher(missing))
+            else:
+                found.update(await self._afetch(missing))
+        return [found.get(id_) for id_ in ids]
+
+    def forget(self, ids: Sequence[str]) -> None:
+        """Drop the cached copies of documents that were written.
+
+        Documents fetched while they were being written may be the old ones, so
+        the results of fetches still running are not cached either.
+        """
+        if not self.cache_size:
+            return
+        with self._lock:
+            self._generation += 1
+            for id_ in ids:
+                self._cache.pop(id_, None)
+
+    def _cached(self, ids: Sequence[str]) -> Dict[str, Document]:
+        if not self.cache_size:
+            return {}
+        found = {}
+        with self._lock:
+            for id_ in ids:
+                doc = self._cache.get(id_)
+                if doc is not None:
+                    self._cache.move_to_end(id_)
+                    found[id_] = doc
+        return {id_: doc.copy(deep=True) for id_, doc in found.items()}
+
+    def _remember(self, found: Dict[str, Document], generation: int) -> None:
+        if not self.cache_size:
+            return
+        copies = {id_: doc.copy(deep=True) for id_, doc in found.items()}
+        with self._lock:
+            if generation != self._generation:
+                return
+            for id_, doc in copies.items():
+                self._cache[id_] = doc
+                self._cache.move_to_end(id_)
+            while len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+
+    def _fetch(self, ids: List[str]) -> Dict[str, Document]:
+        generation = self._generation
+        docs = self.docstore.mget(ids)
+        found = {id_: doc for id_, doc in zip(ids, docs) if doc is not None}
+        self._remember(found, generation)
+        return found
+
+    async def _afetch(self, ids: List[str]) -> Dict[str, Document]:
+        generation = self._generation
+        docs = await self.docstore.amget(ids)
+        found = {id_: doc for id_, doc in zip(ids, docs) if doc is not None}
+        self._remember(found, generation)
+        return found
+
+    def _fetch_batch(self, lookups: List[List[str]]) -> List[Dict[str, Document]]:
+        found = self._fetch(_unique(lookups))
+        return [{id_: found[id_] for id_ in ids if id_ in found} for ids in lookups]
+
+    async def _afetch_batch(
+        self, lookups: List[List[str]]
+    ) -> List[Dict[str, Document]]:
+        found = await self._afetch(_unique(lookups))
+        return [{id_: found[id_] for id_ in ids if id_ in found} for ids in lookups]
+
+
+def _unique(lookups: List[List[str]]) -> List[str]:
+    return list(dict.fromkeys(id_ for ids in lookups for id_ in ids))
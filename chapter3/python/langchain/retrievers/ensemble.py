@@ -2,10 +2,8 @@
 Ensemble retriever that ensemble the results of
 multiple retrievers by using weighted  Reciprocal Rank Fusion
 """
-import asyncio
-from collections import defaultdict
 from collections.abc import Hashable
-from itertools import chain
+from functools import partial
 from typing import (
     Any,
     Callable,
@@ -14,6 +12,7 @@ from typing import (
     Iterator,
     List,
     Optional,
+    Tuple,
     TypeVar,
     cast,
 )
@@ -33,6 +32,8 @@ from langchain_core.runnables.utils import (
     get_unique_config_specs,
 )
 
+from langchain.retrievers._fan_out import afan_out, fan_out
+
 T = TypeVar("T")
 H = TypeVar("H", bound=Hashable)
 
@@ -66,11 +67,21 @@ class EnsembleRetriever(BaseRetriever):
         c: A constant added to the rank, controlling the balance between the importance
             of high-ranked items and the consideration given to lower-ranked items.
             Default is 60.
+        child_timeout: Seconds to wait for the retrievers, which are queried
+            concurrently. Defaults to None, which waits for all of them. When
+            the ensemble itself runs inside another fan-out, its retrievers are
+            queried one after the other and cannot be interrupted, so those
+            finishing late count as timed out without shortening the wait.
+        tolerate_errors: Whether to fuse the results of the retrievers that
+            succeeded when others fail or time out, instead of raising.
+            Defaults to False.
     """
 
     retrievers: List[RetrieverLike]
     weights: List[float]
     c: int = 60
+    child_timeout: Optional[float] = None
+    tolerate_errors: bool = False
 
     @property
     def config_specs(self) -> List[ConfigurableFieldSpec]:
@@ -214,23 +225,31 @@ class EnsembleRetriever(BaseRetriever):
             A list of reranked documents.
         """
 
-        # Get the results of all retrievers.
-        retriever_docs = [
-            retriever.invoke(
-                query,
-                patch_config(
-                    config, callbacks=run_manager.get_child(tag=f"retriever_{i+1}")
-                ),
-            )
-            for i, retriever in enumerate(self.retrievers)
-        ]
+        # Get the results of all retrievers concurrently.
+        results = fan_out(
+            [
+                partial(
+                    retriever.invoke,
+                    query,
+                    patch_config(
+                        config, callbacks=run_manager.get_child(tag=f"retriever_{i+1}")
+                    ),
+                )
+                for i, retriever in enumerate(self.retrievers)
+            ],
+            names=[f"retriever_{i+1}" for i in range(len(self.retrievers))],
+            timeout=self.child_timeout,
+            tolerate_errors=self.tolerate_errors,
+        )
 
         # Enforce that retrieved docs are Documents for each list in retriever_docs
-        for i in range(len(retriever_docs)):
-            retriever_docs[i] = [
+        retriever_docs = [
+            [
                 Document(page_content=cast(str, doc)) if isinstance(doc, str) else doc
-                for doc in retriever_docs[i]
+                for doc in docs or []
             ]
+            for docs in results
+        ]
 
         # apply rank fusion
         fused_documents = self.weighted_reciprocal_rank(retriever_docs)
@@ -256,8 +275,8 @@ class EnsembleRetriever(BaseRetriever):
         """
 
         # Get the results of all retrievers.
-        retriever_docs = await asyncio.gather(
-            *[
+        results = await afan_out(
+            [
                 retriever.ainvoke(
                     query,
                     patch_config(
@@ -265,15 +284,20 @@ class EnsembleRetriever(BaseRetriever):
                     ),
                 )
                 for i, retriever in enumerate(self.retrievers)
-            ]
+            ],
+            names=[f"retriever_{i+1}" for i in range(len(self.retrievers))],
+            timeout=self.child_timeout,
+            tolerate_errors=self.tolerate_errors,
         )
 
         # Enforce that retrieved docs are Documents for each list in retriever_docs
-        for i in range(len(retriever_docs)):
-            retriever_docs[i] = [
+        retriever_docs = [
+            [
                 Document(page_content=doc) if not isinstance(doc, Document) else doc  # type: ignore[arg-type]
-                for doc in retriever_docs[i]
+                for doc in docs or []
             ]
+            for docs in results
+        ]
 
         # apply rank fusion
         fused_documents = self.weighted_reciprocal_rank(retriever_docs)
@@ -300,18 +324,14 @@ class EnsembleRetriever(BaseRetriever):
                 "Number of rank lists must be equal to the number of weights."
             )
 
-        # Associate each doc's content with its RRF score for later sorting by it
+        # Associate each doc's content with its RRF score and its first occurrence.
         # Duplicated contents across retrievers are collapsed & scored cumulatively
-        rrf_score: Dict[str, float] = defaultdict(float)
+        fused: Dict[str, Tuple[float, Document]] = {}
         for doc_list, weight in zip(doc_lists, self.weights):
             for rank, doc in enumerate(doc_list, start=1):
-                rrf_score[doc.page_content] += weight / (rank + self.c)
-
-        # Docs are deduplicated by their contents then sorted by their scores
-        all_docs = chain.from_iterable(doc_lists)
-        sorted_docs = sorted(
-            unique_by_key(all_docs, lambda doc: doc.page_content),
-            reverse=True,
-            key=lambda doc: rrf_score[doc.page_content],
-        )
-        return sorted_docs
+                score, first = fused.get(doc.page_content, (0.0, doc))
+                fused[doc.page_content] = (score + weight / (rank + self.c), first)
+
+        # Docs are sorted by their scores, ties in the order they were first seen
+        ranked = sorted(fused.values(), reverse=True, key=lambda entry: entry[0])
+        return [doc for _, doc in ranked]
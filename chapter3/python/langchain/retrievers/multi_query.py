@@ -1,6 +1,6 @@
-import asyncio
 import logging
-from typing import List, Optional, Sequence
+from functools import partial
+from typing import Dict, List, Optional, Sequence
 
 from langchain_core.callbacks import (
     AsyncCallbackManagerForRetrieverRun,
@@ -13,6 +13,7 @@ from langchain_core.prompts.prompt import PromptTemplate
 from langchain_core.retrievers import BaseRetriever
 
 from langchain.chains.llm import LLMChain
+from langchain.retrievers._fan_out import afan_out, fan_out
 
 logger = logging.getLogger(__name__)
 
@@ -39,7 +40,15 @@ DEFAULT_QUERY_PROMPT = PromptTemplate(
 
 
 def _unique_documents(documents: Sequence[Document]) -> List[Document]:
-    return [doc for i, doc in enumerate(documents) if doc not in documents[:i]]
+    # documents are only compared to those with the same content
+    seen: Dict[str, List[Document]] = {}
+    unique = []
+    for doc in documents:
+        same_content = seen.setdefault(doc.page_content, [])
+        if doc not in same_content:
+            same_content.append(doc)
+            unique.append(doc)
+    return unique
 
 
 class MultiQueryRetriever(BaseRetriever):
@@ -55,6 +64,15 @@ class MultiQueryRetriever(BaseRetriever):
     """DEPRECATED. parser_key is no longer used and should not be specified."""
     include_original: bool = False
     """Whether to include the original query in the list of generated queries."""
+    query_timeout: Optional[float] = None
+    """Seconds to wait for the retrieval of the queries, which run concurrently.
+
+    When the retriever itself runs inside another fan-out, the queries are run
+    one after the other and cannot be interrupted, so those finishing late count
+    as timed out without shortening the wait."""
+    tolerate_errors: bool = False
+    """Whether to return the documents of the queries that succeeded when others
+    fail or time out, instead of raising."""
 
     @classmethod
     def from_llm(
@@ -134,15 +152,18 @@ class MultiQueryRetriever(BaseRetriever):
         Returns:
             List of retrieved Documents
         """
-        document_lists = await asyncio.gather(
-            *(
+        document_lists = await afan_out(
+            [
                 self.retriever.ainvoke(
                     query, config={"callbacks": run_manager.get_child()}
                 )
                 for query in queries
-            )
+            ],
+            names=[f"query {query!r}" for query in queries],
+            timeout=self.query_timeout,
+            tolerate_errors=self.tolerate_errors,
         )
-        return [doc for docs in document_lists for doc in docs]
+        return [doc for docs in document_lists for doc in docs or []]
 
     def _get_relevant_documents(
         self,
@@ -194,13 +215,20 @@ class MultiQueryRetriever(BaseRetriever):
         Returns:
             List of retrieved Documents
         """
-        documents = []
-        for query in queries:
-            docs = self.retriever.invoke(
-                query, config={"callbacks": run_manager.get_child()}
-            )
-            documents.extend(docs)
-        return documents
+        document_lists = fan_out(
+            [
+                partial(
+                    self.retriever.invoke,
+                    query,
+                    config={"callbacks": run_manager.get_child()},
+                )
+                for query in queries
+            ],
+            names=[f"query {query!r}" for query in queries],
+            timeout=self.query_timeout,
+            tolerate_errors=self.tolerate_errors,
+        )
+        return [doc for docs in document_lists for doc in docs or []]
 
     def unique_union(self, documents: List[Document]) -> List[Document]:
         """Get unique Documents.
@@ -6,11 +6,12 @@ from langchain_core.callbacks import (
     CallbackManagerForRetrieverRun,
 )
 from langchain_core.documents import Document
-from langchain_core.pydantic_v1 import Field, root_validator
+from langchain_core.pydantic_v1 import Field, PrivateAttr, root_validator
 from langchain_core.retrievers import BaseRetriever
 from langchain_core.stores import BaseStore, ByteStore
 from langchain_core.vectorstores import VectorStore
 
+from langchain.retrievers._parent_lookup import ParentLookup
 from langchain.storage._lc_store import create_kv_docstore
 
 
@@ -38,6 +39,17 @@ class MultiVectorRetriever(BaseRetriever):
     """Keyword arguments to pass to the search function."""
     search_type: SearchType = SearchType.similarity
     """Type of search to perform (similarity / mmr)"""
+    parent_cache_size: int = 0
+    """The number of parent documents to keep in an LRU cache in front of the
+    docstore. Defaults to 0, which disables the cache. Cached parents are
+    dropped when `add_documents` writes them, but not on other writes to the
+    docstore."""
+    max_batch_size: int = 1
+    """The most concurrent queries whose parent documents are fetched with one
+    docstore `mget`. Defaults to 1, which fetches them for every query."""
+    max_batch_wait: float = 0.005
+    """The seconds to wait for the parent lookups of other queries."""
+    _parents: Optional[ParentLookup] = PrivateAttr(default=None)
 
     @root_validator(pre=True)
     def shim_docstore(cls, values: Dict) -> Dict:
@@ -50,6 +62,24 @@ class MultiVectorRetriever(BaseRetriever):
         values["docstore"] = docstore
         return values
 
+    def _parent_lookup(self) -> ParentLookup:
+        if self._parents is None:
+            self._parents = ParentLookup(
+                self.docstore,
+                cache_size=self.parent_cache_size,
+                max_batch_size=self.max_batch_size,
+                max_wait=self.max_batch_wait,
+            )
+        return self._parents
+
+    def _parent_ids(self, sub_docs: List[Document]) -> List[str]:
+        # We do this to maintain the order of the ids that are returned
+        return list(
+            dict.fromkeys(
+                d.metadata[self.id_key] for d in sub_docs if self.id_key in d.metadata
+            )
+        )
+
     def _get_relevant_documents(
         self, query: str, *, run_manager: CallbackManagerForRetrieverRun
     ) -> List[Document]:
@@ -67,12 +97,7 @@ class MultiVectorRetriever(BaseRetriever):
         else:
             sub_docs = self.vectorstore.similarity_search(query, **self.search_kwargs)
 
-        # We do this to maintain the order of the ids that are returned
-        ids = []
-        for d in sub_docs:
-            if self.id_key in d.metadata and d.metadata[self.id_key] not in ids:
-                ids.append(d.metadata[self.id_key])
-        docs = self.docstore.mget(ids)
+        docs = self._parent_lookup().get(self._parent_ids(sub_docs))
         return [d for d in docs if d is not None]
 
     async def _aget_relevant_documents(
@@ -94,10 +119,5 @@ class MultiVectorRetriever(BaseRetriever):
                 query, **self.search_kwargs
             )
 
-        # We do this to maintain the order of the ids that are returned
-        ids = []
-        for d in sub_docs:
-            if self.id_key in d.metadata and d.metadata[self.id_key] not in ids:
-                ids.append(d.metadata[self.id_key])
-        docs = await self.docstore.amget(ids)
+        docs = await self._parent_lookup().aget(self._parent_ids(sub_docs))
         return [d for d in docs if d is not None]
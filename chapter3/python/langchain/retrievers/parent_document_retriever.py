@@ -1,7 +1,10 @@
 import uuid
-from typing import List, Optional, Sequence
+from collections import deque
+from concurrent.futures import Future
+from typing import Deque, List, Optional, Sequence, Tuple
 
 from langchain_core.documents import Document
+from langchain_core.runnables.config import ContextThreadPoolExecutor
 from langchain_text_splitters import TextSplitter
 
 from langchain.retrievers import MultiVectorRetriever
@@ -69,6 +72,47 @@ class ParentDocumentRetriever(MultiVectorRetriever):
         metadata.
     """
 
+    ingest_batch_size: Optional[int] = None
+    """The number of parent documents to split, embed and store at a time.
+    While the children of a batch are embedded and written, the next batches
+    are split. Defaults to None, which adds all documents as one batch."""
+
+    ingest_concurrency: int = 1
+    """The most batches being embedded and written at once. Defaults to 1, which
+    writes one batch while the next is split. Values above 1 write from several
+    threads at once, so the docstore and vectorstore must be thread-safe."""
+
+    def _split_batch(
+        self, documents: Sequence[Document], doc_ids: Sequence[str]
+    ) -> Tuple[List[Document], List[Tuple[str, Document]]]:
+        """Split parent documents into the child documents to embed."""
+        docs = []
+        full_docs = []
+        for _id, doc in zip(doc_ids, documents):
+            sub_docs = self.child_splitter.split_documents([doc])
+            if self.child_metadata_fields is not None:
+                for _doc in sub_docs:
+                    _doc.metadata = {
+                        k: _doc.metadata[k] for k in self.child_metadata_fields
+                    }
+            for _doc in sub_docs:
+                _doc.metadata[self.id_key] = _id
+            docs.extend(sub_docs)
+            full_docs.append((_id, doc))
+        return docs, full_docs
+
+    def _write_batch(
+        self,
+        docs: List[Document],
+        full_docs: List[Tuple[str, Document]],
+        add_to_docstore: bool,
+    ) -> None:
+        # parents are stored first so children never point to missing parents
+        if add_to_docstore:
+            self.docstore.mset(full_docs)
+            self._parent_lookup().forget([id_ for id_, _ in full_docs])
+        self.vectorstore.add_documents(docs)
+
     def add_documents(
         self,
         documents: List[Document],
@@ -105,20 +149,32 @@ class ParentDocumentRetriever(MultiVectorRetriever):
                 )
             doc_ids = ids
 
-        docs = []
-        full_docs = []
-        for i, doc in enumerate(documents):
-            _id = doc_ids[i]
-            sub_docs = self.child_splitter.split_documents([doc])
-            if self.child_metadata_fields is not None:
-                for _doc in sub_docs:
-                    _doc.metadata = {
-                        k: _doc.metadata[k] for k in self.child_metadata_fields
-                    }
-            for _doc in sub_docs:
-                _doc.metadata[self.id_key] = _id
-            docs.extend(sub_docs)
-            full_docs.append((_id, doc))
-        self.vectorstore.add_documents(docs)
-        if add_to_docstore:
-            self.docstore.mset(full_docs)
+        batch_size = self.ingest_batch_size or len(documents)
+        if batch_size >= len(documents):
+            docs, full_docs = self._split_batch(documents, doc_ids)
+            self._write_batch(docs, full_docs, add_to_docstore)
+            return
+
+        in_flight: Deque[Future] = deque()
+        with ContextThreadPoolExecutor(
+            max_workers=self.ingest_concurrency
+        ) as executor:
+            try:
+                for start in range(0, len(documents), batch_size):
+                    docs, full_docs = self._split_batch(
+                        documents[start : start + batch_size],
+                        doc_ids[start : start + batch_size],
+                    )
+                    if len(in_flight) >= self.ingest_concurrency:
+                        in_flight.popleft().result()
+                    in_flight.append(
+                        executor.submit(
+                            self._write_batch, docs, full_docs, add_to_docstore
+                        )
+                    )
+                while in_flight:
+                    in_flight.popleft().result()
+            finally:
+                # do not start batches after one failed
+                for future in in_flight:
+                    future.cancel()
@@ -15,6 +15,7 @@ from langchain_core.stores import (
 
 from langchain._api import create_importer
 from langchain.storage._lc_store import create_kv_docstore, create_lc_store
+from langchain.storage.embedding_segments import SegmentedEmbeddingStore
 from langchain.storage.encoder_backed import EncoderBackedStore
 from langchain.storage.file_system import LocalFileStore
 
@@ -51,6 +52,7 @@ __all__ = [
     "InvalidKeyException",
     "LocalFileStore",
     "RedisStore",
+    "SegmentedEmbeddingStore",
     "UpstashRedisByteStore",
     "UpstashRedisStore",
 ]
@@ -0,0 +1,275 @@
+"""A compact, append-only store for embedding vectors."""
+
+from __future__ import annotations
+
+import hashlib
+import mmap
+import os
+import struct
+import sys
+import threading
+import zlib
+from array import array
+from pathlib import Path
+from typing import BinaryIO, Dict, Iterator, List, Optional, Sequence, Tuple, Union
+
+from langchain_core.stores import BaseStore
+
+# digest of the key, number of floats (0 for a deletion), crc32 of the floats
+_HEADER = struct.Struct("<16sII")
+# digest of the key, length of the key, crc32 of the key
+_KEY_HEADER = struct.Struct("<16sII")
+_SEGMENT_SUFFIX = ".vec"
+_KEYS_FILE = "keys"
+
+
+def _to_bytes(vector: Sequence[float]) -> bytes:
+    floats = array("f", vector)
+    if sys.byteorder == "big":
+        floats.byteswap()
+    return floats.tobytes()
+
+
+def _from_bytes(data: Union[bytes, memoryview]) -> List[float]:
+    floats = array("f")
+    floats.frombytes(data)
+    if sys.byteorder == "big":
+        floats.byteswap()
+    return floats.tolist()
+
+
+class SegmentedEmbeddingStore(BaseStore[str, List[float]]):
+    """Store embedding vectors as float32 in append-only segment files.
+
+    Each vector takes 4 bytes per dimension plus a 24 byte header, instead of a
+    JSON file per vector. Keys are hashed to a 16 byte digest, and the digests
+    are indexed in memory when the store is opened. Vectors are read through
+    memory maps of the segments. Setting a key to the vector it already has
+    writes nothing, so re-ingesting unchanged texts costs no I/O. For
+    `yield_keys`, each key is also written once to a key file, which is loaded
+    into memory with the index.
+
+    Segments are only appended to, so a write interrupted by a crash leaves a
+    torn record at the end of the last segment, which is dropped when the store
+    is opened again. Each namespace is kept in its own subdirectory of
+    `root_path`, and a single store object should write to a namespace at a time.
+
+    Examples:
+
+        .. code-block:: python
+
+            from langchain.embeddings import CacheBackedEmbeddings
+            from langchain.storage import SegmentedEmbeddingStore
+
+            store = SegmentedEmbeddingStore(
+                "./embedding_cache", namespace=underlying_embedder.model_id
+            )
+            embedder = CacheBackedEmbeddings(underlying_embedder, store)
+    """
+
+    def __init__(
+        self,
+        root_path: Union[str, Path],
+        *,
+        namespace: str = "",
+        segment_bytes: int = 64 * 1024 * 1024,
+    ) -> None:
+        """Open or create a store.
+
+        Args:
+            root_path: The directory of the stores.
+            namespace: The namespace of the keys, such as the id of the embedding
+                model. Stores of different namespaces can share `root_path`, as
+                each namespace gets its own subdirectory.
+            segment_bytes: The size after which a new segment is started.
+        """
+        self.root_path = Path(root_path).absolute()
+        self.namespace = namespace
+        self.segment_bytes = segment_bytes
+        namespace_digest = hashlib.blake2b(
+            namespace.encode("utf-8"), digest_size=8
+        ).hexdigest()
+        self._dir = self.root_path / f"ns-{namespace_digest}"
+        self._dir.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.RLock()
+        # digest -> (segment, offset of the floats, number of floats)
+        self._index: Dict[bytes, Tuple[int, int, int]] = {}
+        # digest -> key, of every key written to the key file
+        self._keys: Dict[bytes, str] = {}
+        self._maps: Dict[int, mmap.mmap] = {}
+        self._file: Optional[BinaryIO] = None
+        self._keys_file: Optional[BinaryIO] = None
+        self._seq = 0
+        self._size = 0
+        self._load()
+
+    def mget(self, keys: Sequence[str]) -> List[Optional[List[float]]]:
+        """Get the vectors of the keys, None for keys that are not set."""
+        values: List[Optional[List[float]]] = []
+        with self._lock:
+            for key in keys:
+                location = self._index.get(self._digest(key))
+                if location is None:
+                    values.append(None)
+                    continue
+                seq, offset, dim = location
+                values.append(_from_bytes(self._view(seq, offset, dim * 4)))
+        return values
+
+    def mset(self, key_value_pairs: Sequence[Tuple[str, List[float]]]) -> None:
+        """Set vectors, skipping the keys that already have the same vector."""
+        with self._lock:
+            for key, vector in key_value_pairs:
+                digest = self._digest(key)
+                data = _to_bytes(vector)
+                location = self._index.get(digest)
+                if location is not None and location[2] * 4 == len(data):
+                    seq, offset, _ = location
+                    if self._view(seq, offset, len(data)) == data:
+                        continue
+                self._remember_key(digest, key)
+                self._append(digest, len(vector), data)
+            if self._keys_file is not None:
+                self._keys_file.flush()
+            if self._file is not None:
+                self._file.flush()
+
+    def mdelete(self, keys: Sequence[str]) -> None:
+        """Delete the vectors of the keys."""
+        with self._lock:
+            for key in keys:
+                digest = self._digest(key)
+                if digest in self._index:
+                    self._append(digest, 0, b"")
+            if self._file is not None:
+                self._file.flush()
+
+    def yield_keys(self, *, prefix: Optional[str] = None) -> Iterator[str]:
+        """Yield the keys that are set, optionally only those with a prefix."""
+        with self._lock:
+            # a vector whose key was lost in a crash is only found by mget
+            keys = [self._keys[d] for d in self._index if d in self._keys]
+        for key in keys:
+            if prefix is None or key.startswith(prefix):
+                yield key
+
+    def close(self) -> None:
+        """Close the segment files."""
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+            if self._keys_file is not None:
+                self._keys_file.close()
+                self._keys_file = None
+            for segment_map in self._maps.values():
+                segment_map.close()
+            self._maps.clear()
+
+    def _digest(self, key: str) -> bytes:
+        return hashlib.blake2b(
+            key.encode("utf-8"),
+            digest_size=16,
+            key=self.namespace.encode("utf-8")[:64],
+        ).digest()
+
+    def _segment_path(self, seq: int) -> Path:
+        return self._dir / f"{seq:08d}{_SEGMENT_SUFFIX}"
+
+    def _load(self) -> None:
+        self._load_keys()
+        seqs = sorted(
+            int(path.stem)
+            for path in self._dir.glob(f"*{_SEGMENT_SUFFIX}")
+            if path.stem.isdigit()
+        )
+        for seq in seqs:
+            valid = self._index_segment(seq)
+            path = self._segment_path(seq)
+            if valid < path.stat().st_size:
+                # a record torn by a crash, nothing after it can be trusted
+                self._maps.pop(seq).close()
+                os.truncate(path, valid)
+        self._seq = seqs[-1] if seqs else 0
+        self._size = self._segment_path(self._seq).stat().st_size if seqs else 0
+
+    def _load_keys(self) -> None:
+        path = self._dir / _KEYS_FILE
+        if not path.exists():
+            return
+        data = path.read_bytes()
+        offset = 0
+        while offset + _KEY_HEADER.size <= len(data):
+            digest, length, crc = _KEY_HEADER.unpack_from(data, offset)
+            start = offset + _KEY_HEADER.size
+            end = start + length
+            if end > len(data) or zlib.crc32(data[start:end]) != crc:
+                break
+            self._keys[digest] = data[start:end].decode("utf-8")
+            offset = end
+        if offset < len(data):
+            # a key torn by a crash
+            os.truncate(path, offset)
+
+    def _remember_key(self, digest: bytes, key: str) -> None:
+        if digest in self._keys:
+            return
+        if self._keys_file is None:
+            self._keys_file = open(self._dir / _KEYS_FILE, "ab")
+        data = key.encode("utf-8")
+        self._keys_file.write(
+            _KEY_HEADER.pack(digest, len(data), zlib.crc32(data)) + data
+        )
+        self._keys[digest] = key
+
+    def _index_segment(self, seq: int) -> int:
+        """Index the records of a segment, returning the size of the valid part."""
+        path = self._segment_path(seq)
+        if not path.stat().st_size:
+            return 0
+        with open(path, "rb") as f:
+            segment_map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        self._maps[seq] = segment_map
+        offset = 0
+        size = len(segment_map)
+        while offset + _HEADER.size <= size:
+            digest, dim, crc = _HEADER.unpack_from(segment_map, offset)
+            start = offset + _HEADER.size
+            end = start + dim * 4
+            if end > size or zlib.crc32(segment_map[start:end]) != crc:
+                break
+            if dim:
+                self._index[digest] = (seq, start, dim)
+            else:
+                self._index.pop(digest, None)
+            offset = end
+        return offset
+
+    def _append(self, digest: bytes, dim: int, data: bytes) -> None:
+        if self._file is None or self._size >= self.segment_bytes:
+            if self._file is not None:
+                self._file.close()
+            if self._size >= self.segment_bytes:
+                self._seq += 1
+                self._size = 0
+            self._file = open(self._segment_path(self._seq), "ab")
+        self._file.write(_HEADER.pack(digest, dim, zlib.crc32(data)) + data)
+        start = self._size + _HEADER.size
+        self._size = start + len(data)
+        if dim:
+            self._index[digest] = (self._seq, start, dim)
+        else:
+            self._index.pop(digest, None)
+
+    def _view(self, seq: int, offset: int, length: int) -> bytes:
+        segment_map = self._maps.get(seq)
+        if segment_map is None or offset + length > len(segment_map):
+            # the segment grew since it was mapped
+            if self._file is not None and seq == self._seq:
+                self._file.flush()
+            if segment_map is not None:
+                segment_map.close()
+            with open(self._segment_path(seq), "rb") as f:
+                segment_map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            self._maps[seq] = segment_map
+        return segment_map[offset : offset + length]
@@ -1,9 +1,13 @@
 import re
-from collections import defaultdict
+import threading
+import time
+from collections import OrderedDict, defaultdict
 from typing import (
     Any,
+    AsyncIterator,
     Callable,
     Dict,
+    Hashable,
     Iterator,
     List,
     Literal,
@@ -17,6 +21,7 @@ from typing import (
 
 from langchain_core._api.deprecation import deprecated
 from langchain_core.callbacks import (
+    AsyncCallbackManagerForLLMRun,
     CallbackManagerForLLMRun,
 )
 from langchain_core.language_models import LanguageModelInput
@@ -29,13 +34,19 @@ from langchain_core.messages import (
     HumanMessage,
     SystemMessage,
 )
-from langchain_core.outputs import ChatGeneration, ChatGenerationChunk, ChatResult
+from langchain_core.messages.ai import UsageMetadata
+from langchain_core.outputs import (
+    ChatGeneration,
+    ChatGenerationChunk,
+    ChatResult,
+    GenerationChunk,
+)
 from langchain_core.pydantic_v1 import BaseModel, Extra
 from langchain_core.runnables import Runnable
 from langchain_core.tools import BaseTool
 
 from langchain_aws.function_calling import convert_to_anthropic_tool, get_system_message
-from langchain_aws.llms.bedrock import BedrockBase
+from langchain_aws.llms.bedrock import BedrockBase, _JSONCachedDict
 from langchain_aws.utils import (
     get_num_tokens_anthropic,
     get_token_ids_anthropic,
@@ -196,7 +207,7 @@ def _format_image(image_url: str) -> Dict:
 
 def _format_anthropic_messages(
     messages: List[BaseMessage],
-) -> Tuple[Optional[str], List[Dict]]:
+) -> Tuple[Union[str, List[Dict], None], List[Dict]]:
     """Format messages for anthropic."""
 
     """
@@ -208,67 +219,339 @@ def _format_anthropic_messages(
         for m in messages
     ]
     """
-    system: Optional[str] = None
+    system: Union[str, List[Dict], None] = None
     formatted_messages: List[Dict] = []
     for i, message in enumerate(messages):
         if message.type == "system":
             if i != 0:
                 raise ValueError("System message must be at beginning of message list.")
-            if not isinstance(message.content, str):
+            if isinstance(message.content, str):
+                system = message.content
+            elif all(
+                isinstance(item, dict) and item.get("type") == "text"
+                for item in message.content
+            ):
+                # text blocks, possibly carrying cache_control breakpoints
+                system = cast(List[Dict], message.content)
+            else:
                 raise ValueError(
-                    "System message must be a string, "
+                    "System message must be a string or a list of text blocks, "
                     f"instead was: {type(message.content)}"
                 )
-            system = message.content
+            if "cache_control" in message.additional_kwargs:
+                system = _add_cache_breakpoint(
+                    system, message.additional_kwargs["cache_control"]
+                )
             continue
 
-        role = _message_type_lookups[message.type]
-        content: Union[str, List[Dict]]
-
-        if not isinstance(message.content, str):
-            # parse as dict
-            assert isinstance(
-                message.content, list
-            ), "Anthropic message content must be str or list of dicts"
-
-            # populate content
-            content = []
-            for item in message.content:
-                if isinstance(item, str):
-                    content.append(
-                        {
-                            "type": "text",
-                            "text": item,
-                        }
-                    )
-                elif isinstance(item, dict):
-                    if "type" not in item:
-                        raise ValueError("Dict content item must have a type key")
-                    if item["type"] == "image_url":
-                        # convert format
-                        source = _format_image(item["image_url"]["url"])
-                        content.append(
-                            {
-                                "type": "image",
-                                "source": source,
-                            }
-                        )
-                    else:
-                        content.append(item)
+        formatted_messages.append(_formatted_messages_cache.get_or_format(message))
+    return system, formatted_messages
+
+
+def _format_anthropic_message(message: BaseMessage) -> Dict:
+    """Format a single non-system message for anthropic."""
+    role = _message_type_lookups[message.type]
+    content: Union[str, List[Dict]]
+
+    if not isinstance(message.content, str):
+        # parse as dict
+        assert isinstance(
+            message.content, list
+        ), "Anthropic message content must be str or list of dicts"
+
+        # populate content
+        content = []
+        for item in message.content:
+            if isinstance(item, str):
+                content.append(
+                    {
+                        "type": "text",
+                        "text": item,
+                    }
+                )
+            elif isinstance(item, dict):
+                if "type" not in item:
+                    raise ValueError("Dict content item must have a type key")
+                if item["type"] == "image_url":
+                    # convert format
+                    source = _format_image(item["image_url"]["url"])
+                    image = {"type": "image", "source": source}
+                    if "cache_control" in item:
+                        image["cache_control"] = item["cache_control"]
+                    content.append(image)
                 else:
-                    raise ValueError(
-                        f"Content items must be str or dict, instead was: {type(item)}"
-                    )
-        else:
-            content = message.content
+                    content.append(item)
+            else:
+                raise ValueError(
+                    f"Content items must be str or dict, instead was: {type(item)}"
+                )
+    else:
+        content = message.content
 
-        formatted_messages.append(
-            {
-                "role": role,
-                "content": content,
-            }
+    if "cache_control" in message.additional_kwargs:
+        content = _add_cache_breakpoint(
+            content, message.additional_kwargs["cache_control"]
+        )
+
+    return _JSONCachedDict(role=role, content=content)
+
+
+def _freeze(value: Any) -> Hashable:
+    if isinstance(value, str):
+        return value
+    if isinstance(value, dict):
+        return (dict, tuple((k, _freeze(v)) for k, v in value.items()))
+    if isinstance(value, (list, tuple)):
+        return (list, tuple(_freeze(v) for v in value))
+    # raises TypeError for unhashable values, which are then not cached
+    hash(value)
+    return (type(value), value)
+
+
+def _message_cache_key(message: BaseMessage) -> Optional[Hashable]:
+    try:
+        return (
+            message.type,
+            _freeze(message.content),
+            _freeze(message.additional_kwargs.get("cache_control")),
+        )
+    except TypeError:
+        return None
+
+
+class _FormattedMessageCache:
+    """LRU cache of formatted anthropic messages keyed by message content.
+
+    Looking up a message hashes and compares its content in a single pass, which
+    is far cheaper than re-running the image regex over base64 data and
+    re-serializing the message. Cached messages also keep their JSON
+    serialization, see `_JSONCachedDict`.
+    """
+
+    def __init__(self, maxsize: int) -> None:
+        self.maxsize = maxsize
+        self._lock = threading.Lock()
+        self._cache: "OrderedDict[Hashable, Dict]" = OrderedDict()
+
+    def get_or_format(self, message: BaseMessage) -> Dict:
+        key = _message_cache_key(message)
+        if key is None:
+            return _format_anthropic_message(message)
+        with self._lock:
+            formatted = self._cache.get(key)
+            if formatted is not None:
+                self._cache.move_to_end(key)
+                return formatted
+        formatted = _format_anthropic_message(message)
+        with self._lock:
+            self._cache[key] = formatted
+            while len(self._cache) > self.maxsize:
+                self._cache.popitem(last=False)
+        return formatted
+
+    def clear(self) -> None:
+        with self._lock:
+            self._cache.clear()
+
+
+_formatted_messages_cache = _FormattedMessageCache(maxsize=512)
+
+
+def _add_cache_breakpoint(
+    content: Union[str, List[Dict]],
+    cache_control: Optional[Dict] = None,
+) -> Union[str, List[Dict]]:
+    """Return content as a list of blocks with a cache breakpoint on the last one.
+
+    Empty text blocks, which Anthropic rejects, are dropped so the breakpoint
+    lands on the last non-empty block. Content without one is returned as is.
+    The input blocks are not mutated.
+    """
+    if isinstance(content, str):
+        blocks: List[Dict] = [{"type": "text", "text": content}]
+    else:
+        blocks = list(content)
+    blocks = [block for block in blocks if not _is_empty_text_block(block)]
+    if not blocks:
+        return content
+    blocks[-1] = {**blocks[-1], "cache_control": cache_control or _CACHE_CONTROL}
+    return blocks
+
+
+def _is_empty(content: Union[str, List[Dict]]) -> bool:
+    if isinstance(content, str):
+        return not content
+    return all(_is_empty_text_block(block) for block in content)
+
+
+def _is_empty_text_block(block: Any) -> bool:
+    return (
+        isinstance(block, dict) and block.get("type") == "text" and not block["text"]
+    )
+
+
+def _has_cache_breakpoint(content: Union[str, List[Dict], None]) -> bool:
+    return isinstance(content, list) and any(
+        isinstance(block, dict) and "cache_control" in block for block in content
+    )
+
+
+def _count_cache_breakpoints(
+    system: Union[str, List[Dict], None], messages: List[Dict]
+) -> int:
+    blocks = list(system) if isinstance(system, list) else []
+    for message in messages:
+        if isinstance(message["content"], list):
+            blocks.extend(message["content"])
+    return sum(
+        1 for block in blocks if isinstance(block, dict) and "cache_control" in block
+    )
+
+
+def _place_cache_breakpoints(
+    system: Union[str, List[Dict], None], messages: List[Dict]
+) -> Tuple[Union[str, List[Dict], None], List[Dict]]:
+    """Mark the stable prefixes of an Anthropic request as cacheable.
+
+    Breakpoints are placed, in order of priority, at the end of the system prompt,
+    at the end of the last non-empty message (so the whole prompt is written to
+    the cache) and at the end of the previous user turn (so the prompt written by
+    the previous call is read back). When the system prompt starts with a separate
+    tool definitions block, that block gets the remaining breakpoint. Explicit
+    breakpoints are kept and count towards Anthropic's limit of four per request.
+    """
+    budget = _MAX_CACHE_BREAKPOINTS - _count_cache_breakpoints(system, messages)
+    messages = list(messages)
+    if system and budget > 0 and not _has_cache_breakpoint(system):
+        system = _add_cache_breakpoint(system)
+        budget -= _has_cache_breakpoint(system)
+    user_turns = [i for i, m in enumerate(messages) if m["role"] == "user"]
+    # an empty final message, such as an assistant prefill, cannot carry one
+    filled = [i for i, m in enumerate(messages) if not _is_empty(m["content"])]
+    candidates = filled[-1:] + user_turns[-2:-1]
+    for i in candidates:
+        if budget <= 0 or i < 0:
+            break
+        if _has_cache_breakpoint(messages[i]["content"]):
+            continue
+        messages[i] = {
+            **messages[i],
+            "content": _add_cache_breakpoint(messages[i]["content"]),
+        }
+        budget -= _has_cache_breakpoint(messages[i]["content"])
+    if isinstance(system, list) and len(system) > 1 and budget > 0:
+        if not _has_cache_breakpoint(system[:1]):
+            system = cast(List[Dict], _add_cache_breakpoint(system[:1])) + system[1:]
+    return system, messages
+
+
+def _percentile(sorted_values: List[float], q: float) -> float:
+    """Nearest-rank percentile of an ascending list."""
+    index = max(0, min(len(sorted_values) - 1, int(round(q * len(sorted_values))) - 1))
+    return sorted_values[index]
+
+
+def _stream_latency_metrics(
+    started: float, token_times: List[float], finished: float
+) -> Dict[str, Any]:
+    """Compute latency metrics of a streamed response, in milliseconds."""
+    metrics: Dict[str, Any] = {"total_duration_ms": (finished - started) * 1000}
+    if token_times:
+        metrics["time_to_first_token_ms"] = (token_times[0] - started) * 1000
+    gaps = sorted(
+        (later - earlier) * 1000 for earlier, later in zip(token_times, token_times[1:])
+    )
+    if gaps:
+        metrics["inter_token_latency_ms"] = {
+            "p50": _percentile(gaps, 0.5),
+            "p90": _percentile(gaps, 0.9),
+            "p99": _percentile(gaps, 0.99),
+            "max": gaps[-1],
+        }
+    return metrics
+
+
+def _usage_info_from_stream(
+    usage: Dict[str, Any], invocation_metrics: Dict[str, Any]
+) -> Dict[str, int]:
+    """Build a usage dict in the same shape as the non-streaming response."""
+    prompt_tokens = int(
+        usage.get("input_tokens", invocation_metrics.get("inputTokenCount", 0))
+    )
+    completion_tokens = int(
+        usage.get("output_tokens", invocation_metrics.get("outputTokenCount", 0))
+    )
+    return {
+        "prompt_tokens": prompt_tokens,
+        "completion_tokens": completion_tokens,
+        "total_tokens": prompt_tokens + completion_tokens,
+        "cache_read_input_tokens": int(usage.get("cache_read_input_tokens") or 0),
+        "cache_write_input_tokens": int(usage.get("cache_creation_input_tokens") or 0),
+    }
+
+
+def _text_generation_chunk(text: str) -> ChatGenerationChunk:
+    """Build the chunk of a streamed text delta without running the validators.
+
+    This runs once per token and the delta is always a plain string, so there
+    is nothing for the validators to check. ``construct`` skips the validator
+    that derives ``text`` from the message, so it is set here.
+    """
+    return ChatGenerationChunk.construct(
+        message=AIMessageChunk.construct(content=text), text=text
+    )
+
+
+class _StreamAccumulator:
+    """Collect the usage, stop reason and token timings of a streamed response."""
+
+    def __init__(self, model_id: str) -> None:
+        self.model_id = model_id
+        self.usage: Dict[str, Any] = {}
+        self.invocation_metrics: Dict[str, Any] = {}
+        self.stop_reason: Optional[str] = None
+        self.token_times: List[float] = []
+        self.started = time.perf_counter()
+
+    def add(self, chunk: GenerationChunk) -> Optional[ChatGenerationChunk]:
+        """Record a chunk, returning the chunk to yield for a text delta."""
+        generation_info = chunk.generation_info or {}
+        self.invocation_metrics.update(generation_info.get("invocation_metrics") or {})
+        if "usage" in generation_info:
+            self.usage.update(generation_info["usage"])
+            self.stop_reason = generation_info.get("stop_reason") or self.stop_reason
+            return None
+        if chunk.text:
+            self.token_times.append(time.perf_counter())
+        return _text_generation_chunk(chunk.text)
+
+    def final_chunk(self) -> ChatGenerationChunk:
+        """The final chunk, carrying token usage and latency metrics.
+
+        Callback handlers see it through on_llm_new_token and on_llm_end.
+        """
+        usage_info = _usage_info_from_stream(self.usage, self.invocation_metrics)
+        response_metadata: Dict[str, Any] = {
+            "model_id": self.model_id,
+            "stop_reason": self.stop_reason,
+            "usage": usage_info,
+            "metrics": _stream_latency_metrics(
+                self.started, self.token_times, time.perf_counter()
+            ),
+        }
+        if self.invocation_metrics:
+            response_metadata["invocation_metrics"] = self.invocation_metrics
+        return ChatGenerationChunk(
+            message=AIMessageChunk(
+                content="",
+                usage_metadata=UsageMetadata(
+                    input_tokens=usage_info["prompt_tokens"],
+                    output_tokens=usage_info["completion_tokens"],
+                    total_tokens=usage_info["total_tokens"],
+                ),
+                response_metadata=response_metadata,
+            )
         )
-    return system, formatted_messages
 
 
 class ChatPromptAdapter:
@@ -304,7 +587,7 @@ class ChatPromptAdapter:
     @classmethod
     def format_messages(
         cls, provider: str, messages: List[BaseMessage]
-    ) -> Tuple[Optional[str], List[Dict]]:
+    ) -> Tuple[Union[str, List[Dict], None], List[Dict]]:
         if provider == "anthropic":
             return _format_anthropic_messages(messages)
 
@@ -315,12 +598,24 @@ class ChatPromptAdapter:
 
 _message_type_lookups = {"human": "user", "ai": "assistant"}
 
+_CACHE_CONTROL = {"type": "ephemeral"}
+_MAX_CACHE_BREAKPOINTS = 4
+
 
 class ChatBedrock(BaseChatModel, BedrockBase):
     """A chat model that uses the Bedrock API."""
 
     system_prompt_with_tools: str = ""
 
+    prompt_caching: bool = False
+    """Whether to place Anthropic prompt cache breakpoints automatically.
+
+    When enabled, the system prompt, the tool definitions and the conversation
+    history up to the latest turn are marked as cacheable, so Bedrock can reuse
+    the processed prefix on the next call. Breakpoints can also be set explicitly,
+    with or without this flag, through a `cache_control` key on a content block or
+    in a message's `additional_kwargs`. Only applies to Anthropic models."""
+
     @property
     def _llm_type(self) -> str:
         """Return type of chat model."""
@@ -361,19 +656,13 @@ class ChatBedrock(BaseChatModel, BedrockBase):
         prompt, system, formatted_messages = None, None, None
 
         if provider == "anthropic":
-            system, formatted_messages = ChatPromptAdapter.format_messages(
-                provider, messages
-            )
-            if self.system_prompt_with_tools:
-                if system:
-                    system = self.system_prompt_with_tools + f"\n{system}"
-                else:
-                    system = self.system_prompt_with_tools
+            system, formatted_messages = self._format_anthropic_input(messages)
         else:
             prompt = ChatPromptAdapter.convert_messages_to_prompt(
                 provider=provider, messages=messages, model=self._get_model()
             )
 
+        stream = _StreamAccumulator(self.model_id)
         for chunk in self._prepare_input_and_invoke_stream(
             prompt=prompt,
             system=system,
@@ -382,8 +671,41 @@ class ChatBedrock(BaseChatModel, BedrockBase):
             run_manager=run_manager,
             **kwargs,
         ):
-            delta = chunk.text
-            yield ChatGenerationChunk(message=AIMessageChunk(content=delta))
+            generation_chunk = stream.add(chunk)
+            if generation_chunk is not None:
+                yield generation_chunk
+        yield stream.final_chunk()
+
+    async def _astream(
+        self,
+        messages: List[BaseMessage],
+        stop: Optional[List[str]] = None,
+        run_manager: Optional[AsyncCallbackManagerForLLMRun] = None,
+        **kwargs: Any,
+    ) -> AsyncIterator[ChatGenerationChunk]:
+        provider = self._get_provider()
+        prompt, system, formatted_messages = None, None, None
+
+        if provider == "anthropic":
+            system, formatted_messages = self._format_anthropic_input(messages)
+        else:
+            prompt = ChatPromptAdapter.convert_messages_to_prompt(
+                provider=provider, messages=messages, model=self._get_model()
+            )
+
+        stream = _StreamAccumulator(self.model_id)
+        async for chunk in self._aprepare_input_and_invoke_stream(
+            prompt=prompt,
+            system=system,
+            messages=formatted_messages,
+            stop=stop,
+            run_manager=run_manager,
+            **kwargs,
+        ):
+            generation_chunk = stream.add(chunk)
+            if generation_chunk is not None:
+                yield generation_chunk
+        yield stream.final_chunk()
 
     def _generate(
         self,
@@ -395,23 +717,22 @@ class ChatBedrock(BaseChatModel, BedrockBase):
         completion = ""
         llm_output: Dict[str, Any] = {"model_id": self.model_id}
         usage_info: Dict[str, Any] = {}
+        response_metadata: Dict[str, Any] = {}
         if self.streaming:
+            texts = []
             for chunk in self._stream(messages, stop, run_manager, **kwargs):
-                completion += chunk.text
+                texts.append(chunk.text)
+                response_metadata.update(chunk.message.response_metadata)
+            completion = "".join(texts)
+            usage_info = response_metadata.get("usage", {})
+            llm_output["usage"] = usage_info
         else:
             provider = self._get_provider()
             prompt, system, formatted_messages = None, None, None
             params: Dict[str, Any] = {**kwargs}
 
             if provider == "anthropic":
-                system, formatted_messages = ChatPromptAdapter.format_messages(
-                    provider, messages
-                )
-                if self.system_prompt_with_tools:
-                    if system:
-                        system = self.system_prompt_with_tools + f"\n{system}"
-                    else:
-                        system = self.system_prompt_with_tools
+                system, formatted_messages = self._format_anthropic_input(messages)
             else:
                 prompt = ChatPromptAdapter.convert_messages_to_prompt(
                     provider=provider, messages=messages, model=self._get_model()
@@ -431,17 +752,53 @@ class ChatBedrock(BaseChatModel, BedrockBase):
 
             llm_output["usage"] = usage_info
 
+        usage_metadata = (
+            UsageMetadata(
+                input_tokens=usage_info["prompt_tokens"],
+                output_tokens=usage_info["completion_tokens"],
+                total_tokens=usage_info["total_tokens"],
+            )
+            if usage_info
+            else None
+        )
         return ChatResult(
             generations=[
                 ChatGeneration(
                     message=AIMessage(
-                        content=completion, additional_kwargs={"usage": usage_info}
+                        content=completion,
+                        additional_kwargs={"usage": usage_info},
+                        usage_metadata=usage_metadata,
+                        response_metadata=response_metadata,
                     )
                 )
             ],
             llm_output=llm_output,
         )
 
+    def _format_anthropic_input(
+        self, messages: List[BaseMessage]
+    ) -> Tuple[Union[str, List[Dict], None], List[Dict]]:
+        system, formatted_messages = ChatPromptAdapter.format_messages(
+            "anthropic", messages
+        )
+        if self.system_prompt_with_tools:
+            if isinstance(system, list) or self.prompt_caching:
+                # keep the tool definitions in their own block so they can be
+                # cached independently of the rest of the system prompt
+                tools_block = {"type": "text", "text": self.system_prompt_with_tools}
+                if isinstance(system, str):
+                    system = [{"type": "text", "text": system}] if system else []
+                system = [tools_block, *(system or [])]
+            elif system:
+                system = self.system_prompt_with_tools + f"\n{system}"
+            else:
+                system = self.system_prompt_with_tools
+        if self.prompt_caching:
+            system, formatted_messages = _place_cache_breakpoints(
+                system, formatted_messages
+            )
+        return system, formatted_messages
+
     def _combine_llm_outputs(self, llm_outputs: List[Optional[dict]]) -> dict:
         final_usage: Dict[str, int] = defaultdict(int)
         final_output = {}
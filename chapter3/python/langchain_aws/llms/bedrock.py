@@ -12,6 +12,7 @@ from typing import (
     Mapping,
     Optional,
     Tuple,
+    Union,
 )
 
 from langchain_core._api.deprecation import deprecated
@@ -31,6 +32,7 @@ from langchain_aws.utils import (
 )
 
 AMAZON_BEDROCK_TRACE_KEY = "amazon-bedrock-trace"
+INVOCATION_METRICS_KEY = "amazon-bedrock-invocationMetrics"
 GUARDRAILS_BODY_KEY = "amazon-bedrock-guardrailAssessment"
 HUMAN_PROMPT = "\n\nHuman:"
 ASSISTANT_PROMPT = "\n\nAssistant:"
@@ -79,20 +81,74 @@ def _human_assistant_format(input_text: str) -> str:
     return input_text
 
 
+class _JSONCachedDict(dict):
+    """A dict that memoizes its JSON serialization.
+
+    Used for formatted chat messages that are reused across requests. It must
+    not be mutated once serialized.
+    """
+
+    __slots__ = ("_json",)
+
+    def to_json(self) -> str:
+        try:
+            return self._json
+        except AttributeError:
+            self._json = json.dumps(self)
+            return self._json
+
+
+def _dumps_body(input_body: Dict[str, Any]) -> str:
+    """Serialize a request body, reusing the cached JSON of formatted messages."""
+    messages = input_body.get("messages")
+    if not messages:
+        return json.dumps(input_body)
+    rest = json.dumps({k: v for k, v in input_body.items() if k != "messages"})
+    fragments = [
+        m.to_json() if isinstance(m, _JSONCachedDict) else json.dumps(m)
+        for m in messages
+    ]
+    separator = ", " if rest != "{}" else ""
+    return f'{rest[:-1]}{separator}"messages": [{", ".join(fragments)}]}}'
+
+
 def _stream_response_to_generation_chunk(
     stream_response: Dict[str, Any],
 ) -> GenerationChunk:
     """Convert a stream response to a generation chunk."""
     if not stream_response["delta"]:
-        return GenerationChunk(text="")
-    return GenerationChunk(
-        text=stream_response["delta"]["text"],
+        return GenerationChunk.construct(text="")
+    # one chunk per token, built without validation as the fields are plain
+    return GenerationChunk.construct(
+        text=stream_response["delta"].get("text", ""),
         generation_info=dict(
             finish_reason=stream_response.get("stop_reason", None),
         ),
     )
 
 
+def _stream_response_to_metadata_chunk(
+    stream_response: Dict[str, Any],
+) -> GenerationChunk:
+    """Convert a message_start, message_delta or message_stop event to an empty
+    chunk whose generation info carries the token usage and stop reason.
+
+    Token counts of later events override earlier ones, e.g. the output token
+    count of message_delta is the total for the response.
+    """
+    generation_info: Dict[str, Any] = {"usage": {}}
+    if stream_response["type"] == "message_start":
+        generation_info["usage"] = stream_response["message"].get("usage") or {}
+    elif stream_response["type"] == "message_delta":
+        generation_info["usage"] = stream_response.get("usage") or {}
+        generation_info["stop_reason"] = stream_response["delta"].get("stop_reason")
+    if INVOCATION_METRICS_KEY in stream_response:
+        generation_info["invocation_metrics"] = stream_response[
+            INVOCATION_METRICS_KEY
+        ]
+    return GenerationChunk(text="", generation_info=generation_info)
+
+
 class LLMInputOutputAdapter:
     """Adapter class to prepare the inputs from Langchain to a format
     that LLM model expects.
@@ -114,7 +170,7 @@ class LLMInputOutputAdapter:
         provider: str,
         model_kwargs: Dict[str, Any],
         prompt: Optional[str] = None,
-        system: Optional[str] = None,
+        system: Union[str, List[Dict], None] = None,
         messages: Optional[List[Dict]] = None,
     ) -> Dict[str, Any]:
         input_body = {**model_kwargs}
@@ -168,6 +224,19 @@ class LLMInputOutputAdapter:
         headers = response.get("ResponseMetadata", {}).get("HTTPHeaders", {})
         prompt_tokens = int(headers.get("x-amzn-bedrock-input-token-count", 0))
         completion_tokens = int(headers.get("x-amzn-bedrock-output-token-count", 0))
+        body_usage = response_body.get("usage") or {}
+        cache_read_tokens = int(
+            headers.get(
+                "x-amzn-bedrock-cache-read-input-token-count",
+                body_usage.get("cache_read_input_tokens") or 0,
+            )
+        )
+        cache_write_tokens = int(
+            headers.get(
+                "x-amzn-bedrock-cache-write-input-token-count",
+                body_usage.get("cache_creation_input_tokens") or 0,
+            )
+        )
         return {
             "text": text,
             "body": response_body,
@@ -175,6 +244,8 @@ class LLMInputOutputAdapter:
                 "prompt_tokens": prompt_tokens,
                 "completion_tokens": completion_tokens,
                 "total_tokens": prompt_tokens + completion_tokens,
+                "cache_read_input_tokens": cache_read_tokens,
+                "cache_write_input_tokens": cache_write_tokens,
             },
         }
 
@@ -219,20 +290,27 @@ class LLMInputOutputAdapter:
             ):
                 return
 
-            elif messages_api and (chunk_obj.get("type") == "content_block_stop"):
-                return
-
-            if messages_api and chunk_obj.get("type") in (
-                "message_start",
-                "content_block_start",
-                "content_block_delta",
-            ):
+            if messages_api:
                 if chunk_obj.get("type") == "content_block_delta":
-                    chk = _stream_response_to_generation_chunk(chunk_obj)
-                    yield chk
-                else:
-                    continue
+                    yield _stream_response_to_generation_chunk(chunk_obj)
+                elif chunk_obj.get("type") in (
+                    "message_start",
+                    "message_delta",
+                    "message_stop",
+                ):
+                    yield _stream_response_to_metadata_chunk(chunk_obj)
             else:
+                generation_info = {
+                    GUARDRAILS_BODY_KEY: (
+                        chunk_obj.get(GUARDRAILS_BODY_KEY)
+                        if GUARDRAILS_BODY_KEY in chunk_obj
+                        else None
+                    ),
+                }
+                if INVOCATION_METRICS_KEY in chunk_obj:
+                    generation_info["invocation_metrics"] = chunk_obj[
+                        INVOCATION_METRICS_KEY
+                    ]
                 # chunk obj format varies with provider
                 yield GenerationChunk(
                     text=(
@@ -240,56 +318,19 @@ class LLMInputOutputAdapter:
                         if provider != "mistral"
                         else chunk_obj[output_key][0]["text"]
                     ),
-                    generation_info={
-                        GUARDRAILS_BODY_KEY: (
-                            chunk_obj.get(GUARDRAILS_BODY_KEY)
-                            if GUARDRAILS_BODY_KEY in chunk_obj
-                            else None
-                        ),
-                    },
+                    generation_info=generation_info,
                 )
 
     @classmethod
     async def aprepare_output_stream(
-        cls, provider: str, response: Any, stop: Optional[List[str]] = None
+        cls,
+        provider: str,
+        response: Any,
+        stop: Optional[List[str]] = None,
+        messages_api: bool = False,
     ) -> AsyncIterator[GenerationChunk]:
-        stream = response.get("body")
-
-        if not stream:
-            return
-
-        output_key = cls.provider_to_output_key_map.get(provider, None)
-
-        if not output_key:
-            raise ValueError(
-                f"Unknown streaming response output key for provider: {provider}"
-            )
-
-        for event in stream:
-            chunk = event.get("chunk")
-            if not chunk:
-                continue
-
-            chunk_obj = json.loads(chunk.get("bytes").decode())
-
-            if provider == "cohere" and (
-                chunk_obj["is_finished"] or chunk_obj[output_key] == "<EOS_TOKEN>"
-            ):
-                return
-
-            if (
-                provider == "mistral"
-                and chunk_obj.get(output_key, [{}])[0].get("stop_reason", "") == "stop"
-            ):
-                return
-
-            yield GenerationChunk(
-                text=(
-                    chunk_obj[output_key]
-                    if provider != "mistral"
-                    else chunk_obj[output_key][0]["text"]
-                )
-            )
+        for chunk in cls.prepare_output_stream(provider, response, stop, messages_api):
+            yield chunk
 
 
 class BedrockBase(BaseLanguageModel, ABC):
@@ -498,7 +539,7 @@ class BedrockBase(BaseLanguageModel, ABC):
     def _prepare_input_and_invoke(
         self,
         prompt: Optional[str] = None,
-        system: Optional[str] = None,
+        system: Union[str, List[Dict], None] = None,
         messages: Optional[List[Dict]] = None,
         stop: Optional[List[str]] = None,
         run_manager: Optional[CallbackManagerForLLMRun] = None,
@@ -516,7 +557,7 @@ class BedrockBase(BaseLanguageModel, ABC):
             system=system,
             messages=messages,
         )
-        body = json.dumps(input_body)
+        body = _dumps_body(input_body)
         accept = "application/json"
         contentType = "application/json"
 
@@ -596,7 +637,7 @@ class BedrockBase(BaseLanguageModel, ABC):
     def _prepare_input_and_invoke_stream(
         self,
         prompt: Optional[str] = None,
-        system: Optional[str] = None,
+        system: Union[str, List[Dict], None] = None,
         messages: Optional[List[Dict]] = None,
         stop: Optional[List[str]] = None,
         run_manager: Optional[CallbackManagerForLLMRun] = None,
@@ -628,7 +669,7 @@ class BedrockBase(BaseLanguageModel, ABC):
             messages=messages,
             model_kwargs=params,
         )
-        body = json.dumps(input_body)
+        body = _dumps_body(input_body)
 
         request_options = {
             "body": body,
@@ -658,14 +699,17 @@ class BedrockBase(BaseLanguageModel, ABC):
         ):
             yield chunk
             # verify and raise callback error if any middleware intervened
-            self._get_bedrock_services_signal(chunk.generation_info)  # type: ignore[arg-type]
+            self._get_bedrock_services_signal(chunk.generation_info or {})
 
-            if run_manager is not None:
+            # usage and stop reason events are not tokens
+            if run_manager is not None and "usage" not in (chunk.generation_info or {}):
                 run_manager.on_llm_new_token(chunk.text, chunk=chunk)
 
     async def _aprepare_input_and_invoke_stream(
         self,
-        prompt: str,
+        prompt: Optional[str] = None,
+        system: Union[str, List[Dict], None] = None,
+        messages: Optional[List[Dict]] = None,
         stop: Optional[List[str]] = None,
         run_manager: Optional[AsyncCallbackManagerForLLMRun] = None,
         **kwargs: Any,
@@ -686,24 +730,50 @@ class BedrockBase(BaseLanguageModel, ABC):
 
         params = {**_model_kwargs, **kwargs}
         input_body = LLMInputOutputAdapter.prepare_input(
-            provider=provider, prompt=prompt, model_kwargs=params
-        )
-        body = json.dumps(input_body)
-
-        response = await asyncio.get_running_loop().run_in_executor(
-            None,
-            lambda: self.client.invoke_model_with_response_stream(
-                body=body,
-                modelId=self.model_id,
-                accept="application/json",
-                contentType="application/json",
-            ),
+            provider=provider,
+            prompt=prompt,
+            system=system,
+            messages=messages,
+            model_kwargs=params,
         )
+        body = _dumps_body(input_body)
+
+        request_options = {
+            "body": body,
+            "modelId": self.model_id,
+            "accept": "application/json",
+            "contentType": "application/json",
+        }
+
+        if self._guardrails_enabled:
+            request_options["guardrailIdentifier"] = self.guardrails.get(  # type: ignore[union-attr]
+                "guardrailIdentifier", ""
+            )
+            request_options["guardrailVersion"] = self.guardrails.get(  # type: ignore[union-attr]
+                "guardrailVersion", ""
+            )
+            if self.guardrails.get("trace"):  # type: ignore[union-attr]
+                request_options["trace"] = "ENABLED"
+
+        try:
+            response = await asyncio.get_running_loop().run_in_executor(
+                None,
+                lambda: self.client.invoke_model_with_response_stream(
+                    **request_options
+                ),
+            )
+        except Exception as e:
+            raise ValueError(f"Error raised by bedrock service: {e}")
 
         async for chunk in LLMInputOutputAdapter.aprepare_output_stream(
-            provider, response, stop
+            provider, response, stop, True if messages else False
         ):
             yield chunk
+            self._get_bedrock_services_signal(chunk.generation_info or {})
+
+            # usage and stop reason events are not tokens
+            if "usage" in (chunk.generation_info or {}):
+                continue
             if run_manager is not None and asyncio.iscoroutinefunction(
                 run_manager.on_llm_new_token
             ):
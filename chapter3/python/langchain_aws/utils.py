@@ -1,4 +1,6 @@
 import re
+import unicodedata
+from functools import lru_cache
 from typing import Any, List
 
 
@@ -7,6 +9,7 @@ def enforce_stop_tokens(text: str, stop: List[str]) -> str:
     return re.split("|".join(stop), text, maxsplit=1)[0]
 
 
+@lru_cache(maxsize=1)
 def _get_anthropic_client() -> Any:
     try:
         import anthropic
@@ -20,7 +23,12 @@ def _get_anthropic_client() -> Any:
 
 
 def get_num_tokens_anthropic(text: str) -> int:
-    """Get the number of tokens in a string of text."""
+    """Get the number of tokens in a string of text.
+
+    This uses the local tokenizer of the anthropic package, which versions
+    0.39 and later no longer include. See `estimate_num_tokens` for an estimate
+    that needs no package.
+    """
     client = _get_anthropic_client()
     return client.count_tokens(text=text)
 
@@ -31,3 +39,32 @@ def get_token_ids_anthropic(text: str) -> List[int]:
     tokenizer = client.get_tokenizer()
     encoded_text = tokenizer.encode(text)
     return encoded_text.ids
+
+
+# scripts whose characters are about one token each
+_WIDE_SCRIPTS = ("CJK", "HIRAGANA", "KATAKANA", "HANGUL", "IDEOGRAPHIC", "FULLWIDTH")
+
+
+@lru_cache(maxsize=4096)
+def _is_wide_char(char: str) -> bool:
+    return unicodedata.name(char, "").startswith(_WIDE_SCRIPTS)
+
+
+def estimate_num_tokens(text: str) -> int:
+    """Estimate the number of tokens in a string of text without a tokenizer.
+
+    Chinese, Japanese and Korean characters count as one token each and other
+    text as one token per four characters, which is close to the tokenizers of
+    the Claude models. Use it where an upper bound that is cheap to compute is
+    good enough, such as fitting a chat history into a budget.
+    """
+    wide = 0
+    other = 0
+    for char in text:
+        if ord(char) < 0x2E80:
+            other += 1
+        elif _is_wide_char(char):
+            wide += 1
+        else:
+            other += 1
+    return wide + (other + 3) // 4
@@ -1,21 +1,136 @@
 from __future__ import annotations
 
+import json
 import logging
-from typing import TYPE_CHECKING, Dict, List, Optional
+import queue
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    AsyncIterator,
+    Callable,
+    Dict,
+    Iterator,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+)
 
 from langchain_core.chat_history import BaseChatMessageHistory
 from langchain_core.messages import (
     BaseMessage,
     message_to_dict,
     messages_from_dict,
-    messages_to_dict,
 )
+from langchain_core.runnables.config import run_in_executor
 
 if TYPE_CHECKING:
     from boto3.session import Session
 
 logger = logging.getLogger(__name__)
 
+# compactions run here, so summarizing does not hold up adding messages
+_compaction_executor = ThreadPoolExecutor(
+    max_workers=2, thread_name_prefix="dynamodb-history-compaction"
+)
+
+# request size limits of BatchGetItem and BatchWriteItem
+_BATCH_GET_SIZE = 100
+_BATCH_WRITE_SIZE = 25
+_MAX_BATCH_RETRIES = 8
+# attempts of a write that lost the race with another write of the same history
+_MAX_WRITE_RETRIES = 5
+_ARCHIVE_MARKER = "#archive#"
+
+
+def _dynamodb_resource(
+    endpoint_url: Optional[str] = None, boto3_session: Optional[Session] = None
+) -> Any:
+    if boto3_session:
+        return boto3_session.resource("dynamodb", endpoint_url=endpoint_url)
+    try:
+        import boto3
+    except ImportError as e:
+        raise ImportError(
+            "Unable to import boto3, please install with `pip install boto3`."
+        ) from e
+    if endpoint_url:
+        return boto3.resource("dynamodb", endpoint_url=endpoint_url)
+    return boto3.resource("dynamodb")
+
+
+def _backoff(attempt: int) -> None:
+    time.sleep(min(0.05 * 2**attempt, 2.0))
+
+
+def _batch_get(
+    client: Any,
+    table_name: str,
+    keys: List[Dict[str, Any]],
+    projection: Optional[List[str]] = None,
+) -> List[Dict[str, Any]]:
+    """Get up to 100 items, retrying the keys DynamoDB leaves unprocessed."""
+    from boto3.dynamodb.types import TypeDeserializer, TypeSerializer
+
+    serializer = TypeSerializer()
+    deserializer = TypeDeserializer()
+    request: Dict[str, Any] = {
+        "Keys": [
+            {name: serializer.serialize(value) for name, value in key.items()}
+            for key in keys
+        ]
+    }
+    if projection:
+        request["ProjectionExpression"] = ", ".join(
+            f"#a{i}" for i in range(len(projection))
+        )
+        request["ExpressionAttributeNames"] = {
+            f"#a{i}": name for i, name in enumerate(projection)
+        }
+    items: List[Dict[str, Any]] = []
+    pending = {table_name: request}
+    for attempt in range(_MAX_BATCH_RETRIES + 1):
+        response = client.batch_get_item(RequestItems=pending)
+        items.extend(response["Responses"].get(table_name, []))
+        pending = response.get("UnprocessedKeys") or {}
+        if not pending:
+            return [
+                {name: deserializer.deserialize(value) for name, value in item.items()}
+                for item in items
+            ]
+        if attempt < _MAX_BATCH_RETRIES:
+            _backoff(attempt)
+    raise RuntimeError(
+        f"DynamoDB left {len(pending[table_name]['Keys'])} keys of {table_name} "
+        f"unprocessed after {_MAX_BATCH_RETRIES} retries."
+    )
+
+
+def _batch_write(
+    client: Any, table_name: str, requests: List[Dict[str, Any]]
+) -> None:
+    """Write up to 25 requests, retrying the ones DynamoDB leaves unprocessed."""
+    pending = {table_name: requests}
+    for attempt in range(_MAX_BATCH_RETRIES + 1):
+        response = client.batch_write_item(RequestItems=pending)
+        pending = response.get("UnprocessedItems") or {}
+        if not pending:
+            return
+        if attempt < _MAX_BATCH_RETRIES:
+            _backoff(attempt)
+    raise RuntimeError(
+        f"DynamoDB left {len(pending[table_name])} writes to {table_name} "
+        f"unprocessed after {_MAX_BATCH_RETRIES} retries."
+    )
+
+
+def _chunks(values: List[Any], size: int) -> List[List[Any]]:
+    return [values[i : i + size] for i in range(0, len(values), size)]
+
 
 class DynamoDBChatMessageHistory(BaseChatMessageHistory):
     """Chat message history that stores history in AWS DynamoDB.
@@ -45,6 +160,39 @@ class DynamoDBChatMessageHistory(BaseChatMessageHistory):
             [AWS DynamoDB documentation](https://docs.aws.amazon.com/amazondynamodb/latest/developerguide/time-to-live-ttl-how-to.html)
         history_size: Maximum number of messages to store. If None then there is no
             limit. If not None then only the latest `history_size` messages are stored.
+        token_counter: Optional function that counts the tokens of a message, e.g.
+            one based on `langchain_aws.utils.estimate_num_tokens`. If set, the
+            count of each message is stored next to it in a `TokenCounts`
+            attribute, so a message is only counted once.
+        max_token_limit: Maximum number of tokens to store, counted with
+            `token_counter`. If not None then only the latest messages that fit
+            are stored.
+        summarizer: Optional function that folds older messages into a running
+            summary. It is called with the current summary ("" if there is none)
+            and the messages to fold, and returns the new summary. If set, the
+            history is compacted in the background once it crosses
+            `compact_threshold_tokens` or `compact_threshold_bytes`. The older
+            messages are moved to archive items and replaced by the summary, see
+            `get_context` and `get_archived_messages`.
+        compact_threshold_tokens: Number of stored tokens, counted with
+            `token_counter`, above which the history is compacted.
+        compact_threshold_bytes: Serialized size of the stored messages above
+            which the history is compacted. Defaults to 300 KB, below the 400 KB
+            item size limit of DynamoDB.
+        compact_keep_tokens: Number of tokens of the latest messages that
+            compaction keeps as they are. Defaults to half of
+            `compact_threshold_tokens`. Without a `token_counter` the latest
+            half of the messages is kept.
+
+    Every write of the history increments a `Version` attribute of the item and
+    is conditioned on the version it read, so writes from other processes and
+    compactions are not overwritten but retried on the latest history.
+
+    Histories of many sessions can be loaded, cleared and exported at once with
+    the class methods `load_many`, `clear_many` and `export_sessions` (and their
+    async variants), which use batch requests and a parallel scan. They use the
+    default key (`primary_key_name` set to the session id) and do not support
+    client-side encryption.
     """
 
     def __init__(
@@ -59,26 +207,35 @@ class DynamoDBChatMessageHistory(BaseChatMessageHistory):
         ttl: Optional[int] = None,
         ttl_key_name: str = "expireAt",
         history_size: Optional[int] = None,
+        token_counter: Optional[Callable[[BaseMessage], int]] = None,
+        max_token_limit: Optional[int] = None,
+        summarizer: Optional[Callable[[str, List[BaseMessage]], str]] = None,
+        compact_threshold_tokens: Optional[int] = None,
+        compact_threshold_bytes: int = 300_000,
+        compact_keep_tokens: Optional[int] = None,
     ):
-        if boto3_session:
-            client = boto3_session.resource("dynamodb", endpoint_url=endpoint_url)
-        else:
-            try:
-                import boto3
-            except ImportError as e:
-                raise ImportError(
-                    "Unable to import boto3, please install with `pip install boto3`."
-                ) from e
-            if endpoint_url:
-                client = boto3.resource("dynamodb", endpoint_url=endpoint_url)
-            else:
-                client = boto3.resource("dynamodb")
+        if max_token_limit is not None and token_counter is None:
+            raise ValueError("max_token_limit requires a token_counter.")
+        if compact_threshold_tokens is not None and token_counter is None:
+            raise ValueError("compact_threshold_tokens requires a token_counter.")
+        client = _dynamodb_resource(endpoint_url, boto3_session)
         self.table = client.Table(table_name)
         self.session_id = session_id
         self.key: Dict = key or {primary_key_name: session_id}
         self.ttl = ttl
         self.ttl_key_name = ttl_key_name
         self.history_size = history_size
+        self.primary_key_name = primary_key_name
+        self.token_counter = token_counter
+        self.max_token_limit = max_token_limit
+        self.summarizer = summarizer
+        self.compact_threshold_tokens = compact_threshold_tokens
+        self.compact_threshold_bytes = compact_threshold_bytes
+        if compact_keep_tokens is None and compact_threshold_tokens is not None:
+            compact_keep_tokens = compact_threshold_tokens // 2
+        self.compact_keep_tokens = compact_keep_tokens
+        # held while a compaction of this history is running
+        self._compaction_lock = threading.Lock()
 
         if kms_key_id:
             try:
@@ -106,9 +263,13 @@ class DynamoDBChatMessageHistory(BaseChatMessageHistory):
                 auto_refresh_table_indexes=False,
             )
 
-    @property
-    def messages(self) -> List[BaseMessage]:
-        """Retrieve the messages from DynamoDB"""
+    def _load(
+        self, key: Optional[Dict[str, Any]] = None
+    ) -> Tuple[Dict[str, Any], List[Dict[str, Any]], List[Optional[int]]]:
+        """Retrieve the item, its serialized messages and their token counts.
+
+        The token count of a message is None if it was stored without one.
+        """
         try:
             from botocore.exceptions import ClientError
         except ImportError as e:
@@ -118,7 +279,7 @@ class DynamoDBChatMessageHistory(BaseChatMessageHistory):
 
         response = None
         try:
-            response = self.table.get_item(Key=self.key)
+            response = self.table.get_item(Key=key or self.key)
         except ClientError as error:
             if error.response["Error"]["Code"] == "ResourceNotFoundException":
                 logger.warning("No record found with session id: %s", self.session_id)
@@ -126,13 +287,77 @@ class DynamoDBChatMessageHistory(BaseChatMessageHistory):
                 logger.error(error)
 
         if response and "Item" in response:
-            items = response["Item"]["History"]
+            item = response["Item"]
+            items = item["History"]
+            counts = item.get("TokenCounts") or []
         else:
+            item = {}
             items = []
+            counts = []
+        if len(counts) != len(items):
+            counts = [None] * len(items)
+        # DynamoDB returns numbers as Decimal
+        return item, items, [None if count is None else int(count) for count in counts]
+
+    @property
+    def messages(self) -> List[BaseMessage]:
+        """Retrieve the messages from DynamoDB.
 
+        Messages that were compacted into the summary are not included, see
+        `get_archived_messages`.
+        """
+        _, items, _ = self._load()
         messages = messages_from_dict(items)
         return messages
 
+    def get_context(
+        self, max_tokens: Optional[int] = None
+    ) -> Tuple[str, List[BaseMessage]]:
+        """Retrieve the summary of the compacted messages and the latest messages.
+
+        Args:
+            max_tokens: The maximum number of tokens of the returned messages,
+                counted with `token_counter`. Defaults to None, which returns all
+                messages that were not compacted.
+
+        Returns:
+            The summary ("" if there is none) and the messages after it.
+        """
+        item, items, counts = self._load()
+        start = 0
+        if max_tokens is not None:
+            start = self._window_start(items, counts, max_tokens)
+        return str(item.get("Summary") or ""), messages_from_dict(items[start:])
+
+    def get_archived_messages(self) -> List[BaseMessage]:
+        """Retrieve the messages that were compacted into the summary."""
+        item, _, _ = self._load()
+        messages: List[BaseMessage] = []
+        for index in range(int(item.get("ArchiveCount") or 0)):
+            _, items, _ = self._load(self._archive_key(index))
+            messages.extend(messages_from_dict(items))
+        return messages
+
+    def get_trimmed_messages(self, max_tokens: int) -> List[BaseMessage]:
+        """Retrieve the latest messages that fit in a token budget.
+
+        Stored token counts are used where there are any, so only messages
+        stored without a count are counted, and only the messages that are
+        returned are deserialized. The returned messages start with a human
+        message, as chat models expect.
+
+        Args:
+            max_tokens: The maximum number of tokens of the returned messages,
+                counted with `token_counter`.
+
+        Returns:
+            The latest messages whose token counts add up to at most
+            `max_tokens`.
+        """
+        _, items, counts = self._load()
+        start = self._window_start(items, counts, max_tokens)
+        return messages_from_dict(items[start:])
+
     @messages.setter
     def messages(self, messages: List[BaseMessage]) -> None:
         raise NotImplementedError(
@@ -142,6 +367,10 @@ class DynamoDBChatMessageHistory(BaseChatMessageHistory):
 
     def add_message(self, message: BaseMessage) -> None:
         """Append the message to the record in DynamoDB"""
+        self.add_messages([message])
+
+    def add_messages(self, messages: Sequence[BaseMessage]) -> None:
+        """Append the messages to the record in DynamoDB with a single write."""
         try:
             from botocore.exceptions import ClientError
         except ImportError as e:
@@ -149,25 +378,451 @@ class DynamoDBChatMessageHistory(BaseChatMessageHistory):
                 "Unable to import botocore, please install with `pip install botocore`."
             ) from e
 
-        messages = messages_to_dict(self.messages)
-        _message = message_to_dict(message)
-        messages.append(_message)
+        new_items = [message_to_dict(message) for message in messages]
+        new_counts = [
+            None if self.token_counter is None else self.token_counter(message)
+            for message in messages
+        ]
+        for attempt in range(_MAX_WRITE_RETRIES):
+            item, items, counts = self._load()
+            items.extend(new_items)
+            counts.extend(new_counts)
+
+            if self.history_size:
+                items = items[-self.history_size :]
+                counts = counts[-self.history_size :]
+            if self.max_token_limit is not None:
+                start = self._trim_start(items, counts, self.max_token_limit)
+                items = items[start:]
+                counts = counts[start:]
+
+            try:
+                self._put(
+                    self._new_item(item, items, counts),
+                    condition=self._version_condition(item),
+                )
+                break
+            except ClientError as err:
+                if (
+                    err.response["Error"]["Code"] != "ConditionalCheckFailedException"
+                    or attempt == _MAX_WRITE_RETRIES - 1
+                ):
+                    logger.error(err)
+                    return
+
+        if (
+            self.summarizer is not None
+            and self._needs_compaction(items, counts)
+            and self._compaction_lock.acquire(blocking=False)
+        ):
+            _compaction_executor.submit(self._compact_in_background)
+
+    def compact(self) -> bool:
+        """Fold the older messages into the summary now.
+
+        The folded messages are moved to a new archive item. Messages added
+        while the summarizer runs are kept.
+
+        Returns:
+            Whether any messages were folded.
+        """
+        if self.summarizer is None:
+            raise ValueError("compact requires a summarizer.")
+        try:
+            from boto3.dynamodb.conditions import Attr
+            from botocore.exceptions import ClientError
+        except ImportError as e:
+            raise ImportError(
+                "Unable to import boto3, please install with `pip install boto3`."
+            ) from e
+
+        item, items, counts = self._load()
+        split = self._compaction_split(items, counts)
+        if not split:
+            return False
+        folded = items[:split]
+        archive_index = int(item.get("ArchiveCount") or 0)
+        summary = self.summarizer(
+            str(item.get("Summary") or ""), messages_from_dict(folded)
+        )
+        archive: Dict[str, Any] = {
+            **self._new_item({}, folded, counts[:split]),
+            **self._archive_key(archive_index),
+        }
+        self._put(archive)
+
+        for _ in range(_MAX_WRITE_RETRIES):
+            new_item = self._new_item(item, items[split:], counts[split:])
+            new_item["Summary"] = summary
+            new_item["ArchiveCount"] = archive_index + 1
+            # only replace the messages that were read
+            condition = self._version_condition(item) & (
+                Attr("ArchiveCount").not_exists()
+                | Attr("ArchiveCount").eq(archive_index)
+            )
+            try:
+                self._put(new_item, condition=condition)
+                return True
+            except ClientError as err:
+                if err.response["Error"]["Code"] != "ConditionalCheckFailedException":
+                    raise
+            item, items, counts = self._load()
+            if (
+                items[:split] != folded
+                or int(item.get("ArchiveCount") or 0) != archive_index
+            ):
+                # cleared or compacted elsewhere, the archive is overwritten by
+                # the next compaction
+                return False
+        return False
+
+    def _trim_start(
+        self,
+        items: List[Dict[str, Any]],
+        counts: List[Optional[int]],
+        max_tokens: int,
+    ) -> int:
+        """Find the first of the latest messages that fit in `max_tokens`.
+
+        Missing counts are filled in, so they are stored with the next write.
+        """
+        total = 0
+        start = len(items)
+        while start > 0:
+            count = counts[start - 1]
+            if count is None:
+                count = counts[start - 1] = self._count(items[start - 1])
+            if total + count > max_tokens:
+                break
+            total += count
+            start -= 1
+        return start
+
+    def _window_start(
+        self,
+        items: List[Dict[str, Any]],
+        counts: List[Optional[int]],
+        max_tokens: int,
+    ) -> int:
+        """Find where the latest messages that fit in `max_tokens` start.
+
+        The window starts on a human message, as chat models expect.
+        """
+        if self.token_counter is None:
+            raise ValueError("A token budget requires a token_counter.")
+        start = self._trim_start(items, counts, max_tokens)
+        while start < len(items) and items[start]["type"] != "human":
+            start += 1
+        return start
 
-        if self.history_size:
-            messages = messages[-self.history_size :]
+    def _count(self, item: Dict[str, Any]) -> int:
+        assert self.token_counter is not None
+        return self.token_counter(messages_from_dict([item])[0])
+
+    def _new_item(
+        self,
+        old_item: Dict[str, Any],
+        items: List[Dict[str, Any]],
+        counts: List[Optional[int]],
+    ) -> Dict[str, Any]:
+        """Build the item that stores `items`, keeping the summary of `old_item`."""
+        item: Dict[str, Any] = {
+            **self.key,
+            "History": items,
+            "Version": int(old_item.get("Version") or 0) + 1,
+        }
+        for name in ("Summary", "ArchiveCount"):
+            if name in old_item:
+                item[name] = old_item[name]
+        if self.token_counter is not None:
+            # count the messages stored before there was a token_counter
+            item["TokenCounts"] = [
+                self._count(items[i]) if count is None else count
+                for i, count in enumerate(counts)
+            ]
+        return item
+
+    def _put(self, item: Dict[str, Any], condition: Any = None) -> None:
+        if self.ttl:
+            import time
+
+            item = {**item, self.ttl_key_name: int(time.time()) + self.ttl}
+        if condition is not None:
+            self.table.put_item(Item=item, ConditionExpression=condition)
+        else:
+            self.table.put_item(Item=item)
+
+    @staticmethod
+    def _version_condition(item: Dict[str, Any]) -> Any:
+        """The condition that the stored item is still the `item` that was read."""
+        from boto3.dynamodb.conditions import Attr
+
+        if "Version" in item:
+            return Attr("Version").eq(item["Version"])
+        # not stored yet, or stored before there were versions
+        return Attr("Version").not_exists()
+
+    def _archive_key(self, index: int) -> Dict[str, Any]:
+        """The key of the item of the `index`th batch of compacted messages."""
+        name = (
+            self.primary_key_name
+            if self.primary_key_name in self.key
+            else next(iter(self.key))
+        )
+        return {**self.key, name: f"{self.key[name]}{_ARCHIVE_MARKER}{index}"}
 
+    def _needs_compaction(
+        self, items: List[Dict[str, Any]], counts: List[Optional[int]]
+    ) -> bool:
+        if self.compact_threshold_tokens is not None and (
+            sum(count or 0 for count in counts) > self.compact_threshold_tokens
+        ):
+            return True
+        size = len(json.dumps(items, default=str))
+        return size > self.compact_threshold_bytes
+
+    def _compaction_split(
+        self, items: List[Dict[str, Any]], counts: List[Optional[int]]
+    ) -> int:
+        """The number of older messages to fold, 0 if there are none."""
+        if self.token_counter is not None and self.compact_keep_tokens is not None:
+            keep = self._trim_start(items, counts, self.compact_keep_tokens)
+        else:
+            keep = len(items) // 2
+        # keep whole turns, starting with a human message
+        while keep < len(items) and items[keep]["type"] != "human":
+            keep += 1
+        return keep if keep < len(items) else 0
+
+    def _compact_in_background(self) -> None:
         try:
-            if self.ttl:
-                import time
+            self.compact()
+        except Exception:
+            logger.warning(
+                "Error compacting the history of session %s",
+                self.session_id,
+                exc_info=True,
+            )
+        finally:
+            self._compaction_lock.release()
+
+    @classmethod
+    def load_many(
+        cls,
+        table_name: str,
+        session_ids: Sequence[str],
+        *,
+        endpoint_url: Optional[str] = None,
+        primary_key_name: str = "SessionId",
+        boto3_session: Optional[Session] = None,
+        max_concurrency: int = 8,
+    ) -> Dict[str, List[BaseMessage]]:
+        """Load the messages of many sessions with parallel BatchGetItem requests.
+
+        Like `messages`, this leaves out the messages compacted into a summary.
+
+        Args:
+            table_name: name of the DynamoDB table.
+            session_ids: the sessions to load.
+            endpoint_url: URL of the AWS endpoint to connect to.
+            primary_key_name: name of the primary key of the DynamoDB table.
+            boto3_session: optional boto3 session to connect with.
+            max_concurrency: the maximum number of requests in flight.
+
+        Returns:
+            The messages of each session that has a record.
+        """
+        client = _dynamodb_resource(endpoint_url, boto3_session).meta.client
+        keys = [
+            {primary_key_name: session_id} for session_id in dict.fromkeys(session_ids)
+        ]
+        with ThreadPoolExecutor(max_workers=max_concurrency) as executor:
+            batches = executor.map(
+                partial(_batch_get, client, table_name),
+                _chunks(keys, _BATCH_GET_SIZE),
+            )
+            return {
+                item[primary_key_name]: messages_from_dict(item.get("History") or [])
+                for batch in batches
+                for item in batch
+            }
+
+    @classmethod
+    async def aload_many(
+        cls, table_name: str, session_ids: Sequence[str], **kwargs: Any
+    ) -> Dict[str, List[BaseMessage]]:
+        """Async version of `load_many`."""
+        return await run_in_executor(
+            None, partial(cls.load_many, table_name, session_ids, **kwargs)
+        )
+
+    @classmethod
+    def clear_many(
+        cls,
+        table_name: str,
+        session_ids: Sequence[str],
+        *,
+        endpoint_url: Optional[str] = None,
+        primary_key_name: str = "SessionId",
+        boto3_session: Optional[Session] = None,
+        max_concurrency: int = 8,
+    ) -> None:
+        """Delete the records of many sessions, and their archives, in batches.
 
-                expireAt = int(time.time()) + self.ttl
-                self.table.put_item(
-                    Item={**self.key, "History": messages, self.ttl_key_name: expireAt}
+        Args:
+            table_name: name of the DynamoDB table.
+            session_ids: the sessions to clear.
+            endpoint_url: URL of the AWS endpoint to connect to.
+            primary_key_name: name of the primary key of the DynamoDB table.
+            boto3_session: optional boto3 session to connect with.
+            max_concurrency: the maximum number of requests in flight.
+        """
+        from boto3.dynamodb.types import TypeSerializer
+
+        client = _dynamodb_resource(endpoint_url, boto3_session).meta.client
+        keys = [
+            {primary_key_name: session_id} for session_id in dict.fromkeys(session_ids)
+        ]
+        serializer = TypeSerializer()
+        with ThreadPoolExecutor(max_workers=max_concurrency) as executor:
+            # find the archives made by compaction
+            batches = executor.map(
+                partial(
+                    _batch_get,
+                    client,
+                    table_name,
+                    projection=[primary_key_name, "ArchiveCount"],
+                ),
+                _chunks(keys, _BATCH_GET_SIZE),
+            )
+            session_keys = [key[primary_key_name] for key in keys]
+            for batch in batches:
+                for item in batch:
+                    session_id = item[primary_key_name]
+                    for index in range(int(item.get("ArchiveCount") or 0)):
+                        session_keys.append(f"{session_id}{_ARCHIVE_MARKER}{index}")
+            requests = [
+                {
+                    "DeleteRequest": {
+                        "Key": {primary_key_name: serializer.serialize(value)}
+                    }
+                }
+                for value in session_keys
+            ]
+            list(
+                executor.map(
+                    partial(_batch_write, client, table_name),
+                    _chunks(requests, _BATCH_WRITE_SIZE),
                 )
-            else:
-                self.table.put_item(Item={**self.key, "History": messages})
-        except ClientError as err:
-            logger.error(err)
+            )
+
+    @classmethod
+    async def aclear_many(
+        cls, table_name: str, session_ids: Sequence[str], **kwargs: Any
+    ) -> None:
+        """Async version of `clear_many`."""
+        await run_in_executor(
+            None, partial(cls.clear_many, table_name, session_ids, **kwargs)
+        )
+
+    @classmethod
+    def export_sessions(
+        cls,
+        table_name: str,
+        *,
+        total_segments: int = 4,
+        include_archives: bool = False,
+        endpoint_url: Optional[str] = None,
+        primary_key_name: str = "SessionId",
+        boto3_session: Optional[Session] = None,
+    ) -> Iterator[Tuple[str, List[BaseMessage]]]:
+        """Read every session of the table with a parallel Scan.
+
+        The segments of the scan are read by `total_segments` threads, so the
+        sessions are yielded in no particular order.
+
+        Args:
+            table_name: name of the DynamoDB table.
+            total_segments: the number of segments to scan in parallel.
+            include_archives: whether to also yield the archives made by
+                compaction, whose keys are `<session id>#archive#<n>`.
+            endpoint_url: URL of the AWS endpoint to connect to.
+            primary_key_name: name of the primary key of the DynamoDB table.
+            boto3_session: optional boto3 session to connect with.
+
+        Yields:
+            The session id and messages of each record.
+        """
+        from boto3.dynamodb.types import TypeDeserializer
+
+        client = _dynamodb_resource(endpoint_url, boto3_session).meta.client
+        deserializer = TypeDeserializer()
+        pages: queue.Queue = queue.Queue(maxsize=total_segments * 2)
+        stop = threading.Event()
+        done = object()
+
+        def put(value: Any) -> bool:
+            while not stop.is_set():
+                try:
+                    pages.put(value, timeout=0.1)
+                    return True
+                except queue.Full:
+                    continue
+            return False
+
+        def scan(segment: int) -> None:
+            try:
+                paginator = client.get_paginator("scan")
+                for page in paginator.paginate(
+                    TableName=table_name,
+                    Segment=segment,
+                    TotalSegments=total_segments,
+                ):
+                    if not put(page.get("Items", [])):
+                        return
+                put(done)
+            except BaseException as e:
+                put(e)
+
+        threads = [
+            threading.Thread(target=scan, args=(segment,), daemon=True)
+            for segment in range(total_segments)
+        ]
+        for thread in threads:
+            thread.start()
+        try:
+            remaining = total_segments
+            while remaining:
+                page = pages.get()
+                if page is done:
+                    remaining -= 1
+                    continue
+                if isinstance(page, BaseException):
+                    raise page
+                for raw in page:
+                    item = {
+                        name: deserializer.deserialize(value)
+                        for name, value in raw.items()
+                    }
+                    session_id = str(item.get(primary_key_name))
+                    if not include_archives and _ARCHIVE_MARKER in session_id:
+                        continue
+                    yield session_id, messages_from_dict(item.get("History") or [])
+        finally:
+            stop.set()
+
+    @classmethod
+    async def aexport_sessions(
+        cls, table_name: str, **kwargs: Any
+    ) -> AsyncIterator[Tuple[str, List[BaseMessage]]]:
+        """Async version of `export_sessions`."""
+        iterator = cls.export_sessions(table_name, **kwargs)
+        done = object()
+        while True:
+            session = await run_in_executor(None, next, iterator, done)
+            if session is done:
+                break
+            yield session  # type: ignore[misc]
 
     def clear(self) -> None:
         """Clear session memory from DynamoDB"""
@@ -179,6 +834,9 @@ class DynamoDBChatMessageHistory(BaseChatMessageHistory):
             ) from e
 
         try:
+            item, _, _ = self._load()
+            for index in range(int(item.get("ArchiveCount") or 0)):
+                self.table.delete_item(Key=self._archive_key(index))
             self.table.delete_item(Key=self.key)
         except ClientError as err:
             logger.error(err)
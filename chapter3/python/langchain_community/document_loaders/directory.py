@@ -1,8 +1,23 @@
-import concurrent
+import concurrent.futures
 import logging
 import random
+from collections import deque
+from itertools import islice
 from pathlib import Path
-from typing import Any, Callable, Iterator, List, Optional, Sequence, Type, Union
+from typing import (
+    Any,
+    Callable,
+    Deque,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+    Type,
+    Union,
+)
 
 from langchain_core.documents import Document
 
@@ -26,6 +41,31 @@ def _is_visible(p: Path) -> bool:
     return True
 
 
+def _load_file_in_process(
+    loader_cls: FILE_LOADER_TYPE,
+    loader_kwargs: dict,
+    item: str,
+    silent_errors: bool,
+) -> List[Tuple[str, Dict[str, Any]]]:
+    """Load a file in a worker process.
+
+    The documents are sent back as (page_content, metadata) pairs, which are
+    cheaper to pickle than the documents themselves.
+    """
+    try:
+        loader = loader_cls(item, **loader_kwargs)
+        try:
+            docs = loader.lazy_load()
+            return [(doc.page_content, doc.metadata) for doc in docs]
+        except NotImplementedError:
+            return [(doc.page_content, doc.metadata) for doc in loader.load()]
+    except Exception as e:
+        if silent_errors:
+            logger.warning(f"Error loading file {item}: {e}")
+            return []
+        raise
+
+
 class DirectoryLoader(BaseLoader):
     """Load from a directory."""
 
@@ -46,6 +86,9 @@ class DirectoryLoader(BaseLoader):
         sample_size: int = 0,
         randomize_sample: bool = False,
         sample_seed: Union[int, None] = None,
+        use_multiprocessing: bool = False,
+        max_in_flight: Optional[int] = None,
+        preserve_order: bool = False,
     ):
         """Initialize with a path to directory and how to glob over it.
 
@@ -62,12 +105,25 @@ class DirectoryLoader(BaseLoader):
             loader_kwargs: Keyword arguments to pass to loader_cls. Defaults to None.
             recursive: Whether to recursively search for files. Defaults to False.
             show_progress: Whether to show a progress bar. Defaults to False.
+                The files are found while they are loaded, so unless they are
+                sampled at random, the total of the bar grows as files are found.
             use_multithreading: Whether to use multithreading. Defaults to False.
-            max_concurrency: The maximum number of threads to use. Defaults to 4.
+            max_concurrency: The maximum number of threads or processes to use.
+                Defaults to 4.
             sample_size: The maximum number of files you would like to load from the
                 directory.
             randomize_sample: Shuffle the files to get a random sample.
             sample_seed: set the seed of the random shuffle for reproducibility.
+            use_multiprocessing: Whether to parse files in a pool of processes,
+                which scales CPU-bound loaders with the number of cores.
+                `loader_cls` and `loader_kwargs` must be picklable.
+                Defaults to False.
+            max_in_flight: The maximum number of files submitted to the pool at
+                once, which bounds the memory held by finished files that are
+                not consumed yet. Defaults to twice `max_concurrency`.
+            preserve_order: Whether to yield the documents of a pool in the
+                order the files were found, rather than in the order they
+                finish loading. Defaults to False.
 
         Examples:
 
@@ -92,6 +148,14 @@ class DirectoryLoader(BaseLoader):
                 loader = DirectoryLoader(
                     "/path/to/directory", exclude=["*.py", "*.pyc"]
                 )
+
+                # Parse PDFs on all cores, a few files at a time.
+                loader = DirectoryLoader(
+                    "/path/to/directory",
+                    glob="**/*.pdf",
+                    use_multiprocessing=True,
+                    max_concurrency=os.cpu_count(),
+                )
         """
         if loader_kwargs is None:
             loader_kwargs = {}
@@ -111,6 +175,9 @@ class DirectoryLoader(BaseLoader):
         self.sample_size = sample_size
         self.randomize_sample = randomize_sample
         self.sample_seed = sample_seed
+        self.use_multiprocessing = use_multiprocessing
+        self.max_in_flight = max_in_flight
+        self.preserve_order = preserve_order
 
     def load(self) -> List[Document]:
         """Load documents."""
@@ -124,28 +191,26 @@ class DirectoryLoader(BaseLoader):
         if not p.is_dir():
             raise ValueError(f"Expected directory, got file: '{self.path}'")
 
-        paths = p.rglob(self.glob) if self.recursive else p.glob(self.glob)
-        items = [
-            path
-            for path in paths
-            if not (self.exclude and any(path.match(glob) for glob in self.exclude))
-            and path.is_file()
-        ]
-
+        items: Iterable[Path] = self._iter_files(p)
+        total = None
         if self.sample_size > 0:
             if self.randomize_sample:
+                shuffled = list(items)
                 randomizer = random.Random(
                     self.sample_seed if self.sample_seed else None
                 )
-                randomizer.shuffle(items)
-            items = items[: min(len(items), self.sample_size)]
+                randomizer.shuffle(shuffled)
+                items = shuffled[: min(len(shuffled), self.sample_size)]
+                total = len(items)
+            else:
+                items = islice(items, self.sample_size)
 
         pbar = None
         if self.show_progress:
             try:
                 from tqdm import tqdm
 
-                pbar = tqdm(total=len(items))
+                pbar = tqdm(total=total)
             except ImportError as e:
                 logger.warning(
                     "To log the progress of DirectoryLoader you need to install tqdm, "
@@ -159,31 +224,108 @@ class DirectoryLoader(BaseLoader):
                         "you need to install tqdm, "
                         "`pip install tqdm`"
                     )
+        if pbar is not None and total is None:
+            items = self._counted(items, pbar)
 
-        if self.use_multithreading:
-            futures = []
-            with concurrent.futures.ThreadPoolExecutor(
+        if self.use_multiprocessing:
+            with concurrent.futures.ProcessPoolExecutor(
                 max_workers=self.max_concurrency
             ) as executor:
-                for i in items:
-                    futures.append(
-                        executor.submit(
-                            self._lazy_load_file_to_non_generator(self._lazy_load_file),
-                            i,
-                            p,
-                            pbar,
+                for _, pairs in self._run_pool(
+                    executor,
+                    _load_file_in_process,
+                    (
+                        (
+                            self.loader_cls,
+                            self.loader_kwargs,
+                            str(i),
+                            self.silent_errors,
                         )
-                    )
-                for future in concurrent.futures.as_completed(futures):
-                    for item in future.result():
-                        yield item
+                        for i in items
+                        if _is_visible(i.relative_to(p)) or self.load_hidden
+                    ),
+                ):
+                    if pbar is not None:
+                        pbar.update(1)
+                    for page_content, metadata in pairs:
+                        yield Document(page_content=page_content, metadata=metadata)
+        elif self.use_multithreading:
+            with concurrent.futures.ThreadPoolExecutor(
+                max_workers=self.max_concurrency
+            ) as executor:
+                for _, docs in self._run_pool(
+                    executor,
+                    self._lazy_load_file_to_non_generator(self._lazy_load_file),
+                    ((i, p, pbar) for i in items),
+                ):
+                    yield from docs
         else:
             for i in items:
                 yield from self._lazy_load_file(i, p, pbar)
 
-        if pbar:
+        if pbar is not None:
             pbar.close()
 
+    def _iter_files(self, path: Path) -> Iterator[Path]:
+        """Yield the files to load as they are found."""
+        paths = path.rglob(self.glob) if self.recursive else path.glob(self.glob)
+        for item in paths:
+            if self.exclude and any(item.match(glob) for glob in self.exclude):
+                continue
+            if item.is_file():
+                yield item
+
+    @staticmethod
+    def _counted(items: Iterable[Path], pbar: Any) -> Iterator[Path]:
+        """Add the files to the total of the progress bar as they are found."""
+        for item in items:
+            pbar.total = (pbar.total or 0) + 1
+            pbar.refresh()
+            yield item
+
+    def _run_pool(
+        self,
+        executor: concurrent.futures.Executor,
+        func: Callable[..., List],
+        args: Iterator[tuple],
+    ) -> Iterator[Tuple[tuple, List]]:
+        """Run func over args in the pool with a bounded number in flight.
+
+        Yields the arguments and result of each call, in the order the calls
+        finish, or in the order of args if `preserve_order` is set.
+        """
+        window = self.max_in_flight or 2 * self.max_concurrency
+        pending: Deque[Tuple[tuple, concurrent.futures.Future]] = deque()
+        try:
+            for arg in args:
+                pending.append((arg, executor.submit(func, *arg)))
+                while len(pending) >= window:
+                    yield from self._drain(pending)
+            while pending:
+                yield from self._drain(pending)
+        finally:
+            for _, future in pending:
+                future.cancel()
+
+    def _drain(
+        self,
+        pending: Deque[Tuple[tuple, concurrent.futures.Future]],
+    ) -> Iterator[Tuple[tuple, List]]:
+        """Yield the next finished calls, removing them from pending."""
+        if self.preserve_order:
+            arg, future = pending.popleft()
+            yield arg, future.result()
+            return
+        done, _ = concurrent.futures.wait(
+            [future for _, future in pending],
+            return_when=concurrent.futures.FIRST_COMPLETED,
+        )
+        finished = [entry for entry in pending if entry[1] in done]
+        for entry in finished:
+            pending.remove(entry)
+        for arg, future in finished:
+            yield arg, future.result()
+
     def _lazy_load_file_to_non_generator(self, func: Callable) -> Callable:
         def non_generator(item: Path, path: Path, pbar: Optional[Any]) -> List:
             return [x for x in func(item, path, pbar)]
@@ -219,5 +361,5 @@ class DirectoryLoader(BaseLoader):
                         logger.error(f"Error loading file {str(item)}")
                         raise e
                 finally:
-                    if pbar:
+                    if pbar is not None:
                         pbar.update(1)
@@ -1,6 +1,20 @@
 from __future__ import annotations
 
-from typing import TYPE_CHECKING, List, Optional, Union
+import json
+import os
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Deque,
+    Dict,
+    Iterator,
+    List,
+    Optional,
+    Tuple,
+    Union,
+)
 
 from langchain_core.documents import Document
 
@@ -12,7 +26,17 @@ if TYPE_CHECKING:
 
 
 class S3DirectoryLoader(BaseLoader):
-    """Load from `Amazon AWS S3` directory."""
+    """Load from `Amazon AWS S3` directory.
+
+    Objects are downloaded and parsed by a pool of `max_concurrency` threads
+    that share one S3 client, and their documents are yielded in listing order
+    as they become ready.
+
+    With a `state_path`, the ETag and LastModified of every loaded object are
+    recorded in a JSON file, and objects that have not changed since are
+    skipped the next time, so refreshing a large prefix only loads the new and
+    changed objects. Deleted objects are forgotten once a listing completes.
+    """
 
     def __init__(
         self,
@@ -28,6 +52,9 @@ class S3DirectoryLoader(BaseLoader):
         aws_secret_access_key: Optional[str] = None,
         aws_session_token: Optional[str] = None,
         boto_config: Optional[botocore.client.Config] = None,
+        max_concurrency: int = 8,
+        in_memory_max_bytes: int = 0,
+        state_path: Optional[Union[str, os.PathLike]] = None,
     ):
         """Initialize with bucket and key name.
 
@@ -83,6 +110,17 @@ class S3DirectoryLoader(BaseLoader):
             object is set on the session, the config object used when creating
             the client will be the result of calling ``merge()`` on the
             default config with the config provided to this call.
+
+        :param max_concurrency: The number of objects to download and parse at
+            the same time.
+
+        :param in_memory_max_bytes: Objects up to this size are parsed from
+            memory instead of being downloaded to a temporary file. Defaults to
+            0, which always downloads.
+
+        :param state_path: A JSON file to record the ETag and LastModified of
+            the loaded objects in. If given, objects that did not change since
+            they were recorded are skipped.
         """
         self.bucket = bucket
         self.prefix = prefix
@@ -95,9 +133,12 @@ class S3DirectoryLoader(BaseLoader):
         self.aws_secret_access_key = aws_secret_access_key
         self.aws_session_token = aws_session_token
         self.boto_config = boto_config
+        self.max_concurrency = max_concurrency
+        self.in_memory_max_bytes = in_memory_max_bytes
+        self.state_path = state_path
 
-    def load(self) -> List[Document]:
-        """Load documents."""
+    def lazy_load(self) -> Iterator[Document]:
+        """Load documents lazily, skipping unchanged objects if there is state."""
         try:
             import boto3
         except ImportError:
@@ -105,7 +146,8 @@ class S3DirectoryLoader(BaseLoader):
                 "Could not import boto3 python package. "
                 "Please install it with `pip install boto3`."
             )
-        s3 = boto3.resource(
+        # boto3 clients are thread-safe, so the pool shares one
+        client = boto3.client(
             "s3",
             region_name=self.region_name,
             api_version=self.api_version,
@@ -117,24 +159,75 @@ class S3DirectoryLoader(BaseLoader):
             aws_session_token=self.aws_session_token,
             config=self.boto_config,
         )
-        bucket = s3.Bucket(self.bucket)
-        docs = []
-        for obj in bucket.objects.filter(Prefix=self.prefix):
-            # Skip directories
-            if obj.size == 0 and obj.key.endswith("/"):
-                continue
-            loader = S3FileLoader(
-                self.bucket,
-                obj.key,
-                region_name=self.region_name,
-                api_version=self.api_version,
-                use_ssl=self.use_ssl,
-                verify=self.verify,
-                endpoint_url=self.endpoint_url,
-                aws_access_key_id=self.aws_access_key_id,
-                aws_secret_access_key=self.aws_secret_access_key,
-                aws_session_token=self.aws_session_token,
-                boto_config=self.boto_config,
-            )
-            docs.extend(loader.load())
-        return docs
+        state = self._read_state()
+        seen: Dict[str, Dict[str, str]] = {}
+        listed_all = False
+        pending: Deque[Tuple[str, Future]] = deque()
+        with ThreadPoolExecutor(max_workers=self.max_concurrency) as executor:
+            try:
+                for obj in self._list_objects(client):
+                    key = obj["Key"]
+                    # Skip directories
+                    if obj["Size"] == 0 and key.endswith("/"):
+                        continue
+                    version = {
+                        "etag": obj["ETag"],
+                        "last_modified": obj["LastModified"].isoformat(),
+                    }
+                    seen[key] = version
+                    if state.get(key) == version:
+                        continue
+                    future = executor.submit(self._load_object, client, key)
+                    pending.append((key, future))
+                    # bound the downloaded documents waiting to be yielded
+                    while len(pending) > 2 * self.max_concurrency:
+                        yield from self._finish(pending.popleft(), state, seen)
+                listed_all = True
+                while pending:
+                    yield from self._finish(pending.popleft(), state, seen)
+            finally:
+                for _, future in pending:
+                    future.cancel()
+                if listed_all:
+                    # forget the objects that were deleted
+                    state = {key: state[key] for key in state if key in seen}
+                self._write_state(state)
+
+    def _list_objects(self, client: Any) -> Iterator[Dict[str, Any]]:
+        paginator = client.get_paginator("list_objects_v2")
+        for page in paginator.paginate(Bucket=self.bucket, Prefix=self.prefix):
+            yield from page.get("Contents", [])
+
+    def _load_object(self, client: Any, key: str) -> List[Document]:
+        loader = S3FileLoader(
+            self.bucket,
+            key,
+            client=client,
+            in_memory_max_bytes=self.in_memory_max_bytes,
+        )
+        return loader.load()
+
+    def _finish(
+        self,
+        item: Tuple[str, Future],
+        state: Dict[str, Dict[str, str]],
+        seen: Dict[str, Dict[str, str]],
+    ) -> Iterator[Document]:
+        key, future = item
+        yield from future.result()
+        # recorded once the documents were consumed
+        state[key] = seen[key]
+
+    def _read_state(self) -> Dict[str, Dict[str, str]]:
+        if self.state_path is None or not os.path.exists(self.state_path):
+            return {}
+        with open(self.state_path, encoding="utf-8") as f:
+            return json.load(f)
+
+    def _write_state(self, state: Dict[str, Dict[str, str]]) -> None:
+        if self.state_path is None:
+            return
+        tmp_path = f"{os.fspath(self.state_path)}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(state, f)
+        os.replace(tmp_path, self.state_path)
@@ -1,6 +1,8 @@
 from __future__ import annotations
 
+import io
 import os
+import shutil
 import tempfile
 from typing import TYPE_CHECKING, Any, Callable, List, Optional, Union
 
@@ -29,6 +31,8 @@ class S3FileLoader(UnstructuredBaseLoader):
         boto_config: Optional[botocore.client.Config] = None,
         mode: str = "single",
         post_processors: Optional[List[Callable]] = None,
+        client: Optional[Any] = None,
+        in_memory_max_bytes: int = 0,
         **unstructured_kwargs: Any,
     ):
         """Initialize with bucket and key name.
@@ -89,6 +93,11 @@ class S3FileLoader(UnstructuredBaseLoader):
             paged and elements.
         :param post_processors: Post processing functions to be applied to
             extracted elements.
+        :param client: An existing boto3 S3 client to use, e.g. one shared by
+            many loaders. If given, the client parameters above are ignored.
+        :param in_memory_max_bytes: Objects up to this size are parsed from
+            memory instead of being downloaded to a temporary file. Defaults to
+            0, which always downloads.
         :param **unstructured_kwargs: Arbitrary additional kwargs to pass in when
             calling `partition`
         """
@@ -104,30 +113,49 @@ class S3FileLoader(UnstructuredBaseLoader):
         self.aws_secret_access_key = aws_secret_access_key
         self.aws_session_token = aws_session_token
         self.boto_config = boto_config
+        self.client = client
+        self.in_memory_max_bytes = in_memory_max_bytes
 
     def _get_elements(self) -> List:
         """Get elements."""
         from unstructured.partition.auto import partition
 
-        try:
-            import boto3
-        except ImportError:
-            raise ImportError(
-                "Could not import `boto3` python package. "
-                "Please install it with `pip install boto3`."
+        if self.client is not None:
+            s3 = self.client
+        else:
+            try:
+                import boto3
+            except ImportError:
+                raise ImportError(
+                    "Could not import `boto3` python package. "
+                    "Please install it with `pip install boto3`."
+                )
+            s3 = boto3.client(
+                "s3",
+                region_name=self.region_name,
+                api_version=self.api_version,
+                use_ssl=self.use_ssl,
+                verify=self.verify,
+                endpoint_url=self.endpoint_url,
+                aws_access_key_id=self.aws_access_key_id,
+                aws_secret_access_key=self.aws_secret_access_key,
+                aws_session_token=self.aws_session_token,
+                config=self.boto_config,
             )
-        s3 = boto3.client(
-            "s3",
-            region_name=self.region_name,
-            api_version=self.api_version,
-            use_ssl=self.use_ssl,
-            verify=self.verify,
-            endpoint_url=self.endpoint_url,
-            aws_access_key_id=self.aws_access_key_id,
-            aws_secret_access_key=self.aws_secret_access_key,
-            aws_session_token=self.aws_session_token,
-            config=self.boto_config,
-        )
+        if self.in_memory_max_bytes:
+            response = s3.get_object(Bucket=self.bucket, Key=self.key)
+            if response["ContentLength"] <= self.in_memory_max_bytes:
+                return partition(
+                    file=io.BytesIO(response["Body"].read()),
+                    metadata_filename=self.key,
+                    **self.unstructured_kwargs,
+                )
+            with tempfile.TemporaryDirectory() as temp_dir:
+                file_path = f"{temp_dir}/{self.key}"
+                os.makedirs(os.path.dirname(file_path), exist_ok=True)
+                with open(file_path, "wb") as f:
+                    shutil.copyfileobj(response["Body"], f)
+                return partition(filename=file_path, **self.unstructured_kwargs)
         with tempfile.TemporaryDirectory() as temp_dir:
             file_path = f"{temp_dir}/{self.key}"
             os.makedirs(os.path.dirname(file_path), exist_ok=True)
@@ -12,15 +12,22 @@ allow it to work with a variety of SQL as a backend.
 * This filed is updated whenever the key is updated.
 * Keys can be listed based on the updated at field.
 * Keys can be deleted.
+
+Records are written with executemany over one cached upsert statement, and
+keys are looked up in chunks that stay under the dialect's limit on bound
+parameters, so the size of a batch is not limited by the database.
 """
 import contextlib
 import decimal
+import sqlite3
 import uuid
 from typing import (
     Any,
     AsyncGenerator,
+    AsyncIterator,
     Dict,
     Generator,
+    Iterator,
     List,
     Optional,
     Sequence,
@@ -36,9 +43,10 @@ from sqlalchemy import (
     Index,
     String,
     UniqueConstraint,
-    and_,
+    bindparam,
     create_engine,
     delete,
+    event,
     select,
     text,
 )
@@ -50,6 +58,7 @@ from sqlalchemy.ext.asyncio import (
 )
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import Session, sessionmaker
+from sqlalchemy.sql import Executable, Select
 
 from langchain_community.indexes.base import RecordManager
 
@@ -88,6 +97,59 @@ class UpsertionRecord(Base):  # type: ignore[valid-type,misc]
     )
 
 
+_TABLE = UpsertionRecord.__table__
+
+SQLITE_PRAGMAS: Dict[str, Any] = {
+    # readers do not block the writer and commits do not rewrite the database
+    "journal_mode": "WAL",
+    # with WAL, a crash can lose the last commits but not corrupt the database
+    "synchronous": "NORMAL",
+    "temp_store": "MEMORY",
+    # in KiB when negative
+    "cache_size": -64000,
+    "busy_timeout": 5000,
+}
+"""The pragmas set on the connections of SQLite engines created from a db_url."""
+
+UPSERT_BATCH_SIZE = 5000
+"""The number of records written by each executemany of `update`."""
+
+TEMP_TABLE_MIN_KEYS = 20000
+"""The number of keys from which `exists` joins against a temporary table."""
+
+STREAM_BATCH_SIZE = 10000
+"""The number of keys fetched at a time by `yield_keys`."""
+
+_TEMP_TABLE = "upsertion_record_lookup"
+
+
+def _max_bind_params(dialect: str) -> int:
+    """The number of parameters a statement of the dialect can bind."""
+    if dialect == "sqlite":
+        # SQLITE_MAX_VARIABLE_NUMBER was raised from 999 in 3.32.0
+        return 32766 if sqlite3.sqlite_version_info >= (3, 32, 0) else 999
+    # the wire protocol of PostgreSQL counts parameters with an int16
+    return 32767
+
+
+def _chunks(items: Sequence[str], size: int) -> Iterator[Sequence[str]]:
+    for start in range(0, len(items), size):
+        yield items[start : start + size]
+
+
+def _set_sqlite_pragmas(engine: Engine, pragmas: Dict[str, Any]) -> None:
+    """Set the pragmas on every new connection of the engine."""
+
+    @event.listens_for(engine, "connect")
+    def _on_connect(dbapi_connection: Any, connection_record: Any) -> None:
+        cursor = dbapi_connection.cursor()
+        try:
+            for name, value in pragmas.items():
+                cursor.execute(f"PRAGMA {name}={value}")
+        finally:
+            cursor.close()
+
+
 class SQLRecordManager(RecordManager):
     """A SQL Alchemy based implementation of the record manager."""
 
@@ -99,6 +161,7 @@ class SQLRecordManager(RecordManager):
         db_url: Union[None, str, URL] = None,
         engine_kwargs: Optional[Dict[str, Any]] = None,
         async_mode: bool = False,
+        sqlite_pragmas: Optional[Dict[str, Any]] = None,
     ) -> None:
         """Initialize the SQLRecordManager.
 
@@ -118,6 +181,10 @@ class SQLRecordManager(RecordManager):
                 Driver should support async operations.
                 It only applies if db_url is provided.
                 Default is False.
+            sqlite_pragmas: The pragmas to set on each connection when a
+                SQLite engine is created from db_url. Default is
+                `SQLITE_PRAGMAS`, which turns on write-ahead logging. Pass an
+                empty dictionary to keep SQLite's defaults.
 
         Raises:
             ValueError: If both db_url and engine are provided or neither.
@@ -136,6 +203,15 @@ class SQLRecordManager(RecordManager):
                 _engine = create_async_engine(db_url, **(engine_kwargs or {}))
             else:
                 _engine = create_engine(db_url, **(engine_kwargs or {}))
+            if _engine.dialect.name == "sqlite":
+                pragmas = SQLITE_PRAGMAS if sqlite_pragmas is None else sqlite_pragmas
+                if pragmas:
+                    _set_sqlite_pragmas(
+                        _engine.sync_engine
+                        if isinstance(_engine, AsyncEngine)
+                        else _engine,
+                        pragmas,
+                    )
         elif engine:
             _engine = engine
 
@@ -151,6 +227,8 @@ class SQLRecordManager(RecordManager):
         self.engine = _engine
         self.dialect = _engine.dialect.name
         self.session_factory = _session_factory
+        self._upsert_stmt: Optional[Executable] = None
+        self._keys_per_query = _max_bind_params(self.dialect) - 1
 
     def create_schema(self) -> None:
         """Create the database schema."""
@@ -252,6 +330,63 @@ class SQLRecordManager(RecordManager):
                 raise AssertionError(f"Unexpected type for datetime: {type(dt)}")
             return dt
 
+    def _upsert_statement(self) -> Executable:
+        """The statement upserting one record, built once per record manager.
+
+        Executing the same statement object with many records lets SQLAlchemy
+        reuse its compiled form and the driver batch the rows.
+        """
+        if self._upsert_stmt is not None:
+            return self._upsert_stmt
+        if self.dialect == "sqlite":
+            from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+
+            # Note: uses SQLite insert to make on_conflict_do_update work.
+            insert_stmt = sqlite_insert(_TABLE)
+            stmt = insert_stmt.on_conflict_do_update(
+                [_TABLE.c.key, _TABLE.c.namespace],
+                set_=dict(
+                    updated_at=insert_stmt.excluded.updated_at,
+                    group_id=insert_stmt.excluded.group_id,
+                ),
+            )
+        elif self.dialect == "postgresql":
+            from sqlalchemy.dialects.postgresql import insert as pg_insert
+
+            insert_stmt = pg_insert(_TABLE)  # type: ignore[assignment]
+            stmt = insert_stmt.on_conflict_do_update(  # type: ignore[attr-defined]
+                "uix_key_namespace",  # Name of constraint
+                set_=dict(
+                    updated_at=insert_stmt.excluded.updated_at,
+                    group_id=insert_stmt.excluded.group_id,
+                ),
+            )
+        else:
+            raise NotImplementedError(f"Unsupported dialect {self.dialect}")
+        self._upsert_stmt = stmt
+        return stmt
+
+    def _record_batches(
+        self,
+        keys: Sequence[str],
+        group_ids: Sequence[Optional[str]],
+        update_time: float,
+    ) -> Iterator[List[Dict[str, Any]]]:
+        """The records to upsert, in batches of `UPSERT_BATCH_SIZE`."""
+        for start in range(0, len(keys), UPSERT_BATCH_SIZE):
+            yield [
+                {
+                    "key": key,
+                    "namespace": self.namespace,
+                    "updated_at": update_time,
+                    "group_id": group_id,
+                }
+                for key, group_id in zip(
+                    keys[start : start + UPSERT_BATCH_SIZE],
+                    group_ids[start : start + UPSERT_BATCH_SIZE],
+                )
+            ]
+
     def update(
         self,
         keys: Sequence[str],
@@ -282,49 +417,9 @@ class SQLRecordManager(RecordManager):
             # Safeguard against time sync issues
             raise AssertionError(f"Time sync issue: {update_time} < {time_at_least}")
 
-        records_to_upsert = [
-            {
-                "key": key,
-                "namespace": self.namespace,
-                "updated_at": update_time,
-                "group_id": group_id,
-            }
-            for key, group_id in zip(keys, group_ids)
-        ]
-
         with self._make_session() as session:
-            if self.dialect == "sqlite":
-                from sqlalchemy.dialects.sqlite import insert as sqlite_insert
-
-                # Note: uses SQLite insert to make on_conflict_do_update work.
-                # This code needs to be generalized a bit to work with more dialects.
-                insert_stmt = sqlite_insert(UpsertionRecord).values(records_to_upsert)
-                stmt = insert_stmt.on_conflict_do_update(  # type: ignore[attr-defined]
-                    [UpsertionRecord.key, UpsertionRecord.namespace],
-                    set_=dict(
-                        # attr-defined type ignore
-                        updated_at=insert_stmt.excluded.updated_at,  # type: ignore
-                        group_id=insert_stmt.excluded.group_id,  # type: ignore
-                    ),
-                )
-            elif self.dialect == "postgresql":
-                from sqlalchemy.dialects.postgresql import insert as pg_insert
-
-                # Note: uses SQLite insert to make on_conflict_do_update work.
-                # This code needs to be generalized a bit to work with more dialects.
-                insert_stmt = pg_insert(UpsertionRecord).values(records_to_upsert)  # type: ignore[assignment]
-                stmt = insert_stmt.on_conflict_do_update(  # type: ignore[attr-defined]
-                    "uix_key_namespace",  # Name of constraint
-                    set_=dict(
-                        # attr-defined type ignore
-                        updated_at=insert_stmt.excluded.updated_at,  # type: ignore
-                        group_id=insert_stmt.excluded.group_id,  # type: ignore
-                    ),
-                )
-            else:
-                raise NotImplementedError(f"Unsupported dialect {self.dialect}")
-
-            session.execute(stmt)
+            for batch in self._record_batches(keys, group_ids, update_time):
+                session.execute(self._upsert_statement(), batch)
             session.commit()
 
     async def aupdate(
@@ -357,88 +452,107 @@ class SQLRecordManager(RecordManager):
             # Safeguard against time sync issues
             raise AssertionError(f"Time sync issue: {update_time} < {time_at_least}")
 
-        records_to_upsert = [
-            {
-                "key": key,
-                "namespace": self.namespace,
-                "updated_at": update_time,
-                "group_id": group_id,
-            }
-            for key, group_id in zip(keys, group_ids)
-        ]
-
         async with self._amake_session() as session:
-            if self.dialect == "sqlite":
-                from sqlalchemy.dialects.sqlite import insert as sqlite_insert
-
-                # Note: uses SQLite insert to make on_conflict_do_update work.
-                # This code needs to be generalized a bit to work with more dialects.
-                insert_stmt = sqlite_insert(UpsertionRecord).values(records_to_upsert)
-                stmt = insert_stmt.on_conflict_do_update(  # type: ignore[attr-defined]
-                    [UpsertionRecord.key, UpsertionRecord.namespace],
-                    set_=dict(
-                        # attr-defined type ignore
-                        updated_at=insert_stmt.excluded.updated_at,  # type: ignore
-                        group_id=insert_stmt.excluded.group_id,  # type: ignore
-                    ),
-                )
-            elif self.dialect == "postgresql":
-                from sqlalchemy.dialects.postgresql import insert as pg_insert
-
-                # Note: uses SQLite insert to make on_conflict_do_update work.
-                # This code needs to be generalized a bit to work with more dialects.
-                insert_stmt = pg_insert(UpsertionRecord).values(records_to_upsert)  # type: ignore[assignment]
-                stmt = insert_stmt.on_conflict_do_update(  # type: ignore[attr-defined]
-                    "uix_key_namespace",  # Name of constraint
-                    set_=dict(
-                        # attr-defined type ignore
-                        updated_at=insert_stmt.excluded.updated_at,  # type: ignore
-                        group_id=insert_stmt.excluded.group_id,  # type: ignore
-                    ),
-                )
-            else:
-                raise NotImplementedError(f"Unsupported dialect {self.dialect}")
-
-            await session.execute(stmt)
+            for batch in self._record_batches(keys, group_ids, update_time):
+                await session.execute(self._upsert_statement(), batch)
             await session.commit()
 
+    def _exists_statement(self) -> Select:
+        return select(_TABLE.c.key).where(
+            _TABLE.c.namespace == bindparam("namespace"),
+            _TABLE.c.key.in_(bindparam("keys", expanding=True)),
+        )
+
+    def _lookup_statements(self) -> List[Any]:
+        """The statements of an existence check through a temporary table.
+
+        The table belongs to the connection and may outlive the session, since
+        some drivers run DDL outside of the transaction, so it is emptied before
+        use. The inserted keys are rolled back when the session closes.
+        """
+        return [
+            text(
+                f"CREATE TEMPORARY TABLE IF NOT EXISTS {_TEMP_TABLE} "
+                "(key VARCHAR PRIMARY KEY)"
+            ),
+            text(f"DELETE FROM {_TEMP_TABLE}"),
+            text(f"INSERT INTO {_TEMP_TABLE} (key) VALUES (:key)"),
+            text(
+                f"SELECT t.key FROM {_TEMP_TABLE} t JOIN {_TABLE.name} r "
+                "ON r.key = t.key AND r.namespace = :namespace"
+            ),
+        ]
+
     def exists(self, keys: Sequence[str]) -> List[bool]:
         """Check if the given keys exist in the SQLite database."""
+        unique_keys = list(dict.fromkeys(keys))
+        found_keys = set()
         with self._make_session() as session:
-            records = (
-                # mypy does not recognize .all()
-                session.query(UpsertionRecord.key)  # type: ignore[attr-defined]
-                .filter(
-                    and_(
-                        UpsertionRecord.key.in_(keys),
-                        UpsertionRecord.namespace == self.namespace,
-                    )
+            if len(unique_keys) >= TEMP_TABLE_MIN_KEYS:
+                create, clear, insert, join = self._lookup_statements()
+                session.execute(create)
+                session.execute(clear)
+                for batch in _chunks(unique_keys, UPSERT_BATCH_SIZE):
+                    session.execute(insert, [{"key": key} for key in batch])
+                found_keys.update(
+                    session.execute(join, {"namespace": self.namespace}).scalars()
                 )
-                .all()
-            )
-        found_keys = set(r.key for r in records)
+            else:
+                stmt = self._exists_statement()
+                for batch in _chunks(unique_keys, self._keys_per_query):
+                    found_keys.update(
+                        session.execute(
+                            stmt, {"namespace": self.namespace, "keys": batch}
+                        ).scalars()
+                    )
         return [k in found_keys for k in keys]
 
     async def aexists(self, keys: Sequence[str]) -> List[bool]:
         """Check if the given keys exist in the SQLite database."""
+        unique_keys = list(dict.fromkeys(keys))
+        found_keys = set()
         async with self._amake_session() as session:
-            records = (
-                (
-                    await session.execute(
-                        select(UpsertionRecord.key).where(
-                            and_(
-                                UpsertionRecord.key.in_(keys),
-                                UpsertionRecord.namespace == self.namespace,
+            if len(unique_keys) >= TEMP_TABLE_MIN_KEYS:
+                create, clear, insert, join = self._lookup_statements()
+                await session.execute(create)
+                await session.execute(clear)
+                for batch in _chunks(unique_keys, UPSERT_BATCH_SIZE):
+                    await session.execute(insert, [{"key": key} for key in batch])
+                found_keys.update(
+                    (
+                        await session.execute(join, {"namespace": self.namespace})
+                    ).scalars()
+                )
+            else:
+                stmt = self._exists_statement()
+                for batch in _chunks(unique_keys, self._keys_per_query):
+                    found_keys.update(
+                        (
+                            await session.execute(
+                                stmt, {"namespace": self.namespace, "keys": batch}
                             )
-                        )
+                        ).scalars()
                     )
-                )
-                .scalars()
-                .all()
-            )
-        found_keys = set(records)
         return [k in found_keys for k in keys]
 
+    def _list_keys_query(
+        self,
+        before: Optional[float],
+        after: Optional[float],
+        group_ids: Optional[Sequence[str]],
+        limit: Optional[int],
+    ) -> Select:
+        query = select(_TABLE.c.key).where(_TABLE.c.namespace == self.namespace)
+        if after:
+            query = query.where(_TABLE.c.updated_at > after)
+        if before:
+            query = query.where(_TABLE.c.updated_at < before)
+        if group_ids:
+            query = query.where(_TABLE.c.group_id.in_(group_ids))
+        if limit:
+            query = query.limit(limit)
+        return query
+
     def list_keys(
         self,
         *,
@@ -448,29 +562,9 @@ class SQLRecordManager(RecordManager):
         limit: Optional[int] = None,
     ) -> List[str]:
         """List records in the SQLite database based on the provided date range."""
+        query = self._list_keys_query(before, after, group_ids, limit)
         with self._make_session() as session:
-            query = session.query(UpsertionRecord).filter(
-                UpsertionRecord.namespace == self.namespace
-            )
-
-            # mypy does not recognize .all() or .filter()
-            if after:
-                query = query.filter(  # type: ignore[attr-defined]
-                    UpsertionRecord.updated_at > after
-                )
-            if before:
-                query = query.filter(  # type: ignore[attr-defined]
-                    UpsertionRecord.updated_at < before
-                )
-            if group_ids:
-                query = query.filter(  # type: ignore[attr-defined]
-                    UpsertionRecord.group_id.in_(group_ids)
-                )
-
-            if limit:
-                query = query.limit(limit)  # type: ignore[attr-defined]
-            records = query.all()  # type: ignore[attr-defined]
-        return [r.key for r in records]  # type: ignore[misc]
+            return list(session.execute(query).scalars())
 
     async def alist_keys(
         self,
@@ -481,52 +575,70 @@ class SQLRecordManager(RecordManager):
         limit: Optional[int] = None,
     ) -> List[str]:
         """List records in the SQLite database based on the provided date range."""
+        query = self._list_keys_query(before, after, group_ids, limit)
         async with self._amake_session() as session:
-            query = select(UpsertionRecord.key).filter(
-                UpsertionRecord.namespace == self.namespace
+            return list((await session.execute(query)).scalars())
+
+    def yield_keys(
+        self,
+        *,
+        before: Optional[float] = None,
+        after: Optional[float] = None,
+        group_ids: Optional[Sequence[str]] = None,
+        limit: Optional[int] = None,
+    ) -> Iterator[str]:
+        """Stream the keys `list_keys` would return.
+
+        The keys are fetched `STREAM_BATCH_SIZE` at a time through a server-side
+        cursor where the driver supports one, so listing every key of a large
+        namespace does not hold them all in memory.
+        """
+        query = self._list_keys_query(before, after, group_ids, limit)
+        with self._make_session() as session:
+            result = session.execute(
+                query.execution_options(yield_per=STREAM_BATCH_SIZE)
             )
+            for keys in result.scalars().partitions():
+                yield from keys
 
-            # mypy does not recognize .all() or .filter()
-            if after:
-                query = query.filter(  # type: ignore[attr-defined]
-                    UpsertionRecord.updated_at > after
-                )
-            if before:
-                query = query.filter(  # type: ignore[attr-defined]
-                    UpsertionRecord.updated_at < before
-                )
-            if group_ids:
-                query = query.filter(  # type: ignore[attr-defined]
-                    UpsertionRecord.group_id.in_(group_ids)
-                )
+    async def ayield_keys(
+        self,
+        *,
+        before: Optional[float] = None,
+        after: Optional[float] = None,
+        group_ids: Optional[Sequence[str]] = None,
+        limit: Optional[int] = None,
+    ) -> AsyncIterator[str]:
+        """Stream the keys `alist_keys` would return."""
+        query = self._list_keys_query(before, after, group_ids, limit)
+        async with self._amake_session() as session:
+            result = await session.stream(
+                query.execution_options(yield_per=STREAM_BATCH_SIZE)
+            )
+            async for keys in result.scalars().partitions():
+                for key in keys:
+                    yield key
 
-            if limit:
-                query = query.limit(limit)  # type: ignore[attr-defined]
-            records = (await session.execute(query)).scalars().all()
-        return list(records)
+    def _delete_statement(self) -> Executable:
+        return delete(_TABLE).where(
+            _TABLE.c.namespace == bindparam("namespace"),
+            _TABLE.c.key.in_(bindparam("keys", expanding=True)),
+        )
 
     def delete_keys(self, keys: Sequence[str]) -> None:
         """Delete records from the SQLite database."""
+        stmt = self._delete_statement()
         with self._make_session() as session:
-            # mypy does not recognize .delete()
-            session.query(UpsertionRecord).filter(
-                and_(
-                    UpsertionRecord.key.in_(keys),
-                    UpsertionRecord.namespace == self.namespace,
-                )
-            ).delete()  # type: ignore[attr-defined]
+            for batch in _chunks(keys, self._keys_per_query):
+                session.execute(stmt, {"namespace": self.namespace, "keys": batch})
             session.commit()
 
     async def adelete_keys(self, keys: Sequence[str]) -> None:
         """Delete records from the SQLite database."""
+        stmt = self._delete_statement()
         async with self._amake_session() as session:
-            await session.execute(
-                delete(UpsertionRecord).where(
-                    and_(
-                        UpsertionRecord.key.in_(keys),
-                        UpsertionRecord.namespace == self.namespace,
-                    )
+            for batch in _chunks(keys, self._keys_per_query):
+                await session.execute(
+                    stmt, {"namespace": self.namespace, "keys": batch}
                 )
-            )
-
             await session.commit()
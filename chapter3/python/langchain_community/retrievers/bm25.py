@@ -1,28 +1,253 @@
 from __future__ import annotations
 
-from typing import Any, Callable, Dict, Iterable, List, Optional
+import json
+import re
+import unicodedata
+import uuid
+from collections import Counter
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Tuple
 
+import numpy as np
 from langchain_core.callbacks import CallbackManagerForRetrieverRun
 from langchain_core.documents import Document
 from langchain_core.pydantic_v1 import Field
 from langchain_core.retrievers import BaseRetriever
 
+# Hiragana, Katakana, CJK ideographs, halfwidth Katakana and Hangul, which are
+# written without spaces between words.
+_CJK = (
+    "\u3040-\u30ff\u3400-\u4dbf\u4e00-\u9fff\uf900-\ufaff\uff66-\uff9f\uac00-\ud7af"
+)
+_TOKEN_PATTERN = re.compile(f"([{_CJK}]+)|[^\\W{_CJK}]+")
+
 
 def default_preprocessing_func(text: str) -> List[str]:
     return text.split()
 
 
+def ngram_preprocessing_func(text: str, n: int = 2) -> List[str]:
+    """Split text into lowercase words, and runs of CJK characters into n-grams.
+
+    Japanese, Chinese and Korean text has no spaces between words, so runs of
+    those characters are split into overlapping character n-grams (bigrams by
+    default), while other text is split into words. The text is NFKC normalized
+    first, so fullwidth and halfwidth forms match.
+
+    Args:
+        text: The text to split.
+        n: The length of the character n-grams.
+
+    Returns:
+        The tokens.
+    """
+    tokens: List[str] = []
+    for match in _TOKEN_PATTERN.finditer(unicodedata.normalize("NFKC", text)):
+        token = match.group(0)
+        if match.group(1) is None:
+            tokens.append(token.lower())
+        elif len(token) <= n:
+            tokens.append(token)
+        else:
+            tokens.extend(token[i : i + n] for i in range(len(token) - n + 1))
+    return tokens
+
+
+class BM25Index:
+    """An inverted index that scores documents with Okapi BM25 in NumPy.
+
+    The postings of all terms are kept in CSR form, with the BM25 weight of
+    each posting precomputed from the IDF of the term and the length of the
+    document. Scoring a query only touches the postings of its terms, and the
+    top documents are found with a partial sort.
+
+    Documents are added and deleted by their position. The postings are
+    rebuilt on the first query after a change, so changes should be batched.
+    """
+
+    def __init__(self, k1: float = 1.5, b: float = 0.75) -> None:
+        """Create an empty index.
+
+        Args:
+            k1: Term frequency saturation. Defaults to 1.5.
+            b: Document length normalization. Defaults to 0.75.
+        """
+        self.k1 = k1
+        self.b = b
+        self.vocabulary: Dict[str, int] = {}
+        # term ids and frequencies of each document
+        self._doc_terms: List[np.ndarray] = []
+        self._doc_freqs: List[np.ndarray] = []
+        self._alive: List[bool] = []
+        self._num_alive = 0
+        self._indptr = np.zeros(1, dtype=np.int64)
+        self._postings = np.zeros(0, dtype=np.int32)
+        self._weights = np.zeros(0, dtype=np.float32)
+        self._dirty = False
+
+    def __len__(self) -> int:
+        return self._num_alive
+
+    @property
+    def num_slots(self) -> int:
+        """The number of positions, including the deleted documents."""
+        return len(self._alive)
+
+    def add(self, tokenized: Iterable[Sequence[str]]) -> List[int]:
+        """Add tokenized documents, returning their positions."""
+        positions = []
+        for tokens in tokenized:
+            counts = Counter(tokens)
+            terms = np.fromiter(
+                (self.vocabulary.setdefault(t, len(self.vocabulary)) for t in counts),
+                dtype=np.int32,
+                count=len(counts),
+            )
+            positions.append(len(self._alive))
+            self._doc_terms.append(terms)
+            self._doc_freqs.append(
+                np.fromiter(counts.values(), dtype=np.float32, count=len(counts))
+            )
+            self._alive.append(True)
+            self._num_alive += 1
+        self._dirty = True
+        return positions
+
+    def delete(self, positions: Iterable[int]) -> None:
+        """Delete the documents at the positions."""
+        for position in positions:
+            if self._alive[position]:
+                self._alive[position] = False
+                self._doc_terms[position] = self._doc_terms[position][:0]
+                self._doc_freqs[position] = self._doc_freqs[position][:0]
+                self._num_alive -= 1
+                self._dirty = True
+
+    def compact(self) -> List[int]:
+        """Drop the deleted documents, returning the old positions of the rest."""
+        kept = [i for i, alive in enumerate(self._alive) if alive]
+        self._doc_terms = [self._doc_terms[i] for i in kept]
+        self._doc_freqs = [self._doc_freqs[i] for i in kept]
+        self._alive = [True] * len(kept)
+        self._dirty = True
+        return kept
+
+    def top_k(self, tokens: Sequence[str], k: int) -> List[Tuple[int, float]]:
+        """Return the positions and scores of the k best matching documents.
+
+        Documents that match none of the tokens are not returned.
+        """
+        if k <= 0:
+            return []
+        self._compile()
+        scores = np.zeros(self.num_slots, dtype=np.float32)
+        for token, count in Counter(tokens).items():
+            term = self.vocabulary.get(token)
+            if term is None:
+                continue
+            start, end = self._indptr[term], self._indptr[term + 1]
+            # a term occurs once per document, so the indices are unique
+            scores[self._postings[start:end]] += count * self._weights[start:end]
+        matched = np.flatnonzero(scores > 0)
+        if len(matched) > k:
+            matched = matched[np.argpartition(-scores[matched], k - 1)[:k]]
+        order = matched[np.argsort(-scores[matched], kind="stable")]
+        return [(int(i), float(scores[i])) for i in order]
+
+    def save(self, path: Path) -> None:
+        """Save the index to a `.npz` file."""
+        lengths = np.array([len(t) for t in self._doc_terms], dtype=np.int64)
+        np.savez(
+            path,
+            params=np.array([self.k1, self.b]),
+            vocabulary=np.array(
+                json.dumps(list(self.vocabulary), ensure_ascii=False)
+            ),
+            lengths=lengths,
+            terms=_concat(self._doc_terms, np.int32),
+            freqs=_concat(self._doc_freqs, np.float32),
+            alive=np.array(self._alive, dtype=bool),
+        )
+
+    @classmethod
+    def load(cls, path: Path) -> BM25Index:
+        """Load an index saved with `save`."""
+        with np.load(path, allow_pickle=False) as data:
+            k1, b = data["params"].tolist()
+            index = cls(k1=k1, b=b)
+            terms = json.loads(str(data["vocabulary"]))
+            index.vocabulary = {term: i for i, term in enumerate(terms)}
+            offsets = np.cumsum(data["lengths"])[:-1]
+            index._doc_terms = np.split(data["terms"], offsets)
+            index._doc_freqs = np.split(data["freqs"], offsets)
+            index._alive = data["alive"].tolist()
+        if not index._alive:
+            index._doc_terms, index._doc_freqs = [], []
+        index._num_alive = sum(index._alive)
+        index._dirty = True
+        return index
+
+    def _compile(self) -> None:
+        if not self._dirty:
+            return
+        num_docs = self.num_slots
+        lengths = np.array([len(t) for t in self._doc_terms], dtype=np.int64)
+        terms = _concat(self._doc_terms, np.int32)
+        freqs = _concat(self._doc_freqs, np.float32)
+        docs = np.repeat(np.arange(num_docs, dtype=np.int32), lengths)
+        doc_lengths = np.array([f.sum() for f in self._doc_freqs], dtype=np.float32)
+        avgdl = doc_lengths.sum() / max(self._num_alive, 1)
+        norms = self.k1 * (1 - self.b + self.b * doc_lengths / max(avgdl, 1e-9))
+
+        df = np.bincount(terms, minlength=len(self.vocabulary))
+        n = self._num_alive
+        idf = np.log1p((n - df + 0.5) / (df + 0.5)).astype(np.float32)
+
+        order = np.argsort(terms, kind="stable")
+        terms, freqs, docs = terms[order], freqs[order], docs[order]
+        self._indptr = np.concatenate(([0], np.cumsum(df)))
+        self._postings = docs
+        self._weights = (
+            idf[terms] * freqs * (self.k1 + 1) / (freqs + norms[docs])
+        ).astype(np.float32)
+        self._dirty = False
+
+
+def _concat(arrays: List[np.ndarray], dtype: Any) -> np.ndarray:
+    return np.concatenate(arrays).astype(dtype) if arrays else np.zeros(0, dtype)
+
+
 class BM25Retriever(BaseRetriever):
-    """`BM25` retriever without Elasticsearch."""
+    """`BM25` retriever without Elasticsearch.
+
+    By default the retriever scores with `BM25Index`, which needs no extra
+    packages. A `rank_bm25` vectorizer can still be passed as `vectorizer`.
+    For Japanese and other CJK text, use `ngram_preprocessing_func`.
+
+    Example:
+        .. code-block:: python
+
+            from langchain_community.retrievers import BM25Retriever
+            from langchain_community.retrievers.bm25 import ngram_preprocessing_func
+
+            retriever = BM25Retriever.from_documents(
+                docs, preprocess_func=ngram_preprocessing_func
+            )
+            retriever.save_local("bm25_index")
+    """
 
     vectorizer: Any
     """ BM25 vectorizer."""
     docs: List[Document] = Field(repr=False)
     """ List of documents."""
     k: int = 4
-    """ Number of documents to return."""
+    """ Number of documents to return. With a `BM25Index` vectorizer, documents
+    that match none of the query tokens are not returned, so fewer than k
+    documents can be returned. A rank_bm25 vectorizer always returns k."""
     preprocess_func: Callable[[str], List[str]] = default_preprocessing_func
     """ Preprocessing function to use on the text before BM25 vectorization."""
+    ids: List[str] = Field(default_factory=list, repr=False)
+    """ Ids of the documents, used to delete them from a `BM25Index`."""
 
     class Config:
         """Configuration for this pydantic object."""
@@ -43,28 +268,20 @@ class BM25Retriever(BaseRetriever):
         Args:
             texts: A list of texts to vectorize.
             metadatas: A list of metadata dicts to associate with each text.
-            bm25_params: Parameters to pass to the BM25 vectorizer.
+            bm25_params: Parameters to pass to the BM25Index, `k1` and `b`. With
+                any other parameters, such as `epsilon`, the texts are indexed
+                with `rank_bm25.BM25Okapi` instead, which must be installed.
             preprocess_func: A function to preprocess each text before vectorization.
             **kwargs: Any other arguments to pass to the retriever.
 
         Returns:
             A BM25Retriever instance.
         """
-        try:
-            from rank_bm25 import BM25Okapi
-        except ImportError:
-            raise ImportError(
-                "Could not import rank_bm25, please install with `pip install "
-                "rank_bm25`."
-            )
-
-        texts_processed = [preprocess_func(t) for t in texts]
-        bm25_params = bm25_params or {}
-        vectorizer = BM25Okapi(texts_processed, **bm25_params)
+        texts = list(texts)
         metadatas = metadatas or ({} for _ in texts)
         docs = [Document(page_content=t, metadata=m) for t, m in zip(texts, metadatas)]
-        return cls(
-            vectorizer=vectorizer, docs=docs, preprocess_func=preprocess_func, **kwargs
+        return cls.from_documents(
+            docs, bm25_params=bm25_params, preprocess_func=preprocess_func, **kwargs
         )
 
     @classmethod
@@ -80,25 +297,149 @@ class BM25Retriever(BaseRetriever):
         Create a BM25Retriever from a list of Documents.
         Args:
             documents: A list of Documents to vectorize.
-            bm25_params: Parameters to pass to the BM25 vectorizer.
+            bm25_params: Parameters to pass to the BM25Index, `k1` and `b`. With
+                any other parameters, such as `epsilon`, the texts are indexed
+                with `rank_bm25.BM25Okapi` instead, which must be installed.
             preprocess_func: A function to preprocess each text before vectorization.
             **kwargs: Any other arguments to pass to the retriever.
 
         Returns:
             A BM25Retriever instance.
         """
-        texts, metadatas = zip(*((d.page_content, d.metadata) for d in documents))
-        return cls.from_texts(
-            texts=texts,
-            bm25_params=bm25_params,
-            metadatas=metadatas,
+        bm25_params = bm25_params or {}
+        documents = list(documents)
+        if set(bm25_params) - {"k1", "b"}:
+            try:
+                from rank_bm25 import BM25Okapi
+            except ImportError:
+                raise ImportError(
+                    "Could not import rank_bm25, please install with `pip install "
+                    "rank_bm25`, or only pass `k1` and `b` as bm25_params."
+                )
+            vectorizer = BM25Okapi(
+                [preprocess_func(doc.page_content) for doc in documents],
+                **bm25_params,
+            )
+            return cls(
+                vectorizer=vectorizer,
+                docs=documents,
+                preprocess_func=preprocess_func,
+                **kwargs,
+            )
+        retriever = cls(
+            vectorizer=BM25Index(**bm25_params),
+            docs=[],
             preprocess_func=preprocess_func,
             **kwargs,
         )
+        retriever.add_documents(documents)
+        return retriever
+
+    def add_documents(
+        self, documents: Sequence[Document], ids: Optional[Sequence[str]] = None
+    ) -> List[str]:
+        """Add documents to the index.
+
+        Args:
+            documents: The documents to add.
+            ids: The ids of the documents. Defaults to the ids of the documents,
+                or new uuids.
+
+        Returns:
+            The ids of the added documents.
+        """
+        index = self._native_index()
+        if ids is None:
+            ids = [doc.id or str(uuid.uuid4()) for doc in documents]
+        index.add(self.preprocess_func(doc.page_content) for doc in documents)
+        self.docs.extend(documents)
+        self.ids.extend(ids)
+        return list(ids)
+
+    def delete(self, ids: Sequence[str]) -> None:
+        """Delete documents from the index by id."""
+        index = self._native_index()
+        targets = set(ids)
+        index.delete(i for i, id_ in enumerate(self.ids) if id_ in targets)
+        if index.num_slots > 2 * len(index):
+            kept = index.compact()
+            self.docs = [self.docs[i] for i in kept]
+            self.ids = [self.ids[i] for i in kept]
+
+    def save_local(self, folder_path: str, file_name: str = "bm25") -> None:
+        """Save the index and documents to a folder.
+
+        The index is saved as `<file_name>.npz` and the documents as
+        `<file_name>.json`, so their metadata must be JSON serializable.
+        """
+        index = self._native_index()
+        path = Path(folder_path)
+        path.mkdir(exist_ok=True, parents=True)
+        index.save(path / f"{file_name}.npz")
+        with open(path / f"{file_name}.json", "w", encoding="utf-8") as f:
+            json.dump(
+                {
+                    "k": self.k,
+                    "ids": self.ids,
+                    "docs": [
+                        {"page_content": d.page_content, "metadata": d.metadata}
+                        for d in self.docs
+                    ],
+                },
+                f,
+                ensure_ascii=False,
+            )
+
+    @classmethod
+    def load_local(
+        cls,
+        folder_path: str,
+        *,
+        preprocess_func: Callable[[str], List[str]] = default_preprocessing_func,
+        file_name: str = "bm25",
+        **kwargs: Any,
+    ) -> BM25Retriever:
+        """Load a retriever saved with `save_local`.
+
+        Args:
+            folder_path: Folder path to load from.
+            preprocess_func: The function the index was built with.
+            file_name: File name to load from. Defaults to "bm25".
+            **kwargs: Any other arguments to pass to the retriever.
+
+        Returns:
+            BM25Retriever: Loaded retriever.
+        """
+        path = Path(folder_path)
+        index = BM25Index.load(path / f"{file_name}.npz")
+        with open(path / f"{file_name}.json", encoding="utf-8") as f:
+            data = json.load(f)
+        docs = [
+            Document(id=id_, **doc) for id_, doc in zip(data["ids"], data["docs"])
+        ]
+        kwargs.setdefault("k", data["k"])
+        return cls(
+            vectorizer=index,
+            docs=docs,
+            ids=data["ids"],
+            preprocess_func=preprocess_func,
+            **kwargs,
+        )
+
+    def _native_index(self) -> BM25Index:
+        if not isinstance(self.vectorizer, BM25Index):
+            raise ValueError(
+                "Adding, deleting and saving documents is only supported with a "
+                f"BM25Index vectorizer, got {type(self.vectorizer).__name__}."
+            )
+        return self.vectorizer
 
     def _get_relevant_documents(
         self, query: str, *, run_manager: CallbackManagerForRetrieverRun
     ) -> List[Document]:
         processed_query = self.preprocess_func(query)
+        if isinstance(self.vectorizer, BM25Index):
+            hits = self.vectorizer.top_k(processed_query, self.k)
+            return [self.docs[i] for i, _ in hits]
         return_docs = self.vectorizer.get_top_n(processed_query, self.docs, n=self.k)
         return return_docs
@@ -40,13 +40,16 @@ from langchain_core.callbacks.manager import (
     RunManager,
     adispatch_custom_event,
     dispatch_custom_event,
+    set_async_callback_dispatch,
 )
 from langchain_core.callbacks.stdout import StdOutCallbackHandler
 from langchain_core.callbacks.streaming_stdout import StreamingStdOutCallbackHandler
+from langchain_core.callbacks.structured import StructuredDebugCallbackHandler
 
 __all__ = [
     "dispatch_custom_event",
     "adispatch_custom_event",
+    "set_async_callback_dispatch",
     "RetrieverManagerMixin",
     "LLMManagerMixin",
     "ChainManagerMixin",
@@ -76,5 +79,6 @@ __all__ = [
     "AsyncCallbackManagerForChainGroup",
     "StdOutCallbackHandler",
     "StreamingStdOutCallbackHandler",
+    "StructuredDebugCallbackHandler",
     "FileCallbackHandler",
 ]
@@ -1,11 +1,15 @@
 from __future__ import annotations
 
 import asyncio
+import atexit
 import functools
 import logging
+import os
+import threading
 import uuid
 from abc import ABC, abstractmethod
-from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import Future, ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeoutError
 from contextlib import asynccontextmanager, contextmanager
 from contextvars import copy_context
 from typing import (
@@ -59,6 +63,12 @@ def _get_debug() -> bool:
     return get_debug()
 
 
+def _get_debug_handler() -> Optional[BaseCallbackHandler]:
+    from langchain_core.globals import get_debug_handler
+
+    return get_debug_handler()
+
+
 @contextmanager
 def trace_as_chain_group(
     group_name: str,
@@ -296,26 +306,41 @@ def handle_event(
                 )
                 if handler.raise_error:
                     raise e
-    finally:
-        if coros:
-            try:
-                # Raises RuntimeError if there is no current event loop.
-                asyncio.get_running_loop()
-                loop_running = True
-            except RuntimeError:
-                loop_running = False
-
-            if loop_running:
-                # If we try to submit this coroutine to the running loop
-                # we end up in a deadlock, as we'd have gotten here from a
-                # running coroutine, which we cannot interrupt to run this one.
-                # The solution is to create a new loop in a new thread.
-                with ThreadPoolExecutor(1) as executor:
-                    executor.submit(
-                        cast(Callable, copy_context().run), _run_coros, coros
-                    ).result()
-            else:
-                _run_coros(coros)
+    except BaseException:
+        # the events of async handlers are not delivered when a sync handler
+        # raises, so their coroutines are closed rather than left unawaited
+        for coro in coros:
+            coro.close()
+        raise
+
+    if not coros:
+        return
+    if not _callback_loop.is_current_thread():
+        future = _callback_loop.submit(coros, kwargs.get("run_id"))
+        if _callback_dispatch["wait"] or event_name.endswith(("_end", "_error")):
+            # Without waiting, the end of a run still waits for its
+            # earlier events, so handlers have seen the whole run when
+            # it returns.
+            _wait_for_callbacks(future, event_name)
+        return
+    try:
+        # Raises RuntimeError if there is no current event loop.
+        asyncio.get_running_loop()
+        loop_running = True
+    except RuntimeError:
+        loop_running = False
+
+    if loop_running:
+        # If we try to submit this coroutine to the running loop
+        # we end up in a deadlock, as we'd have gotten here from a
+        # running coroutine, which we cannot interrupt to run this one.
+        # The solution is to create a new loop in a new thread.
+        with ThreadPoolExecutor(1) as executor:
+            executor.submit(
+                cast(Callable, copy_context().run), _run_coros, coros
+            ).result()
+    else:
+        _run_coros(coros)
 
 
 def _run_coros(coros: List[Coroutine[Any, Any, Any]]) -> None:
@@ -347,6 +372,145 @@ def _run_coros(coros: List[Coroutine[Any, Any, Any]]) -> None:
                 logger.warning(f"Error in callback coroutine: {repr(e)}")
 
 
+# Whether sync code waits for async callbacks, see set_async_callback_dispatch().
+_callback_dispatch: Dict[str, Any] = {"wait": True, "timeout": None}
+
+
+def set_async_callback_dispatch(
+    *, wait: bool = True, timeout: Optional[float] = None
+) -> None:
+    """Configure how sync code dispatches events to async callback handlers.
+
+    The coroutines of async handlers called from sync code run on a background
+    event loop, in the order of their events for each run.
+
+    Args:
+        wait: Whether to wait for the handlers of every event to finish. If False,
+            events are handed to the loop without waiting, except for the end and
+            error events of a run, which wait for all earlier events of the run.
+            Defaults to True.
+        timeout: The maximum number of seconds to wait for the handlers of an
+            event. Handlers that take longer keep running in the background.
+            Defaults to None, which waits until they finish.
+    """
+    _callback_dispatch["wait"] = wait
+    _callback_dispatch["timeout"] = timeout
+
+
+def _wait_for_callbacks(future: Future, event_name: str) -> None:
+    timeout = _callback_dispatch["timeout"]
+    try:
+        future.result(timeout=timeout)
+    except FutureTimeoutError:
+        logger.warning(
+            f"Async callbacks for {event_name} did not finish within {timeout}"
+            " seconds, continuing without them."
+        )
+
+
+class _CallbackLoop:
+    """A long-lived event loop thread for async callbacks invoked from sync code.
+
+    Creating an event loop for every event is expensive when events arrive at
+    token rate, so the loop is started once and reused. Coroutines submitted for
+    the same run are run one after another in the order they were submitted.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+        self._pid: Optional[int] = None
+        # the last task of each run, only used from the loop thread
+        self._lanes: Dict[Any, asyncio.Task] = {}
+
+    def is_current_thread(self) -> bool:
+        return self._thread is threading.current_thread()
+
+    def submit(self, coros: List[Coroutine[Any, Any, Any]], key: Any) -> Future:
+        """Run the coroutines after earlier ones for the same key.
+
+        Returns:
+            A future that is done when the coroutines have finished.
+        """
+        loop = self._ensure_loop()
+        future: Future = Future()
+        loop.call_soon_threadsafe(
+            self._schedule, coros, key, future, context=copy_context()
+        )
+        return future
+
+    def _ensure_loop(self) -> asyncio.AbstractEventLoop:
+        if self._loop is not None and self._pid == os.getpid():
+            return self._loop
+        with self._lock:
+            if self._loop is None or self._pid != os.getpid():
+                # (re)start the loop, e.g. in a child process after a fork
+                loop = asyncio.new_event_loop()
+                thread = threading.Thread(
+                    target=loop.run_forever,
+                    name="langchain-callbacks",
+                    daemon=True,
+                )
+                thread.start()
+                self._lanes = {}
+                self._thread = thread
+                self._pid = os.getpid()
+                self._loop = loop
+            return self._loop
+
+    def _schedule(
+        self, coros: List[Coroutine[Any, Any, Any]], key: Any, future: Future
+    ) -> None:
+        # Runs on the loop thread in the submitter's context, which the task copies.
+        task = asyncio.ensure_future(self._run(self._lanes.get(key), coros))
+        self._lanes[key] = task
+
+        def done(task: asyncio.Task) -> None:
+            if self._lanes.get(key) is task:
+                del self._lanes[key]
+            if not future.done():
+                future.set_result(None)
+
+        task.add_done_callback(done)
+
+    @staticmethod
+    async def _run(
+        previous: Optional[asyncio.Task], coros: List[Coroutine[Any, Any, Any]]
+    ) -> None:
+        if previous is not None:
+            await asyncio.wait([previous])
+        for coro in coros:
+            try:
+                await coro
+            except Exception as e:
+                logger.warning(f"Error in callback coroutine: {repr(e)}")
+
+    def shutdown(self, timeout: float = 5.0) -> None:
+        """Wait for pending callbacks and stop the loop."""
+        loop = self._loop
+        if loop is None or self._pid != os.getpid() or self.is_current_thread():
+            return
+
+        async def drain() -> None:
+            if self._lanes:
+                await asyncio.wait(list(self._lanes.values()), timeout=timeout)
+
+        try:
+            asyncio.run_coroutine_threadsafe(drain(), loop).result(timeout + 1)
+        except Exception:
+            pass
+        loop.call_soon_threadsafe(loop.stop)
+        if self._thread is not None:
+            self._thread.join(timeout=1)
+        self._loop = None
+        self._thread = None
+
+
+_callback_loop = _CallbackLoop()
+atexit.register(_callback_loop.shutdown)
+
+
 async def _ahandle_event_for_handler(
     handler: BaseCallbackHandler,
     event_name: str,
@@ -2314,7 +2478,11 @@ def _configure(
                 pass
             else:
                 callback_manager.add_handler(StdOutCallbackHandler(), False)
-        if debug and not any(
+        debug_handler = _get_debug_handler() if debug else None
+        if debug_handler is not None:
+            if debug_handler not in callback_manager.handlers:
+                callback_manager.add_handler(debug_handler, True)
+        elif debug and not any(
             isinstance(handler, ConsoleCallbackHandler)
             for handler in callback_manager.handlers
         ):
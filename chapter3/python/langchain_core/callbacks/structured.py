@@ -0,0 +1,447 @@
+"""Callback Handler that writes sampled, structured debug records."""
+
+from __future__ import annotations
+
+import atexit
+import json
+import random
+import sys
+import threading
+import time
+from collections import deque
+from queue import Empty, SimpleQueue
+from typing import (
+    Any,
+    Deque,
+    Dict,
+    Iterable,
+    List,
+    Optional,
+    Set,
+    TextIO,
+    Tuple,
+    Union,
+)
+from uuid import UUID
+
+from langchain_core.callbacks.base import BaseCallbackHandler
+
+# time, event, run id, parent run id, trace id, name, payload
+_Record = Tuple[float, str, UUID, Optional[UUID], UUID, Optional[str], Any]
+
+DEFAULT_DEBUG_EVENTS = frozenset(
+    {
+        "chain_start",
+        "chain_end",
+        "chain_error",
+        "llm_start",
+        "llm_end",
+        "llm_error",
+        "tool_start",
+        "tool_end",
+        "tool_error",
+        "retriever_start",
+        "retriever_end",
+        "retriever_error",
+    }
+)
+"""The events recorded by default. Token events ("llm_new_token") are left out."""
+
+
+def _compact(obj: Any, budget: int, depth: int = 0) -> Any:
+    """Convert an object to JSON-compatible values, truncating long strings."""
+    if obj is None or isinstance(obj, (bool, int, float)):
+        return obj
+    if isinstance(obj, str):
+        if len(obj) <= budget:
+            return obj
+        return f"{obj[:budget]}... [{len(obj) - budget} more]"
+    if depth >= 6:
+        return _compact(repr(obj), budget)
+    if isinstance(obj, dict):
+        items = list(obj.items())
+        compact = {
+            str(key): _compact(value, budget, depth + 1) for key, value in items[:50]
+        }
+        if len(items) > 50:
+            compact["..."] = f"{len(items) - 50} more"
+        return compact
+    if isinstance(obj, (list, tuple)):
+        compact_list = [_compact(value, budget, depth + 1) for value in obj[:50]]
+        if len(obj) > 50:
+            compact_list.append(f"... {len(obj) - 50} more")
+        return compact_list
+    if hasattr(obj, "dict") and callable(obj.dict):
+        try:
+            return _compact(
+                {"type": type(obj).__name__, **obj.dict()}, budget, depth + 1
+            )
+        except Exception:
+            pass
+    return _compact(repr(obj), budget)
+
+
+class StructuredDebugCallbackHandler(BaseCallbackHandler):
+    """Callback Handler that writes compact NDJSON debug records.
+
+    Unlike `ConsoleCallbackHandler`, which pretty-prints every event on the
+    calling thread, this handler only puts a reference to the event on a queue.
+    A background thread truncates, serializes and writes the records, one JSON
+    object per line.
+
+    Whole traces are sampled with `sample_rate`, and only the event types in
+    `events` are written. The most recent events of every trace, sampled or not,
+    are also kept in a ring buffer per trace (the "flight recorder"), which is
+    written out when a run in the trace fails and dropped when the trace ends.
+    Token events only go to the flight recorder if they are in `events`.
+
+    Payloads are serialized on the background thread, after the event, so objects
+    mutated in the meantime are written as they are then.
+
+    Example:
+
+        .. code-block:: python
+
+            from langchain_core.callbacks import StructuredDebugCallbackHandler
+            from langchain_core.globals import set_debug, set_debug_handler
+
+            set_debug_handler(StructuredDebugCallbackHandler(sample_rate=0.1))
+            set_debug(True)
+    """
+
+    def __init__(
+        self,
+        file: Union[str, TextIO, None] = None,
+        *,
+        sample_rate: float = 1.0,
+        events: Optional[Iterable[str]] = None,
+        max_payload_chars: int = 2000,
+        flight_recorder_size: int = 500,
+        max_pending: int = 10_000,
+    ) -> None:
+        """Initialize callback handler.
+
+        Args:
+            file: The file name or stream to write to. Defaults to sys.stderr.
+            sample_rate: The fraction of traces to write. Defaults to 1.0.
+            events: The event types to write, such as "chain_start" or
+                "llm_new_token". Defaults to `DEFAULT_DEBUG_EVENTS`.
+            max_payload_chars: The maximum length of the strings in a payload.
+                Defaults to 2000.
+            flight_recorder_size: The number of recent events to keep per trace
+                for dumping on errors, 0 to disable. Defaults to 500.
+            max_pending: The maximum number of records waiting to be written.
+                Further records are dropped and counted in `dropped`. Defaults to
+                10000.
+        """
+        if isinstance(file, str):
+            self._file: TextIO = open(file, "a", encoding="utf-8")
+        else:
+            self._file = file or sys.stderr
+        self.sample_rate = sample_rate
+        self.events = frozenset(events) if events is not None else DEFAULT_DEBUG_EVENTS
+        self.max_payload_chars = max_payload_chars
+        self.max_pending = max_pending
+        self.dropped = 0
+        self.flight_recorder_size = flight_recorder_size
+        self._flight_recorders: Dict[UUID, Deque[_Record]] = {}
+        self._trace_ids: Dict[UUID, UUID] = {}
+        self._sampled: Dict[UUID, bool] = {}
+        self._recorded_traces: Set[UUID] = set()
+        self._queue: SimpleQueue = SimpleQueue()
+        self._pending = 0
+        self._pending_lock = threading.Lock()
+        self._writer = threading.Thread(
+            target=self._write_loop, name="langchain-debug-writer", daemon=True
+        )
+        self._writer.start()
+        atexit.register(self.close)
+
+    def close(self, timeout: float = 2.0) -> None:
+        """Write the pending records and stop the writer thread."""
+        if self._writer.is_alive():
+            self._queue.put(None)
+            self._writer.join(timeout)
+
+    # Recording, on the calling thread
+
+    def _start(
+        self,
+        event: str,
+        run_id: UUID,
+        parent_run_id: Optional[UUID],
+        name: Optional[str],
+        payload: Any,
+    ) -> None:
+        if parent_run_id is None:
+            trace_id = run_id
+            self._sampled[trace_id] = random.random() < self.sample_rate
+            if self.flight_recorder_size:
+                self._flight_recorders[trace_id] = deque(
+                    maxlen=self.flight_recorder_size
+                )
+        else:
+            trace_id = self._trace_ids.get(parent_run_id, parent_run_id)
+        self._trace_ids[run_id] = trace_id
+        self._record(event, run_id, parent_run_id, name, payload)
+
+    def _record(
+        self,
+        event: str,
+        run_id: UUID,
+        parent_run_id: Optional[UUID],
+        name: Optional[str],
+        payload: Any,
+    ) -> None:
+        trace_id = self._trace_ids.get(run_id, run_id)
+        record = (time.time(), event, run_id, parent_run_id, trace_id, name, payload)
+        flight_recorder = self._flight_recorders.get(trace_id)
+        if flight_recorder is not None and (
+            event != "llm_new_token" or event in self.events
+        ):
+            flight_recorder.append(record)
+        if event in self.events and self._sampled.get(trace_id, True):
+            self._put(("record", record))
+        if (
+            event.endswith("_error")
+            and flight_recorder is not None
+            and trace_id not in self._recorded_traces
+        ):
+            # once per trace, not for every run the error propagates through
+            self._recorded_traces.add(trace_id)
+            self._put(("flight_recorder", list(flight_recorder)))
+
+    def _end(
+        self,
+        event: str,
+        run_id: UUID,
+        parent_run_id: Optional[UUID],
+        payload: Any,
+    ) -> None:
+        self._record(event, run_id, parent_run_id, None, payload)
+        self._trace_ids.pop(run_id, None)
+        if parent_run_id is None:
+            self._sampled.pop(run_id, None)
+            self._flight_recorders.pop(run_id, None)
+            self._recorded_traces.discard(run_id)
+
+    def _put(self, item: Tuple) -> None:
+        with self._pending_lock:
+            if self._pending >= self.max_pending:
+                self.dropped += 1
+                return
+            self._pending += 1
+        self._queue.put(item)
+
+    # Writing, on the background thread
+
+    def _write_loop(self) -> None:
+        while True:
+            item = self._queue.get()
+            while item is not None:
+                with self._pending_lock:
+                    self._pending -= 1
+                try:
+                    self._write(item)
+                except Exception:
+                    pass
+                try:
+                    item = self._queue.get_nowait()
+                except Empty:
+                    break
+            try:
+                self._file.flush()
+            except Exception:
+                pass
+            if item is None:
+                return
+
+    def _write(self, item: Tuple) -> None:
+        if item[0] == "record":
+            self._file.write(self._dumps(item[1]) + "\n")
+            return
+        lines: List[str] = [
+            self._dumps(record, flight_recorder=True) for record in item[1]
+        ]
+        if lines:
+            self._file.write("\n".join(lines) + "\n")
+
+    def _dumps(self, record: _Record, flight_recorder: bool = False) -> str:
+        ts, event, run_id, parent_run_id, trace_id, name, payload = record
+        data: Dict[str, Any] = {
+            "ts": round(ts, 6),
+            "event": event,
+            "run_id": str(run_id),
+            "trace_id": str(trace_id),
+        }
+        if parent_run_id is not None:
+            data["parent_run_id"] = str(parent_run_id)
+        if name is not None:
+            data["name"] = name
+        if payload is not None:
+            data["payload"] = _compact(payload, self.max_payload_chars)
+        if flight_recorder:
+            data["flight_recorder"] = True
+        return json.dumps(data, ensure_ascii=False, default=str)
+
+    # Callbacks
+
+    @staticmethod
+    def _name(serialized: Optional[Dict[str, Any]], kwargs: Dict[str, Any]) -> str:
+        if kwargs.get("name"):
+            return kwargs["name"]
+        serialized = serialized or {}
+        return serialized.get("name") or serialized.get("id", ["<unknown>"])[-1]
+
+    def on_chain_start(
+        self,
+        serialized: Dict[str, Any],
+        inputs: Dict[str, Any],
+        *,
+        run_id: UUID,
+        parent_run_id: Optional[UUID] = None,
+        **kwargs: Any,
+    ) -> None:
+        self._start(
+            "chain_start", run_id, parent_run_id, self._name(serialized, kwargs), inputs
+        )
+
+    def on_chain_end(
+        self,
+        outputs: Dict[str, Any],
+        *,
+        run_id: UUID,
+        parent_run_id: Optional[UUID] = None,
+        **kwargs: Any,
+    ) -> None:
+        self._end("chain_end", run_id, parent_run_id, outputs)
+
+    def on_chain_error(
+        self,
+        error: BaseException,
+        *,
+        run_id: UUID,
+        parent_run_id: Optional[UUID] = None,
+        **kwargs: Any,
+    ) -> None:
+        self._end("chain_error", run_id, parent_run_id, repr(error))
+
+    def on_llm_start(
+        self,
+        serialized: Dict[str, Any],
+        prompts: List[str],
+        *,
+        run_id: UUID,
+        parent_run_id: Optional[UUID] = None,
+        **kwargs: Any,
+    ) -> None:
+        self._start(
+            "llm_start", run_id, parent_run_id, self._name(serialized, kwargs), prompts
+        )
+
+    def on_chat_model_start(
+        self,
+        serialized: Dict[str, Any],
+        messages: List[List[Any]],
+        *,
+        run_id: UUID,
+        parent_run_id: Optional[UUID] = None,
+        **kwargs: Any,
+    ) -> None:
+        self._start(
+            "llm_start", run_id, parent_run_id, self._name(serialized, kwargs), messages
+        )
+
+    def on_llm_new_token(
+        self,
+        token: str,
+        *,
+        run_id: UUID,
+        parent_run_id: Optional[UUID] = None,
+        **kwargs: Any,
+    ) -> None:
+        self._record("llm_new_token", run_id, parent_run_id, None, token)
+
+    def on_llm_end(
+        self,
+        response: Any,
+        *,
+        run_id: UUID,
+        parent_run_id: Optional[UUID] = None,
+        **kwargs: Any,
+    ) -> None:
+        self._end("llm_end", run_id, parent_run_id, response)
+
+    def on_llm_error(
+        self,
+        error: BaseException,
+        *,
+        run_id: UUID,
+        parent_run_id: Optional[UUID] = None,
+        **kwargs: Any,
+    ) -> None:
+        self._end("llm_error", run_id, parent_run_id, repr(error))
+
+    def on_tool_start(
+        self,
+        serialized: Dict[str, Any],
+        input_str: str,
+        *,
+        run_id: UUID,
+        parent_run_id: Optional[UUID] = None,
+        **kwargs: Any,
+    ) -> None:
+        name = self._name(serialized, kwargs)
+        self._start("tool_start", run_id, parent_run_id, name, input_str)
+
+    def on_tool_end(
+        self,
+        output: Any,
+        *,
+        run_id: UUID,
+        parent_run_id: Optional[UUID] = None,
+        **kwargs: Any,
+    ) -> None:
+        self._end("tool_end", run_id, parent_run_id, output)
+
+    def on_tool_error(
+        self,
+        error: BaseException,
+        *,
+        run_id: UUID,
+        parent_run_id: Optional[UUID] = None,
+        **kwargs: Any,
+    ) -> None:
+        self._end("tool_error", run_id, parent_run_id, repr(error))
+
+    def on_retriever_start(
+        self,
+        serialized: Dict[str, Any],
+        query: str,
+        *,
+        run_id: UUID,
+        parent_run_id: Optional[UUID] = None,
+        **kwargs: Any,
+    ) -> None:
+        name = self._name(serialized, kwargs)
+        self._start("retriever_start", run_id, parent_run_id, name, query)
+
+    def on_retriever_end(
+        self,
+        documents: Any,
+        *,
+        run_id: UUID,
+        parent_run_id: Optional[UUID] = None,
+        **kwargs: Any,
+    ) -> None:
+        self._end("retriever_end", run_id, parent_run_id, documents)
+
+    def on_retriever_error(
+        self,
+        error: BaseException,
+        *,
+        run_id: UUID,
+        parent_run_id: Optional[UUID] = None,
+        **kwargs: Any,
+    ) -> None:
+        self._end("retriever_error", run_id, parent_run_id, repr(error))
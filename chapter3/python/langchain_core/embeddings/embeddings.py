@@ -1,9 +1,10 @@
 """**Embeddings** interface."""
 
+import asyncio
 from abc import ABC, abstractmethod
 from typing import List
 
-from langchain_core.runnables.config import run_in_executor
+from langchain_core.runnables.config import get_executor_for_config, run_in_executor
 
 
 class Embeddings(ABC):
@@ -56,6 +57,24 @@ class Embeddings(ABC):
             Embedding.
         """
 
+    def embed_queries(self, texts: List[str]) -> List[List[float]]:
+        """Embed several query texts.
+
+        By default the queries are embedded concurrently with `embed_query`.
+        Models that can embed several queries in one request should override
+        this, so that batched searches make one request.
+
+        Args:
+            texts: List of text to embed.
+
+        Returns:
+            List of embeddings.
+        """
+        if len(texts) <= 1:
+            return [self.embed_query(text) for text in texts]
+        with get_executor_for_config(None) as executor:
+            return list(executor.map(self.embed_query, texts))
+
     async def aembed_documents(self, texts: List[str]) -> List[List[float]]:
         """Asynchronous Embed search docs.
 
@@ -77,3 +96,19 @@ class Embeddings(ABC):
             Embedding.
         """
         return await run_in_executor(None, self.embed_query, text)
+
+    async def aembed_queries(self, texts: List[str]) -> List[List[float]]:
+        """Asynchronous Embed several query texts.
+
+        By default the queries are embedded concurrently with `aembed_query`,
+        unless `embed_queries` is overridden.
+
+        Args:
+            texts: List of text to embed.
+
+        Returns:
+            List of embeddings.
+        """
+        if type(self).embed_queries is not Embeddings.embed_queries:
+            return await run_in_executor(None, self.embed_queries, texts)
+        return list(await asyncio.gather(*(self.aembed_query(text) for text in texts)))
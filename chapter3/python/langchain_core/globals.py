@@ -6,6 +6,7 @@ from typing import TYPE_CHECKING, Optional
 
 if TYPE_CHECKING:
     from langchain_core.caches import BaseCache
+    from langchain_core.callbacks import BaseCallbackHandler
 
 
 # DO NOT USE THESE VALUES DIRECTLY!
@@ -14,6 +15,7 @@ if TYPE_CHECKING:
 # https://github.com/langchain-ai/langchain/pull/11311#issuecomment-1743780004
 _verbose: bool = False
 _debug: bool = False
+_debug_handler: Optional["BaseCallbackHandler"] = None
 _llm_cache: Optional["BaseCache"] = None
 
 
@@ -151,6 +153,26 @@ def get_debug() -> bool:
     return _debug or old_debug
 
 
+def set_debug_handler(value: Optional["BaseCallbackHandler"]) -> None:
+    """Set the callback handler used when the `debug` global setting is on.
+
+    Args:
+        value: The handler, such as a `StructuredDebugCallbackHandler`. None
+            restores the default, a `ConsoleCallbackHandler`.
+    """
+    global _debug_handler
+    _debug_handler = value
+
+
+def get_debug_handler() -> Optional["BaseCallbackHandler"]:
+    """Get the callback handler used when the `debug` global setting is on.
+
+    Returns:
+        The handler, or None if the default `ConsoleCallbackHandler` is used.
+    """
+    return _debug_handler
+
+
 def set_llm_cache(value: Optional["BaseCache"]) -> None:
     """Set a new LLM cache, overwriting the previous value, if any.
 
@@ -55,6 +55,7 @@ from langchain_core.outputs import (
     ChatResult,
     LLMResult,
     RunInfo,
+    merge_chat_generation_chunks,
 )
 from langchain_core.prompt_values import ChatPromptValue, PromptValue, StringPromptValue
 from langchain_core.pydantic_v1 import (
@@ -382,7 +383,7 @@ class BaseChatModel(BaseLanguageModel[BaseMessage], ABC):
                 run_id=config.pop("run_id", None),
                 batch_size=1,
             )
-            generation: Optional[ChatGenerationChunk] = None
+            chunks: List[ChatGenerationChunk] = []
 
             if self.rate_limiter:
                 self.rate_limiter.acquire(blocking=True)
@@ -396,12 +397,11 @@ class BaseChatModel(BaseLanguageModel[BaseMessage], ABC):
                         cast(str, chunk.message.content), chunk=chunk
                     )
                     yield chunk.message
-                    if generation is None:
-                        generation = chunk
-                    else:
-                        generation += chunk
+                    chunks.append(chunk)
+                generation = merge_chat_generation_chunks(chunks)
                 assert generation is not None
             except BaseException as e:
+                generation = merge_chat_generation_chunks(chunks)
                 run_manager.on_llm_error(
                     e,
                     response=LLMResult(
@@ -458,7 +458,7 @@ class BaseChatModel(BaseLanguageModel[BaseMessage], ABC):
         if self.rate_limiter:
             self.rate_limiter.acquire(blocking=True)
 
-        generation: Optional[ChatGenerationChunk] = None
+        chunks: List[ChatGenerationChunk] = []
         try:
             async for chunk in self._astream(
                 messages,
@@ -472,12 +472,11 @@ class BaseChatModel(BaseLanguageModel[BaseMessage], ABC):
                     cast(str, chunk.message.content), chunk=chunk
                 )
                 yield chunk.message
-                if generation is None:
-                    generation = chunk
-                else:
-                    generation += chunk
+                chunks.append(chunk)
+            generation = merge_chat_generation_chunks(chunks)
             assert generation is not None
         except BaseException as e:
+            generation = merge_chat_generation_chunks(chunks)
             await run_manager.on_llm_error(
                 e,
                 response=LLMResult(generations=[[generation]] if generation else []),
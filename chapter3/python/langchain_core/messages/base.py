@@ -122,6 +122,12 @@ def merge_content(
     Returns:
         The merged content.
     """
+    if isinstance(first_content, str) and all(
+        isinstance(content, str) for content in contents
+    ):
+        # Join all the strings at once, rather than copying the merged string
+        # for every chunk
+        return first_content + "".join(cast(List[str], contents))
     merged = first_content
     for content in contents:
         # If current is a string
@@ -2,16 +2,28 @@ from __future__ import annotations
 
 import json
 from json import JSONDecodeError
-from typing import Any, List, Optional, Type, TypeVar, Union
+from typing import (
+    Any,
+    AsyncIterator,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Type,
+    TypeVar,
+    Union,
+)
 
 import jsonpatch  # type: ignore[import]
 import pydantic  # pydantic: ignore
 
 from langchain_core.exceptions import OutputParserException
+from langchain_core.messages import BaseMessage
 from langchain_core.output_parsers.format_instructions import JSON_FORMAT_INSTRUCTIONS
 from langchain_core.output_parsers.transform import BaseCumulativeTransformOutputParser
 from langchain_core.outputs import Generation
 from langchain_core.utils.json import (
+    IncrementalJsonParser,
     parse_and_check_json_markdown,
     parse_json_markdown,
     parse_partial_json,
@@ -30,14 +42,24 @@ else:
 TBaseModel = TypeVar("TBaseModel", bound=PydanticBaseModel)
 
 
+def _message_text(chunk: Union[str, BaseMessage]) -> Optional[str]:
+    if isinstance(chunk, BaseMessage):
+        return chunk.content if isinstance(chunk.content, str) else None
+    return chunk
+
+
 class JsonOutputParser(BaseCumulativeTransformOutputParser[Any]):
     """Parse the output of an LLM call to a JSON object.
 
     When used in streaming mode, it will yield partial JSON objects containing
-    all the keys that have been returned so far.
+    all the keys that have been returned so far. The stream is parsed
+    incrementally, so each chunk is only looked at once, but every partial object
+    copies the objects and arrays that are still open.
 
     In streaming, if `diff` is set to `True`, yields JSONPatch operations
     describing the difference between the previous and the current object.
+    These are built from the changes the parser saw, without comparing whole
+    objects, so their cost grows with the size of the changes only.
     """
 
     pydantic_object: Optional[Type[TBaseModel]] = None  # type: ignore
@@ -47,6 +69,108 @@ class JsonOutputParser(BaseCumulativeTransformOutputParser[Any]):
     def _diff(self, prev: Optional[Any], next: Any) -> Any:
         return jsonpatch.make_patch(prev, next).patch
 
+    def _transform(self, input: Iterator[Union[str, BaseMessage]]) -> Iterator[Any]:
+        if type(self).parse_result is not JsonOutputParser.parse_result:
+            yield from super()._transform(input)
+            return
+        parser = IncrementalJsonParser()
+        seen: List[Union[str, BaseMessage]] = []
+        for chunk in input:
+            seen.append(chunk)
+            text = _message_text(chunk)
+            try:
+                if text is None:
+                    raise JSONDecodeError("Non-text message content", "", 0)
+                changed = parser.feed(text)
+            except JSONDecodeError:
+                yield from self._fallback_transform(seen, input)
+                return
+            if changed:
+                yield from self._incremental_output(parser)
+        if parser.finish():
+            yield from self._incremental_output(parser)
+
+    async def _atransform(
+        self, input: AsyncIterator[Union[str, BaseMessage]]
+    ) -> AsyncIterator[Any]:
+        if type(self).parse_result is not JsonOutputParser.parse_result:
+            async for output in super()._atransform(input):
+                yield output
+            return
+        parser = IncrementalJsonParser()
+        seen: List[Union[str, BaseMessage]] = []
+        async for chunk in input:
+            seen.append(chunk)
+            text = _message_text(chunk)
+            try:
+                if text is None:
+                    raise JSONDecodeError("Non-text message content", "", 0)
+                changed = parser.feed(text)
+            except JSONDecodeError:
+                async for output in self._afallback_transform(seen, input):
+                    yield output
+                return
+            if changed:
+                for output in self._incremental_output(parser):
+                    yield output
+        if parser.finish():
+            for output in self._incremental_output(parser):
+                yield output
+
+    def _incremental_output(self, parser: IncrementalJsonParser) -> Iterator[Any]:
+        """Yield the output for a change of the parsed value, if there is any."""
+        if self.diff:
+            ops = parser.patch()
+            if ops:
+                yield ops
+            return
+        parsed = parser.snapshot()
+        if parsed is not None:
+            yield parsed
+
+    def _fallback_transform(
+        self,
+        seen: List[Union[str, BaseMessage]],
+        input: Iterable[Union[str, BaseMessage]],
+    ) -> Iterator[Any]:
+        """Re-parse the whole stream, for output the incremental parser can't
+        handle (such as text around the JSON), skipping what was already yielded.
+        """
+        consumed = 0
+
+        def replay() -> Iterator[Union[str, BaseMessage]]:
+            nonlocal consumed
+            for chunk in seen:
+                consumed += 1
+                yield chunk
+            for chunk in input:
+                consumed += 1
+                yield chunk
+
+        for output in super()._transform(replay()):
+            if consumed >= len(seen):
+                yield output
+
+    async def _afallback_transform(
+        self,
+        seen: List[Union[str, BaseMessage]],
+        input: AsyncIterator[Union[str, BaseMessage]],
+    ) -> AsyncIterator[Any]:
+        consumed = 0
+
+        async def replay() -> AsyncIterator[Union[str, BaseMessage]]:
+            nonlocal consumed
+            for chunk in seen:
+                consumed += 1
+                yield chunk
+            async for chunk in input:
+                consumed += 1
+                yield chunk
+
+        async for output in super()._atransform(replay()):
+            if consumed >= len(seen):
+                yield output
+
     def _get_schema(self, pydantic_object: Type[TBaseModel]) -> dict[str, Any]:
         if PYDANTIC_MAJOR_VERSION == 2:
             if issubclass(pydantic_object, pydantic.BaseModel):
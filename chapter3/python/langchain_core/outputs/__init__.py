@@ -19,7 +19,11 @@ in the AIMessage object, it is recommended to access it from there rather than
 from the `LLMResult` object.
 """
 
-from langchain_core.outputs.chat_generation import ChatGeneration, ChatGenerationChunk
+from langchain_core.outputs.chat_generation import (
+    ChatGeneration,
+    ChatGenerationChunk,
+    merge_chat_generation_chunks,
+)
 from langchain_core.outputs.chat_result import ChatResult
 from langchain_core.outputs.generation import Generation, GenerationChunk
 from langchain_core.outputs.llm_result import LLMResult
@@ -33,4 +37,5 @@ __all__ = [
     "GenerationChunk",
     "LLMResult",
     "RunInfo",
+    "merge_chat_generation_chunks",
 ]
@@ -1,6 +1,6 @@
 from __future__ import annotations
 
-from typing import Any, Dict, List, Literal, Union
+from typing import Any, Dict, List, Literal, Optional, Union
 
 from langchain_core.messages import BaseMessage, BaseMessageChunk
 from langchain_core.outputs.generation import Generation
@@ -115,3 +115,26 @@ class ChatGenerationChunk(ChatGeneration):
             raise TypeError(
                 f"unsupported operand type(s) for +: '{type(self)}' and '{type(other)}'"
             )
+
+
+def merge_chat_generation_chunks(
+    chunks: List[ChatGenerationChunk],
+) -> Optional[ChatGenerationChunk]:
+    """Merge a list of ChatGenerationChunks into a single ChatGenerationChunk.
+
+    The chunks are merged in one pass, so streaming callers can collect the
+    chunks in a list and merge them once at the end instead of adding every
+    chunk to a running total, which copies the content and re-merges the
+    metadata of the total each time.
+
+    Args:
+        chunks: The chunks to merge.
+
+    Returns:
+        The merged chunk, or None if there are no chunks.
+    """
+    if not chunks:
+        return None
+    if len(chunks) == 1:
+        return chunks[0]
+    return chunks[0] + chunks[1:]
@@ -2057,7 +2057,13 @@ class Runnable(Generic[Input, Output], ABC):
                     yield chunk
                     if final_output_supported:
                         if final_output is None:
-                            final_output = chunk
+                            # a copy, so list chunks can be appended in place
+                            final_output = (
+                                list(chunk) if type(chunk) is list else chunk  # type: ignore[assignment]
+                            )
+                        elif type(final_output) is list and type(chunk) is list:
+                            # concatenating would copy the output for every chunk
+                            final_output.extend(chunk)
                         else:
                             try:
                                 final_output = final_output + chunk  # type: ignore
@@ -2169,7 +2175,13 @@ class Runnable(Generic[Input, Output], ABC):
                     yield chunk
                     if final_output_supported:
                         if final_output is None:
-                            final_output = chunk
+                            # a copy, so list chunks can be appended in place
+                            final_output = (
+                                list(chunk) if type(chunk) is list else chunk  # type: ignore[assignment]
+                            )
+                        elif type(final_output) is list and type(chunk) is list:
+                            # concatenating would copy the output for every chunk
+                            final_output.extend(chunk)
                         else:
                             try:
                                 final_output = final_output + chunk  # type: ignore
@@ -1,14 +1,25 @@
 from __future__ import annotations
 
+import atexit
 import inspect
+import logging
+import os
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from typing import (
     TYPE_CHECKING,
     Any,
     Callable,
+    Deque,
     Dict,
+    Hashable,
     List,
+    Mapping,
     Optional,
     Sequence,
+    Tuple,
     Type,
     Union,
 )
@@ -17,6 +28,7 @@ from langchain_core.chat_history import BaseChatMessageHistory
 from langchain_core.load.load import load
 from langchain_core.pydantic_v1 import BaseModel
 from langchain_core.runnables.base import Runnable, RunnableBindingBase, RunnableLambda
+from langchain_core.runnables.config import run_in_executor
 from langchain_core.runnables.passthrough import RunnablePassthrough
 from langchain_core.runnables.utils import (
     ConfigurableFieldSpec,
@@ -31,9 +43,141 @@ if TYPE_CHECKING:
     from langchain_core.tracers.schemas import Run
 
 
+logger = logging.getLogger(__name__)
+
 MessagesOrDictWithMessages = Union[Sequence["BaseMessage"], Dict[str, Any]]
 GetSessionHistoryCallable = Callable[..., BaseChatMessageHistory]
 
+# configurable key of the per-call _HistoryState, the "__" prefix keeps it out
+# of the run metadata
+_STATE_KEY = "__message_history_state"
+
+
+class _HistoryState:
+    """What the history wrapper remembers between loading and saving a turn."""
+
+    __slots__ = ("session_key", "history_length")
+
+    def __init__(self, session_key: Hashable) -> None:
+        self.session_key = session_key
+        # the number of messages loaded from the history, if they were loaded
+        self.history_length: Optional[int] = None
+
+
+class _HistoryWriter:
+    """Writes new history messages on background threads.
+
+    Writes are queued per session and a session's writes are made one after the
+    other in the order they were queued, so the history of a session keeps the
+    order of its turns. Writes that queue up behind a slow one are sent together.
+    A failing write is retried with exponential backoff, and dropped with a
+    warning once the retries run out.
+    """
+
+    def __init__(
+        self, max_workers: int = 4, max_retries: int = 3, retry_delay: float = 0.5
+    ) -> None:
+        self.max_workers = max_workers
+        self.max_retries = max_retries
+        self.retry_delay = retry_delay
+        self._cond = threading.Condition()
+        self._lanes: Dict[
+            Hashable, Deque[Tuple[BaseChatMessageHistory, List[BaseMessage]]]
+        ] = {}
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._pid = os.getpid()
+
+    def submit(
+        self,
+        session_key: Hashable,
+        history: BaseChatMessageHistory,
+        messages: List[BaseMessage],
+    ) -> None:
+        """Queue messages to be added to the history of a session."""
+        with self._cond:
+            if self._executor is None or self._pid != os.getpid():
+                # the threads of the parent process do not survive a fork
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.max_workers,
+                    thread_name_prefix="langchain-history",
+                )
+                self._lanes = {}
+                self._pid = os.getpid()
+            lane = self._lanes.get(session_key)
+            if lane is not None:
+                lane.append((history, messages))
+                return
+            self._lanes[session_key] = deque([(history, messages)])
+            self._executor.submit(self._drain, session_key)
+
+    def pending(self, session_key: Hashable) -> bool:
+        """Whether a session has writes that are not done yet."""
+        return session_key in self._lanes
+
+    def wait(self, session_key: Hashable, timeout: Optional[float] = None) -> bool:
+        """Wait for the writes of a session to finish."""
+        with self._cond:
+            return self._cond.wait_for(
+                lambda: session_key not in self._lanes, timeout=timeout
+            )
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """Wait for all writes to finish.
+
+        Returns:
+            True if all writes finished, False if the timeout expired first.
+        """
+        with self._cond:
+            return self._cond.wait_for(lambda: not self._lanes, timeout=timeout)
+
+    def _drain(self, session_key: Hashable) -> None:
+        while True:
+            with self._cond:
+                lane = self._lanes[session_key]
+                if not lane:
+                    del self._lanes[session_key]
+                    self._cond.notify_all()
+                    return
+                # send the consecutive writes to the same history at once
+                history = lane[0][0]
+                count = 0
+                messages: List[BaseMessage] = []
+                for item_history, item_messages in lane:
+                    if item_history is not history:
+                        break
+                    messages.extend(item_messages)
+                    count += 1
+            self._write(history, messages)
+            with self._cond:
+                for _ in range(count):
+                    lane.popleft()
+
+    def _write(
+        self, history: BaseChatMessageHistory, messages: List[BaseMessage]
+    ) -> None:
+        for attempt in range(self.max_retries + 1):
+            try:
+                history.add_messages(messages)
+                return
+            except Exception:
+                if attempt == self.max_retries:
+                    logger.warning(
+                        "Dropping %d messages that could not be added to %s",
+                        len(messages),
+                        type(history).__name__,
+                        exc_info=True,
+                    )
+                    return
+                time.sleep(self.retry_delay * 2**attempt)
+
+
+_history_writer = _HistoryWriter()
+
+
+@atexit.register
+def _flush_history_writer() -> None:
+    _history_writer.flush()
+
 
 class RunnableWithMessageHistory(RunnableBindingBase):
     """Runnable that manages chat message history for another Runnable.
@@ -69,6 +213,14 @@ class RunnableWithMessageHistory(RunnableBindingBase):
     For production use cases, you will want to use a persistent implementation
     of chat message history, such as ``RedisChatMessageHistory``.
 
+    Steps that do not need the history, such as retrieval, can be given as
+    ``concurrent_inputs`` to run while the history loads. With
+    ``write_behind=True`` the new messages are saved on a background thread
+    after the wrapped Runnable finishes, so the turn does not wait for the
+    write. The next turn of the same session waits for the write before it
+    loads the history. Call ``RunnableWithMessageHistory.flush()`` to wait for
+    all writes, e.g. before a serverless handler returns.
+
     Parameters:
         get_session_history: Function that returns a new BaseChatMessageHistory.
             This function should either take a single positional argument
@@ -82,6 +234,7 @@ class RunnableWithMessageHistory(RunnableBindingBase):
             as input and expects a separate key for historical messages.
         history_factory_config: Configure fields that should be passed to the
             chat history factory. See ``ConfigurableFieldSpec`` for more details.
+        write_behind: Whether new messages are saved on a background thread.
 
     Example: Chat message history with an in-memory implementation for testing.
 
@@ -234,6 +387,7 @@ class RunnableWithMessageHistory(RunnableBindingBase):
     output_messages_key: Optional[str] = None
     history_messages_key: Optional[str] = None
     history_factory_config: Sequence[ConfigurableFieldSpec]
+    write_behind: bool = False
 
     @classmethod
     def get_lc_namespace(cls) -> List[str]:
@@ -255,6 +409,8 @@ class RunnableWithMessageHistory(RunnableBindingBase):
         output_messages_key: Optional[str] = None,
         history_messages_key: Optional[str] = None,
         history_factory_config: Optional[Sequence[ConfigurableFieldSpec]] = None,
+        concurrent_inputs: Optional[Mapping[str, Any]] = None,
+        write_behind: bool = False,
         **kwargs: Any,
     ) -> None:
         """Initialize RunnableWithMessageHistory.
@@ -308,6 +464,12 @@ class RunnableWithMessageHistory(RunnableBindingBase):
                 chat history factory. See ``ConfigurableFieldSpec`` for more details.
                 Specifying these allows you to pass multiple config keys
                 into the get_session_history factory.
+            concurrent_inputs: Extra keys to add to a dict input, computed
+                while the history loads. The values are anything
+                ``RunnablePassthrough.assign`` accepts and get the input dict.
+                Requires ``input_messages_key``. Default is None.
+            write_behind: Whether to save the new messages on a background
+                thread instead of before the call returns. Default is False.
             **kwargs: Arbitrary additional kwargs to pass to parent class
                 ``RunnableBindingBase`` init.
         """
@@ -317,8 +479,13 @@ class RunnableWithMessageHistory(RunnableBindingBase):
         messages_key = history_messages_key or input_messages_key
         if messages_key:
             history_chain = RunnablePassthrough.assign(
-                **{messages_key: history_chain}
+                **{**(concurrent_inputs or {}), messages_key: history_chain}
             ).with_config(run_name="insert_history")
+        elif concurrent_inputs:
+            raise ValueError(
+                "concurrent_inputs can only be used with a dict input, "
+                "set input_messages_key."
+            )
 
         runnable_sync: Runnable = runnable.with_listeners(on_end=self._exit_history)
         runnable_async: Runnable = runnable.with_alisteners(on_end=self._aexit_history)
@@ -359,9 +526,26 @@ class RunnableWithMessageHistory(RunnableBindingBase):
             bound=bound,
             history_messages_key=history_messages_key,
             history_factory_config=_config_specs,
+            write_behind=write_behind,
             **kwargs,
         )
 
+    @staticmethod
+    def flush(timeout: Optional[float] = None) -> bool:
+        """Wait for the messages saved with ``write_behind`` to be written.
+
+        This covers every RunnableWithMessageHistory, and also runs when the
+        interpreter exits.
+
+        Args:
+            timeout: The maximum number of seconds to wait. Defaults to None,
+                which waits until all messages are written.
+
+        Returns:
+            True if all messages were written, False if the timeout expired.
+        """
+        return _history_writer.flush(timeout)
+
     @property
     def config_specs(self) -> List[ConfigurableFieldSpec]:
         """Get the configuration specs for the RunnableWithMessageHistory."""
@@ -481,7 +665,13 @@ class RunnableWithMessageHistory(RunnableBindingBase):
 
     def _enter_history(self, input: Any, config: RunnableConfig) -> List[BaseMessage]:
         hist: BaseChatMessageHistory = config["configurable"]["message_history"]
+        state: Optional[_HistoryState] = config["configurable"].get(_STATE_KEY)
+        if state is not None and _history_writer.pending(state.session_key):
+            # read the messages of the previous turn
+            _history_writer.wait(state.session_key)
         messages = hist.messages.copy()
+        if state is not None:
+            state.history_length = len(messages)
 
         if not self.history_messages_key:
             # return all messages
@@ -495,7 +685,13 @@ class RunnableWithMessageHistory(RunnableBindingBase):
         self, input: Dict[str, Any], config: RunnableConfig
     ) -> List[BaseMessage]:
         hist: BaseChatMessageHistory = config["configurable"]["message_history"]
+        state: Optional[_HistoryState] = config["configurable"].get(_STATE_KEY)
+        if state is not None and _history_writer.pending(state.session_key):
+            # read the messages of the previous turn
+            await run_in_executor(config, _history_writer.wait, state.session_key)
         messages = (await hist.aget_messages()).copy()
+        if state is not None:
+            state.history_length = len(messages)
 
         if not self.history_messages_key:
             # return all messages
@@ -513,14 +709,23 @@ class RunnableWithMessageHistory(RunnableBindingBase):
         input_messages = self._get_input_messages(inputs)
         # If historic messages were prepended to the input messages, remove them to
         # avoid adding duplicate messages to history.
+        state: Optional[_HistoryState] = config["configurable"].get(_STATE_KEY)
         if not self.history_messages_key:
-            historic_messages = config["configurable"]["message_history"].messages
-            input_messages = input_messages[len(historic_messages) :]
+            if state is not None and state.history_length is not None:
+                history_length = state.history_length
+            else:
+                history_length = len(hist.messages)
+            input_messages = input_messages[history_length:]
 
         # Get the output messages
         output_val = load(run.outputs)
         output_messages = self._get_output_messages(output_val)
-        hist.add_messages(input_messages + output_messages)
+        if self.write_behind and state is not None:
+            _history_writer.submit(
+                state.session_key, hist, input_messages + output_messages
+            )
+        else:
+            hist.add_messages(input_messages + output_messages)
 
     async def _aexit_history(self, run: Run, config: RunnableConfig) -> None:
         hist: BaseChatMessageHistory = config["configurable"]["message_history"]
@@ -530,14 +735,23 @@ class RunnableWithMessageHistory(RunnableBindingBase):
         input_messages = self._get_input_messages(inputs)
         # If historic messages were prepended to the input messages, remove them to
         # avoid adding duplicate messages to history.
+        state: Optional[_HistoryState] = config["configurable"].get(_STATE_KEY)
         if not self.history_messages_key:
-            historic_messages = await hist.aget_messages()
-            input_messages = input_messages[len(historic_messages) :]
+            if state is not None and state.history_length is not None:
+                history_length = state.history_length
+            else:
+                history_length = len(await hist.aget_messages())
+            input_messages = input_messages[history_length:]
 
         # Get the output messages
         output_val = load(run.outputs)
         output_messages = self._get_output_messages(output_val)
-        await hist.aadd_messages(input_messages + output_messages)
+        if self.write_behind and state is not None:
+            _history_writer.submit(
+                state.session_key, hist, input_messages + output_messages
+            )
+        else:
+            await hist.aadd_messages(input_messages + output_messages)
 
     def _merge_configs(self, *configs: Optional[RunnableConfig]) -> RunnableConfig:
         config = super()._merge_configs(*configs)
@@ -583,9 +797,29 @@ class RunnableWithMessageHistory(RunnableBindingBase):
                 **{key: configurable[key] for key in expected_keys}
             )
         config["configurable"]["message_history"] = message_history
+        config["configurable"][_STATE_KEY] = _HistoryState(
+            _session_key(self.get_session_history, configurable, expected_keys)
+        )
         return config
 
 
+def _session_key(
+    get_session_history: GetSessionHistoryCallable,
+    configurable: Dict[str, Any],
+    keys: List[str],
+) -> Hashable:
+    """Identify the session of a call, for ordering the writes of write-behind."""
+    values = []
+    for key in keys:
+        value = configurable.get(key)
+        try:
+            hash(value)
+        except TypeError:
+            value = repr(value)
+        values.append(value)
+    return (get_session_history, tuple(values))
+
+
 def _get_parameter_names(callable_: GetSessionHistoryCallable) -> List[str]:
     """Get the parameter names of the callable."""
     sig = inspect.signature(callable_)
@@ -3,7 +3,9 @@
 from __future__ import annotations
 
 import logging
+import os
 import sys
+import time
 import traceback
 from abc import ABC, abstractmethod
 from datetime import datetime, timezone
@@ -43,6 +45,39 @@ logger = logging.getLogger(__name__)
 
 SCHEMA_FORMAT_TYPE = Literal["original", "streaming_events"]
 
+TOKEN_EVENTS_TYPE = Literal["all", "none", "first", "coalesce"]
+
+
+class _TokenEventState:
+    """The token events of an LLM run that is streaming."""
+
+    __slots__ = (
+        "count",
+        "dropped",
+        "events",
+        "first_time",
+        "span",
+        "span_parts",
+        "span_started",
+    )
+
+    def __init__(self) -> None:
+        self.count = 0
+        self.dropped = 0
+        self.events = 0
+        self.first_time: Optional[datetime] = None
+        # the open coalesced event, its token pieces and its monotonic start
+        self.span: Optional[Dict[str, Any]] = None
+        self.span_parts: List[str] = []
+        self.span_started = 0.0
+
+    def close_span(self) -> None:
+        if self.span is not None:
+            self.span["kwargs"]["token"] = "".join(self.span_parts)
+            self.span["kwargs"]["count"] = len(self.span_parts)
+            self.span = None
+            self.span_parts = []
+
 
 class _TracerCore(ABC):
     """
@@ -59,6 +94,10 @@ class _TracerCore(ABC):
         _schema_format: Literal[
             "original", "streaming_events", "original+chat"
         ] = "original",
+        token_events: Optional[TOKEN_EVENTS_TYPE] = None,
+        token_event_interval_ms: Optional[float] = None,
+        token_event_chunks: bool = True,
+        max_run_events: Optional[int] = None,
         **kwargs: Any,
     ) -> None:
         """Initialize the tracer.
@@ -76,11 +115,48 @@ class _TracerCore(ABC):
                   for streaming events.
                 - 'original+chat' is a format that is the same as 'original'
                   except it does NOT raise an attribute error on_chat_model_start
+            token_events: How streamed tokens are recorded in the events of LLM
+                runs. Defaults to the LANGCHAIN_TRACING_TOKEN_EVENTS environment
+                variable, or "all".
+
+                - 'all' records an event for every token.
+                - 'none' records no token events.
+                - 'first' records the first token, and a `token_summary` event
+                  with the number of tokens when the run ends.
+                - 'coalesce' records one event for the tokens of each
+                  `token_event_interval_ms` milliseconds, and a summary.
+            token_event_interval_ms: The length of a coalesced token event.
+                Defaults to the LANGCHAIN_TRACING_TOKEN_EVENT_INTERVAL_MS
+                environment variable, or 100.
+            token_event_chunks: Whether token events keep the streamed chunks.
+                Events hold references to the chunks, not copies, but keep the
+                chunks alive and are serialized with the run. False leaves the
+                chunks out of the events, so runs neither hold nor serialize
+                them. Coalesced events keep them in a list under `chunks`.
+                Defaults to True.
+            max_run_events: The maximum number of token events to record per
+                run. Further tokens are only counted in the summary. Defaults to
+                None, which means no limit.
             kwargs: Additional keyword arguments that will be passed to
                 the superclass.
         """
         super().__init__(**kwargs)
         self._schema_format = _schema_format  # For internal use only API will change.
+        self.token_events = token_events or cast(
+            TOKEN_EVENTS_TYPE, os.environ.get("LANGCHAIN_TRACING_TOKEN_EVENTS", "all")
+        )
+        if self.token_events not in ("all", "none", "first", "coalesce"):
+            raise ValueError(f"Invalid token_events: {self.token_events}")
+        self.token_event_interval_ms = (
+            token_event_interval_ms
+            if token_event_interval_ms is not None
+            else float(
+                os.environ.get("LANGCHAIN_TRACING_TOKEN_EVENT_INTERVAL_MS", 100)
+            )
+        )
+        self.token_event_chunks = token_event_chunks
+        self.max_run_events = max_run_events
+        self._token_event_states: Dict[UUID, _TokenEventState] = {}
         self.run_map: Dict[str, Run] = {}
         """Map of run ID to run. Cleared on run end."""
         self.order_map: Dict[UUID, Tuple[UUID, str]] = {}
@@ -239,17 +315,74 @@ class _TracerCore(ABC):
         Append token event to LLM run and return the run.
         """
         llm_run = self._get_run(run_id, run_type={"llm", "chat_model"})
-        event_kwargs: Dict[str, Any] = {"token": token}
-        if chunk:
-            event_kwargs["chunk"] = chunk
+        if self.token_events == "all" and self.max_run_events is None:
+            event_kwargs: Dict[str, Any] = {"token": token}
+            if chunk and self.token_event_chunks:
+                event_kwargs["chunk"] = chunk
+            llm_run.events.append(
+                {
+                    "name": "new_token",
+                    "time": datetime.now(timezone.utc),
+                    "kwargs": event_kwargs,
+                },
+            )
+            return llm_run
+        if self.token_events == "none":
+            return llm_run
+        state = self._token_event_states.get(run_id)
+        if state is None:
+            state = self._token_event_states[run_id] = _TokenEventState()
+        state.count += 1
+        if self.token_events == "first" and state.count > 1:
+            return llm_run
+        if state.span is not None:
+            elapsed_ms = (time.monotonic() - state.span_started) * 1000
+            if elapsed_ms < self.token_event_interval_ms:
+                state.span_parts.append(token)
+                if chunk and self.token_event_chunks:
+                    state.span["kwargs"]["chunks"].append(chunk)
+                return llm_run
+            state.close_span()
+        if self.max_run_events is not None and state.events >= self.max_run_events:
+            state.dropped += 1
+            return llm_run
+        state.events += 1
+        now = datetime.now(timezone.utc)
+        if state.first_time is None:
+            state.first_time = now
+        event_kwargs = {"token": token}
+        if self.token_events == "coalesce":
+            state.span = {"name": "new_token", "time": now, "kwargs": event_kwargs}
+            state.span_parts = [token]
+            state.span_started = time.monotonic()
+            if self.token_event_chunks:
+                event_kwargs["chunks"] = [chunk] if chunk else []
+            llm_run.events.append(state.span)
+        else:
+            if chunk and self.token_event_chunks:
+                event_kwargs["chunk"] = chunk
+            llm_run.events.append(
+                {"name": "new_token", "time": now, "kwargs": event_kwargs}
+            )
+        return llm_run
+
+    def _end_token_events(self, llm_run: Run) -> None:
+        """Close the coalesced token event of a run and add the summary."""
+        state = self._token_event_states.pop(llm_run.id, None)
+        if state is None:
+            return
+        state.close_span()
         llm_run.events.append(
             {
-                "name": "new_token",
-                "time": datetime.now(timezone.utc),
-                "kwargs": event_kwargs,
-            },
+                "name": "token_summary",
+                "time": llm_run.end_time,
+                "kwargs": {
+                    "count": state.count,
+                    "dropped": state.dropped,
+                    "first_token_time": state.first_time,
+                },
+            }
         )
-        return llm_run
 
     def _llm_run_with_retry_event(
         self,
@@ -292,6 +425,7 @@ class _TracerCore(ABC):
                         cast(ChatGeneration, generation).message
                     )
         llm_run.end_time = datetime.now(timezone.utc)
+        self._end_token_events(llm_run)
         llm_run.events.append({"name": "end", "time": llm_run.end_time})
 
         return llm_run
@@ -300,6 +434,7 @@ class _TracerCore(ABC):
         llm_run = self._get_run(run_id, run_type={"llm", "chat_model"})
         llm_run.error = self._get_stacktrace(error)
         llm_run.end_time = datetime.now(timezone.utc)
+        self._end_token_events(llm_run)
         llm_run.events.append({"name": "error", "time": llm_run.end_time})
 
         return llm_run
@@ -45,11 +45,20 @@ def log_error_once(method: str, exception: Exception) -> None:
     logger.error(exception)
 
 
-def wait_for_all_tracers() -> None:
-    """Wait for all tracers to finish."""
+def wait_for_all_tracers(timeout: Optional[float] = None) -> bool:
+    """Wait for all tracers to finish.
+
+    Args:
+        timeout: The maximum number of seconds to wait. Defaults to None, which
+            waits until everything is sent.
+
+    Returns:
+        Whether everything was sent within the timeout.
+    """
     global _CLIENT
     if _CLIENT is not None and _CLIENT.tracing_queue is not None:
-        _CLIENT.tracing_queue.join()
+        return _CLIENT.flush(timeout)
+    return True
 
 
 def get_client() -> Client:
@@ -2,7 +2,7 @@ from __future__ import annotations
 
 import json
 import re
-from typing import Any, Callable, List
+from typing import Any, Callable, Dict, List, Optional, Tuple, cast
 
 from langchain_core.exceptions import OutputParserException
 
@@ -190,3 +190,536 @@ def parse_and_check_json_markdown(text: str, expected_keys: List[str]) -> dict:
                 f"to be present, but got {json_obj}"
             )
     return json_obj
+
+
+_WHITESPACE = frozenset(" \t\n\r")
+_NUMBER_CHARS = frozenset("+-0123456789.eE")
+_NUMBER_START_CHARS = frozenset("-0123456789")
+_LITERALS = {
+    "true": True,
+    "false": False,
+    "null": None,
+    "NaN": float("nan"),
+    "Infinity": float("inf"),
+}
+_LITERAL_START_CHARS = frozenset(literal[0] for literal in _LITERALS)
+_SIMPLE_ESCAPES = {
+    '"': '"',
+    "\\": "\\",
+    "/": "/",
+    "b": "\b",
+    "f": "\f",
+    "n": "\n",
+    "r": "\r",
+    "t": "\t",
+}
+_HEX_CHARS = frozenset("0123456789abcdefABCDEF")
+_string_special_re = re.compile(r'["\\]')
+
+# parser states
+_VALUE = 0  # expecting a value
+_FIRST_VALUE = 1  # expecting a value or "]" right after "["
+_KEY = 2  # expecting a key
+_FIRST_KEY = 3  # expecting a key or "}" right after "{"
+_KEY_STRING = 4  # inside a key
+_COLON = 5  # expecting ":"
+_AFTER_VALUE = 6  # expecting "," or a closing bracket
+_STRING = 7  # inside a string value
+_NUMBER = 8  # inside a number
+_LITERAL = 9  # inside true, false, null, NaN or Infinity
+_DONE = 10  # the top-level value is complete
+
+
+def _escape_pointer(key: Any) -> str:
+    return str(key).replace("~", "~0").replace("/", "~1")
+
+
+def _same(prev: Any, value: Any) -> bool:
+    return prev is value or (type(prev) is type(value) and prev == value)
+
+
+def _last_slot(container: Any, length: int) -> Any:
+    """The key or index of the last of the first `length` entries."""
+    if isinstance(container, dict):
+        # entries are only added at the end, so count back from there
+        keys = reversed(container)
+        for _ in range(len(container) - length):
+            next(keys)
+        return next(keys)
+    return length - 1
+
+
+def _slots_after(container: Any, length: int) -> List[Any]:
+    """The keys or indexes of the entries after the first `length`."""
+    if isinstance(container, dict):
+        keys = reversed(container)
+        return [next(keys) for _ in range(len(container) - length)][::-1]
+    return list(range(length, len(container)))
+
+
+class _Frame:
+    """An open object or array."""
+
+    __slots__ = ("container", "slot", "key")
+
+    def __init__(self, container: Any, slot: Any) -> None:
+        self.container = container
+        # the key or index of the container within its parent
+        self.slot = slot
+        # the key of the value being parsed, for objects
+        self.key: Optional[str] = None
+
+
+class IncrementalJsonParser:
+    """Parse a JSON document that arrives in chunks.
+
+    Unlike `parse_partial_json`, which re-parses the whole text it is given, this
+    parser keeps its state between calls to `feed` and only looks at the new
+    text, so parsing a streamed document of n characters is O(n) overall.
+
+    Open strings and numbers are included in `snapshot` as far as they have been
+    received, and incomplete keys and literals are left out, matching the
+    partial results of `parse_partial_json`. A number or literal the document
+    ends with is only complete once `finish` is called. A leading markdown code
+    fence (```json) is skipped and anything after the top-level value is ignored.
+
+    Snapshots share the values that are complete with earlier snapshots, but
+    the objects and arrays that are still open are copied, so taking a snapshot
+    after every chunk costs time in the size of the open values. `patch` returns
+    just the changes since its previous call instead, as JSONPatch operations,
+    and only looks at what changed. Callers must not mutate a snapshot or the
+    values of a patch.
+
+    Example:
+
+        .. code-block:: python
+
+            parser = IncrementalJsonParser()
+            for chunk in ['{"name": "Al', 'ice", "tags": ["a"', ', "b"]}']:
+                if parser.feed(chunk):
+                    print(parser.snapshot())
+            # {'name': 'Al'}
+            # {'name': 'Alice', 'tags': ['a']}
+            # {'name': 'Alice', 'tags': ['a', 'b']}
+    """
+
+    def __init__(self) -> None:
+        self._state = _VALUE
+        self._stack: List[_Frame] = []
+        self._root: Any = None
+        self._preamble: Optional[str] = ""
+        self._position = 0
+        # the string, number or literal being parsed
+        self._parts: List[str] = []
+        self._escape: Optional[str] = None
+        self._partial_number: Any = None
+        # the state of the previous patch: the value if nothing was open, the
+        # open frames as (container, length, key of a partial value), and the
+        # partial value
+        self._patched_value: Any = None
+        self._patched_frames: List[Tuple[Any, int, Optional[str]]] = []
+        self._patched_partial: Tuple[bool, Any] = (False, None)
+
+    @property
+    def done(self) -> bool:
+        """Whether the top-level value is complete."""
+        return self._state == _DONE
+
+    def feed(self, text: str) -> bool:
+        """Consume the next chunk of the document.
+
+        Args:
+            text: The next chunk.
+
+        Returns:
+            Whether the value returned by `snapshot` changed.
+
+        Raises:
+            json.JSONDecodeError: If the document is not valid JSON (or not JSON
+                this parser handles, such as text before the code fence).
+        """
+        if self._preamble is not None:
+            text = self._skip_preamble(text)
+            if not text:
+                return False
+        changed = False
+        i = 0
+        n = len(text)
+        while i < n:
+            state = self._state
+            if state == _STRING or state == _KEY_STRING:
+                i, grew = self._consume_string(text, i)
+                changed = changed or grew
+                continue
+            ch = text[i]
+            if state == _NUMBER:
+                if ch in _NUMBER_CHARS:
+                    j = i + 1
+                    while j < n and text[j] in _NUMBER_CHARS:
+                        j += 1
+                    self._parts.append(text[i:j])
+                    i = j
+                    changed = self._update_partial_number() or changed
+                    continue
+                self._complete(self._parse_number("".join(self._parts), i))
+                continue
+            if state == _LITERAL:
+                if ch.isalpha():
+                    j = i + 1
+                    while j < n and text[j].isalpha():
+                        j += 1
+                    self._parts.append(text[i:j])
+                    i = j
+                    continue
+                literal = "".join(self._parts)
+                if literal not in _LITERALS:
+                    raise self._error(f"Unknown literal {literal!r}", i)
+                self._complete(_LITERALS[literal])
+                changed = True
+                continue
+            i += 1
+            if ch in _WHITESPACE or state == _DONE:
+                continue
+            if state == _VALUE or state == _FIRST_VALUE:
+                if ch == "]" and state == _FIRST_VALUE:
+                    self._close(list, i)
+                else:
+                    changed = self._start_value(ch, i) or changed
+            elif state == _KEY or state == _FIRST_KEY:
+                if ch == '"':
+                    self._parts = []
+                    self._state = _KEY_STRING
+                elif ch == "}" and state == _FIRST_KEY:
+                    self._close(dict, i)
+                else:
+                    raise self._error("Expecting property name", i)
+            elif state == _COLON:
+                if ch != ":":
+                    raise self._error("Expecting ':' delimiter", i)
+                self._state = _VALUE
+            elif state == _AFTER_VALUE:
+                container = self._stack[-1].container
+                if ch == ",":
+                    self._state = _KEY if isinstance(container, dict) else _VALUE
+                elif ch == "}":
+                    self._close(dict, i)
+                elif ch == "]":
+                    self._close(list, i)
+                else:
+                    raise self._error("Expecting ',' delimiter", i)
+        self._position += n
+        return changed
+
+    def finish(self) -> bool:
+        """Complete the number or literal the document ends with, if any.
+
+        Call this once the last chunk was fed. An incomplete or unknown literal
+        is left out.
+
+        Returns:
+            Whether the value returned by `snapshot` changed.
+        """
+        if self._state == _NUMBER:
+            text = "".join(self._parts)
+            try:
+                value = json.loads(text)
+            except json.JSONDecodeError:
+                return False
+            changed = value != self._partial_number or (
+                type(value) is not type(self._partial_number)
+            )
+            self._complete(value)
+            return changed
+        if self._state == _LITERAL:
+            literal = "".join(self._parts)
+            if literal not in _LITERALS:
+                return False
+            self._complete(_LITERALS[literal])
+            return True
+        return False
+
+    def snapshot(self) -> Any:
+        """Return the value parsed so far.
+
+        Returns:
+            The partial value, or None if nothing has been parsed yet.
+        """
+        if not self._stack:
+            has_partial, partial = self._partial_value()
+            return partial if has_partial else self._root
+        return self._copy_open(0)
+
+    def patch(self) -> List[Dict[str, Any]]:
+        """Return JSONPatch operations from the previous patch to the current value.
+
+        The first call patches from None. Only the last entry of every object or
+        array that was open at the previous call, and the entries added since,
+        are looked at, so the patches of a stream cost time in the size of the
+        changes rather than of the document.
+
+        Returns:
+            The operations, empty if nothing changed.
+        """
+        ops: List[Dict[str, Any]] = []
+        if self._patched_frames:
+            self._patch_frame(0, "", ops)
+        else:
+            value = self.snapshot()
+            if value is not None and not _same(self._patched_value, value):
+                ops.append({"op": "replace", "path": "", "value": value})
+        if not self._stack:
+            self._patched_value = self.snapshot()
+        self._patched_frames = [
+            (frame.container, len(frame.container), frame.key)
+            for frame in self._stack
+        ]
+        self._patched_partial = self._partial_value()
+        return ops
+
+    def _patch_frame(self, depth: int, path: str, ops: List[Dict[str, Any]]) -> None:
+        """Add the operations for an object or array open at the previous patch."""
+        container, length, key = self._patched_frames[depth]
+        is_dict = isinstance(container, dict)
+        is_open = depth < len(self._stack) and self._stack[depth].container is container
+        emitted = length
+        if depth + 1 < len(self._patched_frames):
+            # the last entry was open too
+            slot = _last_slot(container, length)
+            self._patch_frame(depth + 1, f"{path}/{_escape_pointer(slot)}", ops)
+        elif self._patched_partial[0]:
+            # the last entry was a partial string or number
+            slot = key if is_dict else length
+            emitted += 1
+            if len(container) > length:
+                value = container[slot]
+            else:
+                value = self._partial_value()[1]
+            if not _same(self._patched_partial[1], value):
+                ops.append(
+                    {
+                        "op": "replace",
+                        "path": f"{path}/{_escape_pointer(slot)}",
+                        "value": value,
+                    }
+                )
+        for slot in _slots_after(container, emitted):
+            value = container[slot]
+            if (
+                is_open
+                and depth + 1 < len(self._stack)
+                and value is self._stack[depth + 1].container
+            ):
+                value = self._copy_open(depth + 1)
+            ops.append(
+                {"op": "add", "path": f"{path}/{_escape_pointer(slot)}", "value": value}
+            )
+        if is_open and depth == len(self._stack) - 1:
+            has_partial, partial = self._partial_value()
+            if has_partial and len(container) + 1 > emitted:
+                slot = self._stack[depth].key if is_dict else len(container)
+                ops.append(
+                    {
+                        "op": "add",
+                        "path": f"{path}/{_escape_pointer(slot)}",
+                        "value": partial,
+                    }
+                )
+
+    def _copy_open(self, start: int) -> Any:
+        """Copy the open objects and arrays from `start` down, with the partial
+        value."""
+        has_partial, partial = self._partial_value()
+        copy: Any = None
+        for depth in range(len(self._stack) - 1, start - 1, -1):
+            frame = self._stack[depth]
+            container = frame.container
+            if isinstance(container, dict):
+                frame_copy: Any = dict(container)
+                if copy is None and has_partial:
+                    frame_copy[frame.key] = partial
+            else:
+                frame_copy = list(container)
+                if copy is None and has_partial:
+                    frame_copy.append(partial)
+            if copy is not None:
+                frame_copy[self._stack[depth + 1].slot] = copy
+            copy = frame_copy
+        return copy
+
+    def _skip_preamble(self, text: str) -> str:
+        preamble = (self._preamble or "") + text
+        stripped = preamble.lstrip(" \n\r\t`")
+        if len(stripped) < len(preamble) and "`" in preamble[: -len(stripped) or None]:
+            if "json".startswith(stripped):
+                self._preamble = preamble
+                return ""
+            if stripped.startswith("json"):
+                stripped = stripped[4:]
+        stripped = stripped.lstrip()
+        if not stripped:
+            self._preamble = preamble
+            return ""
+        if stripped[0] not in '{["' and (
+            stripped[0] not in _NUMBER_START_CHARS | _LITERAL_START_CHARS
+        ):
+            raise json.JSONDecodeError("Expecting value", preamble, 0)
+        self._preamble = None
+        return stripped
+
+    def _error(self, msg: str, index: int) -> json.JSONDecodeError:
+        return json.JSONDecodeError(msg, "", self._position + index)
+
+    def _start_value(self, ch: str, index: int) -> bool:
+        """Start parsing a value and return whether it is visible yet."""
+        if ch == "{":
+            self._open({}, _FIRST_KEY)
+        elif ch == "[":
+            self._open([], _FIRST_VALUE)
+        elif ch == '"':
+            self._parts = []
+            self._state = _STRING
+        elif ch in _NUMBER_START_CHARS:
+            self._parts = [ch]
+            self._partial_number = None
+            self._state = _NUMBER
+            return self._update_partial_number()
+        elif ch in _LITERAL_START_CHARS:
+            self._parts = [ch]
+            self._state = _LITERAL
+            return False
+        else:
+            raise self._error("Expecting value", index)
+        return True
+
+    def _attach(self, value: Any) -> Any:
+        """Add a value to the open container and return its slot."""
+        if not self._stack:
+            self._root = value
+            return None
+        frame = self._stack[-1]
+        if isinstance(frame.container, dict):
+            frame.container[frame.key] = value
+            return frame.key
+        frame.container.append(value)
+        return len(frame.container) - 1
+
+    def _open(self, container: Any, state: int) -> None:
+        self._stack.append(_Frame(container, self._attach(container)))
+        self._state = state
+
+    def _close(self, container_type: type, index: int) -> None:
+        if not isinstance(self._stack[-1].container, container_type):
+            raise self._error("Mismatched closing bracket", index)
+        self._stack.pop()
+        self._state = _AFTER_VALUE if self._stack else _DONE
+
+    def _complete(self, value: Any) -> None:
+        self._attach(value)
+        self._parts = []
+        self._state = _AFTER_VALUE if self._stack else _DONE
+
+    def _consume_string(self, text: str, i: int) -> Tuple[int, bool]:
+        parts = self._parts
+        n = len(text)
+        grew = False
+        is_value = self._state == _STRING
+        while i < n:
+            if self._escape is not None:
+                decoded, consumed = self._consume_escape(text[i])
+                if consumed:
+                    i += 1
+                if decoded:
+                    parts.append(decoded)
+                    grew = True
+                continue
+            match = _string_special_re.search(text, i)
+            end = match.start() if match else n
+            if end > i:
+                parts.append(text[i:end])
+                grew = True
+            if match is None:
+                i = n
+            elif text[end] == "\\":
+                self._escape = "\\"
+                i = end + 1
+            else:
+                value = "".join(parts)
+                if self._state == _KEY_STRING:
+                    self._stack[-1].key = value
+                    self._parts = []
+                    self._state = _COLON
+                else:
+                    self._complete(value)
+                return end + 1, grew and is_value
+        return i, grew and is_value
+
+    def _consume_escape(self, ch: str) -> Tuple[str, bool]:
+        """Add a character to the escape sequence being parsed.
+
+        Returns:
+            The decoded text, if the sequence is complete, and whether the
+            character was consumed.
+        """
+        escape = cast(str, self._escape)
+        length = len(escape)
+        if length == 1:
+            if ch in _SIMPLE_ESCAPES:
+                self._escape = None
+                return _SIMPLE_ESCAPES[ch], True
+            if ch != "u":
+                raise self._error("Invalid \\escape", 0)
+        elif length == 6:
+            # a high surrogate, which may be followed by a low surrogate
+            if ch != "\\":
+                self._escape = None
+                return chr(int(escape[2:6], 16)), False
+        elif length == 7:
+            if ch != "u":
+                # the backslash starts a new escape sequence
+                self._escape = "\\"
+                return chr(int(escape[2:6], 16)), False
+        elif ch not in _HEX_CHARS:
+            raise self._error("Invalid \\uXXXX escape", 0)
+        escape += ch
+        if len(escape) == 6:
+            code = int(escape[2:], 16)
+            if not 0xD800 <= code <= 0xDBFF:
+                self._escape = None
+                return chr(code), True
+        elif len(escape) == 12:
+            self._escape = None
+            return json.loads(f'"{escape}"'), True
+        self._escape = escape
+        return "", True
+
+    def _parse_number(self, text: str, index: int) -> Any:
+        try:
+            return json.loads(text)
+        except json.JSONDecodeError:
+            raise self._error(f"Invalid number {text!r}", index)
+
+    def _update_partial_number(self) -> bool:
+        """Update the value of the number being parsed, as far as it is valid."""
+        text = "".join(self._parts)
+        self._parts = [text]
+        value = None
+        while text:
+            try:
+                value = json.loads(text)
+                break
+            except json.JSONDecodeError:
+                text = text[:-1]
+        changed = value != self._partial_number or (
+            value is not None and type(value) is not type(self._partial_number)
+        )
+        self._partial_number = value
+        return changed
+
+    def _partial_value(self) -> Tuple[bool, Any]:
+        if self._state == _STRING:
+            if len(self._parts) > 1:
+                self._parts[:] = ["".join(self._parts)]
+            return True, self._parts[0] if self._parts else ""
+        if self._state == _NUMBER and self._partial_number is not None:
+            return True, self._partial_number
+        return False, None
@@ -1,9 +1,11 @@
 from langchain_core.vectorstores.base import VST, VectorStore, VectorStoreRetriever
 from langchain_core.vectorstores.in_memory import InMemoryVectorStore
+from langchain_core.vectorstores.ivf import IVFIndex
 
 __all__ = [
     "VectorStore",
     "VST",
     "VectorStoreRetriever",
     "InMemoryVectorStore",
+    "IVFIndex",
 ]
@@ -25,6 +25,7 @@ import logging
 import math
 import warnings
 from abc import ABC, abstractmethod
+from functools import partial
 from itertools import cycle
 from typing import (
     TYPE_CHECKING,
@@ -43,9 +44,10 @@ from typing import (
 )
 
 from langchain_core.embeddings import Embeddings
-from langchain_core.pydantic_v1 import Field, root_validator
+from langchain_core.pydantic_v1 import Field, PrivateAttr, root_validator
 from langchain_core.retrievers import BaseRetriever, LangSmithRetrieverParams
 from langchain_core.runnables.config import run_in_executor
+from langchain_core.vectorstores.batching import AsyncQueryBatcher, QueryBatcher
 
 if TYPE_CHECKING:
     from langchain_core.callbacks.manager import (
@@ -678,6 +680,70 @@ class VectorStore(ABC):
             None, self.similarity_search_by_vector, embedding, k=k, **kwargs
         )
 
+    def similarity_search_by_vectors(
+        self, embeddings: List[List[float]], k: int = 4, **kwargs: Any
+    ) -> List[List[Document]]:
+        """Return docs most similar to each of several embedding vectors.
+
+        Vector stores that can search several vectors at once should override
+        this. By default the vectors are searched one after another.
+
+        Args:
+            embeddings: Embeddings to look up documents similar to.
+            k: Number of Documents to return per embedding. Defaults to 4.
+            **kwargs: Arguments to pass to the search method.
+
+        Returns:
+            A list of Documents most similar to each query vector.
+        """
+        return [
+            self.similarity_search_by_vector(embedding, k=k, **kwargs)
+            for embedding in embeddings
+        ]
+
+    def similarity_search_batch(
+        self, queries: List[str], k: int = 4, **kwargs: Any
+    ) -> List[List[Document]]:
+        """Return docs most similar to each of several queries.
+
+        The queries are embedded together with `Embeddings.embed_queries` and
+        searched with `similarity_search_by_vectors`.
+
+        Args:
+            queries: Input texts.
+            k: Number of Documents to return per query. Defaults to 4.
+            **kwargs: Arguments to pass to the search method.
+
+        Returns:
+            A list of Documents most similar to each query.
+        """
+        if self.embeddings is None:
+            return [self.similarity_search(query, k=k, **kwargs) for query in queries]
+        embeddings = self.embeddings.embed_queries(queries)
+        return self.similarity_search_by_vectors(embeddings, k=k, **kwargs)
+
+    async def asimilarity_search_batch(
+        self, queries: List[str], k: int = 4, **kwargs: Any
+    ) -> List[List[Document]]:
+        """Async return docs most similar to each of several queries.
+
+        Args:
+            queries: Input texts.
+            k: Number of Documents to return per query. Defaults to 4.
+            **kwargs: Arguments to pass to the search method.
+
+        Returns:
+            A list of Documents most similar to each query.
+        """
+        if self.embeddings is None:
+            return await run_in_executor(
+                None, self.similarity_search_batch, queries, k=k, **kwargs
+            )
+        embeddings = await self.embeddings.aembed_queries(queries)
+        return await run_in_executor(
+            None, self.similarity_search_by_vectors, embeddings, k=k, **kwargs
+        )
+
     def max_marginal_relevance_search(
         self,
         query: str,
@@ -978,6 +1044,17 @@ class VectorStoreRetriever(BaseRetriever):
     """Type of search to perform. Defaults to "similarity"."""
     search_kwargs: dict = Field(default_factory=dict)
     """Keyword arguments to pass to the search function."""
+    max_batch_size: int = 1
+    """The most concurrent similarity searches to batch together. Queries that
+    arrive within `max_batch_wait` of each other are embedded with one
+    `embed_queries` call and searched with one `similarity_search_batch` call.
+    Defaults to 1, which searches every query on its own."""
+    max_batch_wait: float = 0.005
+    """The seconds to wait for a batch of queries to fill up."""
+    _batcher: Optional[QueryBatcher[str, List[Document]]] = PrivateAttr(default=None)
+    _abatcher: Optional[AsyncQueryBatcher[str, List[Document]]] = PrivateAttr(
+        default=None
+    )
     allowed_search_types: ClassVar[Collection[str]] = (
         "similarity",
         "similarity_score_threshold",
@@ -1038,7 +1115,18 @@ class VectorStoreRetriever(BaseRetriever):
     def _get_relevant_documents(
         self, query: str, *, run_manager: CallbackManagerForRetrieverRun
     ) -> List[Document]:
-        if self.search_type == "similarity":
+        if self.search_type == "similarity" and self.max_batch_size > 1:
+            if self._batcher is None:
+                self._batcher = QueryBatcher(
+                    partial(
+                        self.vectorstore.similarity_search_batch,
+                        **self.search_kwargs,
+                    ),
+                    max_batch_size=self.max_batch_size,
+                    max_wait=self.max_batch_wait,
+                )
+            docs = self._batcher(query)
+        elif self.search_type == "similarity":
             docs = self.vectorstore.similarity_search(query, **self.search_kwargs)
         elif self.search_type == "similarity_score_threshold":
             docs_and_similarities = (
@@ -1058,7 +1146,18 @@ class VectorStoreRetriever(BaseRetriever):
     async def _aget_relevant_documents(
         self, query: str, *, run_manager: AsyncCallbackManagerForRetrieverRun
     ) -> List[Document]:
-        if self.search_type == "similarity":
+        if self.search_type == "similarity" and self.max_batch_size > 1:
+            if self._abatcher is None:
+                self._abatcher = AsyncQueryBatcher(
+                    partial(
+                        self.vectorstore.asimilarity_search_batch,
+                        **self.search_kwargs,
+                    ),
+                    max_batch_size=self.max_batch_size,
+                    max_wait=self.max_batch_wait,
+                )
+            docs = await self._abatcher(query)
+        elif self.search_type == "similarity":
             docs = await self.vectorstore.asimilarity_search(
                 query, **self.search_kwargs
             )
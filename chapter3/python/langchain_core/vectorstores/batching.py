@@ -0,0 +1,197 @@
+"""Micro-batching of the queries of concurrent vector store searches.
+
+The batchers are not specific to vector stores: any lookup that is cheaper for
+many queries at once than for each query on its own can be batched.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import threading
+import time
+from concurrent.futures import Future
+from typing import (
+    Any,
+    Awaitable,
+    Callable,
+    Dict,
+    Generic,
+    List,
+    Optional,
+    Tuple,
+    TypeVar,
+)
+
+Q = TypeVar("Q")
+T = TypeVar("T")
+
+
+class QueryBatcher(Generic[Q, T]):
+    """Collect queries from concurrent threads and search them together.
+
+    The first caller to arrive waits up to `max_wait` seconds for others, or
+    until `max_batch_size` queries are pending, then runs one `search` for the
+    whole batch and hands each caller its result. Callers that arrive while a
+    batch is being searched form the next batch.
+    """
+
+    def __init__(
+        self,
+        search: Callable[[List[Q]], List[T]],
+        *,
+        max_batch_size: int = 32,
+        max_wait: float = 0.005,
+    ) -> None:
+        """Create a batcher.
+
+        Args:
+            search: Searches a batch of queries, returning a result per query.
+            max_batch_size: The most queries to search at once.
+            max_wait: The seconds to wait for a batch to fill up.
+        """
+        self.search = search
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait
+        self._condition = threading.Condition()
+        self._pending: List[Tuple[Q, Future]] = []
+        # whether a caller is collecting or searching a batch
+        self._leader = False
+
+    def __call__(self, query: Q) -> T:
+        """Search a query as part of a batch."""
+        future: Future = Future()
+        with self._condition:
+            self._pending.append((query, future))
+            self._condition.notify_all()
+        while True:
+            with self._condition:
+                while self._leader and not future.done():
+                    self._condition.wait()
+                if future.done():
+                    break
+                self._leader = True
+            try:
+                self._search_batch()
+            finally:
+                with self._condition:
+                    self._leader = False
+                    self._condition.notify_all()
+        return future.result()
+
+    def _search_batch(self) -> None:
+        """Wait for the next batch to fill up, then search it."""
+        deadline = time.monotonic() + self.max_wait
+        with self._condition:
+            while len(self._pending) < self.max_batch_size:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                self._condition.wait(remaining)
+            batch = self._pending[: self.max_batch_size]
+            del self._pending[: self.max_batch_size]
+        error: Optional[BaseException] = None
+        try:
+            results = _check_results(self.search([query for query, _ in batch]), batch)
+            for (_, future), result in zip(batch, results):
+                future.set_result(result)
+        except Exception as e:
+            error = e
+        finally:
+            # the callers of the batch wait for their futures, so none may be
+            # left unresolved, even when the search is interrupted
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(
+                        error or RuntimeError("The batch search was interrupted.")
+                    )
+
+
+class AsyncQueryBatcher(Generic[Q, T]):
+    """Collect queries from concurrent tasks and search them together.
+
+    The async counterpart of `QueryBatcher`, batching the queries of each event
+    loop separately.
+    """
+
+    def __init__(
+        self,
+        search: Callable[[List[Q]], Awaitable[List[T]]],
+        *,
+        max_batch_size: int = 32,
+        max_wait: float = 0.005,
+    ) -> None:
+        """Create a batcher.
+
+        Args:
+            search: Searches a batch of queries, returning a result per query.
+            max_batch_size: The most queries to search at once.
+            max_wait: The seconds to wait for a batch to fill up.
+        """
+        self.search = search
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait
+        self._states: Dict[asyncio.AbstractEventLoop, _LoopState] = {}
+
+    async def __call__(self, query: Q) -> T:
+        """Search a query as part of a batch."""
+        loop = asyncio.get_running_loop()
+        state = self._states.get(loop)
+        if state is None:
+            state = self._states[loop] = _LoopState()
+        future = loop.create_future()
+        state.pending.append((query, future))
+        if len(state.pending) >= self.max_batch_size:
+            state.full.set()
+        if state.task is None:
+            state.task = loop.create_task(self._drain(loop, state))
+        return await future
+
+    async def _drain(self, loop: asyncio.AbstractEventLoop, state: _LoopState) -> None:
+        """Search the pending queries in batches until there are none."""
+        try:
+            while state.pending:
+                if len(state.pending) < self.max_batch_size:
+                    try:
+                        await asyncio.wait_for(state.full.wait(), self.max_wait)
+                    except asyncio.TimeoutError:
+                        pass
+                batch = state.pending[: self.max_batch_size]
+                del state.pending[: self.max_batch_size]
+                state.full.clear()
+                try:
+                    results = _check_results(
+                        await self.search([query for query, _ in batch]), batch
+                    )
+                except Exception as e:
+                    for _, future in batch:
+                        if not future.done():
+                            future.set_exception(e)
+                else:
+                    for (_, future), result in zip(batch, results):
+                        if not future.done():
+                            future.set_result(result)
+                finally:
+                    for _, future in batch:
+                        future.cancel()
+        finally:
+            state.task = None
+            # only left over when draining was interrupted
+            for _, future in state.pending:
+                future.cancel()
+            state.pending.clear()
+            self._states.pop(loop, None)
+
+
+def _check_results(results: List[T], batch: List[Tuple[Any, Any]]) -> List[T]:
+    if len(results) != len(batch):
+        raise ValueError(
+            f"The search returned {len(results)} results for {len(batch)} queries."
+        )
+    return results
+
+
+class _LoopState:
+    def __init__(self) -> None:
+        self.pending: List[Tuple[Any, asyncio.Future]] = []
+        self.full = asyncio.Event()
+        self.task: Optional[asyncio.Task] = None
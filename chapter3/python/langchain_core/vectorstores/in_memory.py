@@ -8,6 +8,7 @@ from typing import (
     Any,
     Callable,
     Dict,
+    Iterable,
     Iterator,
     List,
     Optional,
@@ -20,6 +21,7 @@ from langchain_core.documents import Document
 from langchain_core.embeddings import Embeddings
 from langchain_core.load import dumpd, load
 from langchain_core.vectorstores import VectorStore
+from langchain_core.vectorstores.ivf import IVFIndex
 from langchain_core.vectorstores.utils import _cosine_similarity as cosine_similarity
 from langchain_core.vectorstores.utils import maximal_marginal_relevance
 
@@ -109,6 +111,24 @@ class InMemoryVectorStore(VectorStore):
 
             * [SIM=0.832268] foo [{'baz': 'bar'}]
 
+    Approximate search:
+        .. code-block:: python
+
+            from langchain_core.vectorstores.ivf import IVFIndex
+
+            vector_store = InMemoryVectorStore(
+                OpenAIEmbeddings(), index=IVFIndex(nprobe=8)
+            )
+            # more lists searched is slower, but finds more of the exact results
+            results = vector_store.similarity_search(query="thud", k=1, nprobe=16)
+
+            # int8 codes are scanned, then the best candidates are re-ranked
+            from langchain_core.vectorstores.quantization import ScalarQuantizer
+
+            vector_store = InMemoryVectorStore(
+                OpenAIEmbeddings(), index=IVFIndex(quantizer=ScalarQuantizer())
+            )
+
     Async:
         .. code-block:: python
 
@@ -145,16 +165,21 @@ class InMemoryVectorStore(VectorStore):
 
     """  # noqa: E501
 
-    def __init__(self, embedding: Embeddings) -> None:
+    def __init__(
+        self, embedding: Embeddings, *, index: Optional[IVFIndex] = None
+    ) -> None:
         """Initialize with the given embedding function.
 
         Args:
             embedding: embedding function to use.
+            index: An index for approximate search. Defaults to None, which
+                compares queries to every vector.
         """
         # TODO: would be nice to change to
         # Dict[str, Document] at some point (will be a breaking change)
         self.store: Dict[str, Dict[str, Any]] = {}
         self.embedding = embedding
+        self.index = index
 
     @property
     def embeddings(self) -> Embeddings:
@@ -164,6 +189,8 @@ class InMemoryVectorStore(VectorStore):
         if ids:
             for _id in ids:
                 self.store.pop(_id, None)
+            if self.index is not None:
+                self.index.delete(ids)
 
     async def adelete(self, ids: Optional[Sequence[str]] = None, **kwargs: Any) -> None:
         self.delete(ids)
@@ -200,6 +227,7 @@ class InMemoryVectorStore(VectorStore):
                 "text": doc.page_content,
                 "metadata": doc.metadata,
             }
+        self._index_vectors(ids_, vectors)
 
         return ids_
 
@@ -231,6 +259,7 @@ class InMemoryVectorStore(VectorStore):
                 "text": doc.page_content,
                 "metadata": doc.metadata,
             }
+        self._index_vectors(ids_, vectors)
 
         return ids_
 
@@ -278,6 +307,7 @@ class InMemoryVectorStore(VectorStore):
                 "text": item.page_content,
                 "metadata": item.metadata,
             }
+        self._index_vectors(ids, vectors)
         return {
             "succeeded": ids,
             "failed": [],
@@ -308,11 +338,23 @@ class InMemoryVectorStore(VectorStore):
                 "text": item.page_content,
                 "metadata": item.metadata,
             }
+        self._index_vectors(ids, vectors)
         return {
             "succeeded": ids,
             "failed": [],
         }
 
+    def _index_vectors(self, ids: List[str], vectors: List[List[float]]) -> None:
+        if self.index is not None:
+            self.index.add(ids, vectors)
+            self._drop_quantized_vectors(ids)
+
+    def _drop_quantized_vectors(self, ids: Iterable[str]) -> None:
+        # a quantizing index keeps the vectors far more compactly than lists
+        if self.index is not None and self.index.quantizer is not None:
+            for doc_id in ids:
+                self.store[doc_id].pop("vector", None)
+
     async def aget_by_ids(self, ids: Sequence[str], /) -> List[Document]:
         """Async get documents by their ids.
 
@@ -331,6 +373,8 @@ class InMemoryVectorStore(VectorStore):
         filter: Optional[Callable[[Document], bool]] = None,
         **kwargs: Any,
     ) -> List[Tuple[Document, float, List[float]]]:
+        if self.index is not None:
+            return self._search_index(embedding, k, filter, kwargs.get("nprobe"))
         result = []
         for doc in self.store.values():
             vector = doc["vector"]
@@ -349,6 +393,51 @@ class InMemoryVectorStore(VectorStore):
             result = [r for r in result if filter(r[0])]
         return result[:k]
 
+    def _search_index(
+        self,
+        embedding: List[float],
+        k: int,
+        filter: Optional[Callable[[Document], bool]],
+        nprobe: Optional[int],
+    ) -> List[Tuple[Document, float, List[float]]]:
+        assert self.index is not None
+        # with a filter, every probed candidate is ranked so k of them can pass it
+        hits = self.index.search([embedding], None if filter else k, nprobe=nprobe)
+        result = self._filter_hits(hits[0], k, filter)
+        if filter is not None and len(result) < k:
+            # the probed lists can hold fewer than k matches while others hold
+            # more, so rank every vector instead
+            hits = self.index.search([embedding], None, exact=True)
+            result = self._filter_hits(hits[0], k, filter)
+        missing = [document.id for document, _, vector in result if vector is None]
+        if missing:
+            vectors = iter(self.index.get_vectors(missing))  # type: ignore[arg-type]
+            result = [
+                (document, similarity, next(vectors) if vector is None else vector)
+                for document, similarity, vector in result
+            ]
+        return result
+
+    def _filter_hits(
+        self,
+        hits: List[Tuple[str, float]],
+        k: int,
+        filter: Optional[Callable[[Document], bool]],
+    ) -> List[Tuple[Document, float, Optional[List[float]]]]:
+        """Take the first k hits that pass the filter."""
+        result = []
+        for doc_id, similarity in hits:
+            doc = self.store[doc_id]
+            document = Document(
+                id=doc["id"], page_content=doc["text"], metadata=doc["metadata"]
+            )
+            if filter is not None and not filter(document):
+                continue
+            result.append((document, similarity, doc.get("vector")))
+            if len(result) == k:
+                break
+        return result
+
     def similarity_search_with_score_by_vector(
         self,
         embedding: List[float],
@@ -406,6 +495,38 @@ class InMemoryVectorStore(VectorStore):
     ) -> List[Document]:
         return self.similarity_search_by_vector(embedding, k, **kwargs)
 
+    def similarity_search_by_vectors(
+        self, embeddings: List[List[float]], k: int = 4, **kwargs: Any
+    ) -> List[List[Document]]:
+        """Search several vectors with one matrix product.
+
+        Searches with a filter are run one at a time.
+        """
+        if kwargs.get("filter") is not None or not embeddings or not self.store:
+            return super().similarity_search_by_vectors(embeddings, k, **kwargs)
+        if self.index is not None:
+            hits = self.index.search(embeddings, k, nprobe=kwargs.get("nprobe"))
+            return [self.get_by_ids([doc_id for doc_id, _ in row]) for row in hits]
+
+        import numpy as np
+
+        docs = list(self.store.values())
+        similarity = cosine_similarity(embeddings, [doc["vector"] for doc in docs])
+        results = []
+        for row in np.atleast_2d(similarity):
+            top = np.argsort(-row, kind="stable")[:k]
+            results.append(
+                [
+                    Document(
+                        id=docs[i]["id"],
+                        page_content=docs[i]["text"],
+                        metadata=docs[i]["metadata"],
+                    )
+                    for i in top
+                ]
+            )
+        return results
+
     def similarity_search(
         self, query: str, k: int = 4, **kwargs: Any
     ) -> List[Document]:
@@ -517,6 +638,9 @@ class InMemoryVectorStore(VectorStore):
     ) -> InMemoryVectorStore:
         """Load a vector store from a file.
 
+        An index saved next to the file by `dump` is loaded too. An empty
+        index passed in `kwargs` is filled with the vectors of the store.
+
         Args:
             path: The path to load the vector store from.
             embedding: The embedding to use.
@@ -528,17 +652,41 @@ class InMemoryVectorStore(VectorStore):
         _path: Path = Path(path)
         with _path.open("r") as f:
             store = load(json.load(f))
+        index_path = _index_path(_path)
+        if "index" not in kwargs and index_path.exists():
+            kwargs["index"] = IVFIndex.load(index_path)
         vectorstore = cls(embedding=embedding, **kwargs)
         vectorstore.store = store
+        if vectorstore.index is not None and not len(vectorstore.index):
+            vectorstore._index_vectors(
+                list(store), [doc["vector"] for doc in store.values()]
+            )
+        else:
+            vectorstore._drop_quantized_vectors(store)
         return vectorstore
 
     def dump(self, path: str) -> None:
         """Dump the vector store to a file.
 
+        The index of the store, if any, is saved next to the file.
+
         Args:
             path: The path to dump the vector store to.
         """
         _path: Path = Path(path)
         _path.parent.mkdir(exist_ok=True, parents=True)
+        store = self.store
+        if self.index is not None and self.index.quantizer is not None:
+            vectors = self.index.get_vectors(list(store))
+            store = {
+                doc_id: {**doc, "vector": vector}
+                for (doc_id, doc), vector in zip(store.items(), vectors)
+            }
         with _path.open("w") as f:
-            json.dump(dumpd(self.store), f, indent=2)
+            json.dump(dumpd(store), f, indent=2)
+        if self.index is not None:
+            self.index.save(_index_path(_path))
+
+
+def _index_path(path: Path) -> Path:
+    return path.with_name(f"{path.name}.index.npz")
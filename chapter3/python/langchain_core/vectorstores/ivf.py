@@ -0,0 +1,530 @@
+"""Approximate nearest neighbour search for the in memory vector store."""
+
+from __future__ import annotations
+
+import json
+import time
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Sequence, Tuple, Union
+
+if TYPE_CHECKING:
+    import numpy as np
+
+    from langchain_core.vectorstores.quantization import (
+        ProductQuantizer,
+        ScalarQuantizer,
+    )
+
+# rows converted from float16 at a time by exhaustive searches
+_CHUNK_ROWS = 16384
+
+
+def _import_numpy() -> Any:
+    try:
+        import numpy as np
+    except ImportError as e:
+        raise ImportError(
+            "IVFIndex requires numpy to be installed. "
+            "Please install numpy with `pip install numpy`."
+        ) from e
+    return np
+
+
+def _normalize(vectors: np.ndarray) -> np.ndarray:
+    np = _import_numpy()
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return vectors / norms
+
+
+class IVFIndex:
+    """An inverted file index for approximate cosine similarity search.
+
+    The vectors are clustered with k-means into `nlist` lists, and a query is
+    only compared to the vectors of the `nprobe` lists whose centroids are
+    closest to it. Raising `nprobe` trades speed for recall; with
+    `nprobe == nlist` the search is exact.
+
+    The index is trained on the vectors it holds once there are
+    `min_train_size` of them, and retrained when it has grown fourfold since.
+    Until then searches are exhaustive. Vectors can be added and deleted at any
+    time: new vectors join the list of their closest centroid, and deleted ones
+    are masked out until more than half of the index is deleted.
+
+    With a `quantizer`, the vectors of the probed lists are compared to the
+    query through their one byte per dimension (`ScalarQuantizer`) or `m` byte
+    (`ProductQuantizer`) codes, and the best `k * rerank_factor` candidates are
+    re-ranked with the vectors themselves, which are then kept as float16.
+    Use `nlist=1` to scan every code instead of a few lists.
+
+    Example:
+        .. code-block:: python
+
+            from langchain_core.vectorstores import InMemoryVectorStore
+            from langchain_core.vectorstores.ivf import IVFIndex
+
+            vector_store = InMemoryVectorStore(
+                embeddings, index=IVFIndex(nlist=256, nprobe=8)
+            )
+            vector_store.add_documents(documents)
+            vector_store.similarity_search("thud", k=4, nprobe=16)
+
+            # a few bytes per dimension rather than a list of floats
+            from langchain_core.vectorstores.quantization import ScalarQuantizer
+
+            index = IVFIndex(quantizer=ScalarQuantizer(), rerank_factor=4)
+    """
+
+    def __init__(
+        self,
+        *,
+        nlist: Optional[int] = None,
+        nprobe: int = 8,
+        min_train_size: int = 2048,
+        n_iter: int = 10,
+        seed: int = 0,
+        quantizer: Optional[Union[ScalarQuantizer, ProductQuantizer]] = None,
+        rerank_factor: int = 4,
+    ) -> None:
+        """Create an empty index.
+
+        Args:
+            nlist: The number of lists. Defaults to None, which uses twice
+                the square root of the number of vectors at training time.
+            nprobe: The number of lists to search by default.
+            min_train_size: The number of vectors to train the index on.
+                Searches are exhaustive while the index holds fewer vectors.
+            n_iter: The number of k-means iterations.
+            seed: The seed of the k-means initialization.
+            quantizer: Compresses the vectors that are scanned. Defaults to
+                None, which scans float32 vectors.
+            rerank_factor: With a quantizer, the number of candidates per result
+                to re-rank with the float16 vectors. 0 ranks with the codes
+                alone.
+        """
+        np = _import_numpy()
+        self.nlist = nlist
+        self.nprobe = nprobe
+        self.min_train_size = min_train_size
+        self.n_iter = n_iter
+        self.seed = seed
+        self.quantizer = quantizer
+        self.rerank_factor = rerank_factor
+        self._dtype = np.float16 if quantizer is not None else np.float32
+        self._ids: List[Optional[str]] = []
+        self._positions: Dict[str, int] = {}
+        self._vectors: Optional[np.ndarray] = None
+        self._alive: Optional[np.ndarray] = None
+        self._norms: Optional[np.ndarray] = None
+        self._codes: Optional[np.ndarray] = None
+        self._assignments: Optional[np.ndarray] = None
+        self._centroids: Optional[np.ndarray] = None
+        self._lists: List[Optional[np.ndarray]] = []
+        self._trained_size = 0
+
+    def __len__(self) -> int:
+        return len(self._positions)
+
+    @property
+    def is_trained(self) -> bool:
+        """Whether the vectors are clustered, so searches are approximate."""
+        return self._centroids is not None
+
+    @property
+    def nbytes(self) -> int:
+        """The memory taken by the arrays of the index."""
+        arrays = [
+            self._vectors,
+            self._alive,
+            self._norms,
+            self._codes,
+            self._assignments,
+            self._centroids,
+        ]
+        return sum(a.nbytes for a in arrays if a is not None)
+
+    def get_vectors(self, ids: Sequence[str]) -> List[List[float]]:
+        """Get the vectors of indexed ids, float16 precision with a quantizer."""
+        np = _import_numpy()
+        assert self._vectors is not None and self._norms is not None
+        positions = np.array([self._positions[id_] for id_ in ids], dtype=np.int64)
+        vectors = self._vectors[positions].astype(np.float32)
+        return (vectors * self._norms[positions, None]).tolist()
+
+    def add(
+        self, ids: Sequence[str], vectors: Union[Sequence[Sequence[float]], np.ndarray]
+    ) -> None:
+        """Add vectors, replacing the vectors of ids that are already indexed."""
+        np = _import_numpy()
+        if not len(ids):
+            return
+        self.delete([id_ for id_ in ids if id_ in self._positions])
+        raw = np.asarray(vectors, dtype=np.float32).reshape(len(ids), -1)
+        norms = np.linalg.norm(raw, axis=1)
+        rows = _normalize(raw)
+        start, end = len(self._ids), len(self._ids) + len(ids)
+        self._reserve(end, rows.shape[1])
+        assert self._vectors is not None and self._alive is not None
+        assert self._norms is not None
+        self._vectors[start:end] = rows
+        self._norms[start:end] = norms
+        self._alive[start:end] = True
+        if self.quantizer is not None and self.quantizer.is_trained:
+            assert self._codes is not None
+            self._codes[start:end] = self.quantizer.encode(rows)
+        for offset, id_ in enumerate(ids):
+            self._positions[id_] = start + offset
+            self._ids.append(id_)
+        if self._centroids is None:
+            if len(self) >= self.min_train_size:
+                self.train()
+        elif len(self) >= 4 * self._trained_size:
+            self.train()
+        else:
+            self._assign(np.arange(start, start + len(ids)))
+
+    def delete(self, ids: Sequence[str]) -> None:
+        """Delete the vectors of ids, ignoring ids that are not indexed."""
+        for id_ in ids:
+            position = self._positions.pop(id_, None)
+            if position is not None:
+                assert self._alive is not None
+                self._alive[position] = False
+                self._ids[position] = None
+        if len(self._ids) > 2 * len(self) + 1024:
+            self._compact()
+
+    def train(self) -> None:
+        """Cluster the indexed vectors with spherical k-means."""
+        np = _import_numpy()
+        self._compact()
+        size = len(self._ids)
+        if not size:
+            return
+        assert self._vectors is not None
+        vectors = self._vectors[:size]
+        nlist = self.nlist or int(2 * np.sqrt(size))
+        nlist = max(1, min(nlist, size))
+        rng = np.random.default_rng(self.seed)
+        # a sample of 32 vectors per list is enough to place the centroids
+        sample = vectors[rng.choice(size, min(size, 32 * nlist), replace=False)]
+        sample = sample.astype(np.float32)
+        centroids = sample[rng.choice(len(sample), nlist, replace=False)]
+        for _ in range(self.n_iter):
+            labels = np.argmax(sample @ centroids.T, axis=1)
+            order = np.argsort(labels, kind="stable")
+            counts = np.bincount(labels, minlength=nlist)
+            starts = np.concatenate(([0], np.cumsum(counts)[:-1]))
+            filled = counts > 0
+            sums = sample[rng.choice(len(sample), nlist)]
+            # empty lists restart from random vectors
+            sums[filled] = np.add.reduceat(sample[order], starts[filled], axis=0)
+            centroids = _normalize(sums)
+        self._centroids = centroids.astype(np.float32)
+        self._assignments = np.zeros(len(self._vectors), dtype=np.int32)
+        self._lists = [None] * nlist
+        self._assign(np.arange(size))
+        self._trained_size = size
+        if self.quantizer is not None:
+            quantizer_sample = vectors[
+                rng.choice(size, min(size, 16384), replace=False)
+            ].astype(np.float32)
+            self.quantizer.train(quantizer_sample)
+            assert self._codes is not None
+            for start in range(0, size, _CHUNK_ROWS):
+                chunk = vectors[start : start + _CHUNK_ROWS].astype(np.float32)
+                self._codes[start : start + len(chunk)] = self.quantizer.encode(chunk)
+
+    def search(
+        self,
+        queries: Union[Sequence[Sequence[float]], np.ndarray],
+        k: Optional[int],
+        *,
+        nprobe: Optional[int] = None,
+        exact: bool = False,
+    ) -> List[List[Tuple[str, float]]]:
+        """Find the most similar vectors to each query.
+
+        Args:
+            queries: The query vectors.
+            k: The number of results per query. None returns every candidate.
+            nprobe: The number of lists to search. Defaults to `self.nprobe`.
+            exact: Whether to compare the queries to every vector.
+
+        Returns:
+            The ids and cosine similarities of the results of each query, most
+            similar first.
+        """
+        np = _import_numpy()
+        if not len(self) or not len(queries):
+            return [[] for _ in queries]
+        assert self._vectors is not None and self._alive is not None
+        q = _normalize(np.asarray(queries, dtype=np.float32).reshape(len(queries), -1))
+        size = len(self._ids)
+        if exact or self._centroids is None:
+            scores = np.empty((len(q), size), dtype=np.float32)
+            for start in range(0, size, _CHUNK_ROWS):
+                chunk = self._vectors[start : min(start + _CHUNK_ROWS, size)]
+                scores[:, start : start + len(chunk)] = q @ chunk.T.astype(np.float32)
+            scores[:, ~self._alive[:size]] = -np.inf
+            return [self._top(np.arange(size), row, k) for row in scores]
+        nprobe = min(nprobe or self.nprobe, len(self._centroids))
+        centroid_scores = q @ self._centroids.T
+        results = []
+        for query, row in zip(q, centroid_scores):
+            probed = np.argpartition(-row, nprobe - 1)[:nprobe]
+            candidates = np.concatenate([self._list(i) for i in probed])
+            candidates = candidates[self._alive[candidates]]
+            results.append(self._scan(candidates, query, k))
+        return results
+
+    def recall_curve(
+        self,
+        queries: Union[Sequence[Sequence[float]], np.ndarray],
+        k: int = 10,
+        nprobes: Sequence[int] = (1, 2, 4, 8, 16, 32),
+    ) -> List[Dict[str, float]]:
+        """Measure recall and latency against exact search, to tune `nprobe`.
+
+        Args:
+            queries: Query vectors, ideally drawn from real traffic.
+            k: The number of results per query.
+            nprobes: The values of `nprobe` to measure.
+
+        Returns:
+            A row per `nprobe` with the mean recall@k and the milliseconds per
+            query, next to the milliseconds per query of exact search.
+        """
+        start = time.perf_counter()
+        truth = [
+            {id_ for id_, _ in hits} for hits in self._search_each(queries, k, None)
+        ]
+        exact_ms = (time.perf_counter() - start) * 1000 / max(len(queries), 1)
+        rows = []
+        for nprobe in nprobes:
+            start = time.perf_counter()
+            found = self._search_each(queries, k, nprobe)
+            ms = (time.perf_counter() - start) * 1000 / max(len(queries), 1)
+            recall = sum(
+                len(expected & {id_ for id_, _ in hits}) / max(len(expected), 1)
+                for expected, hits in zip(truth, found)
+            ) / max(len(queries), 1)
+            rows.append(
+                {"nprobe": nprobe, "recall": recall, "ms": ms, "exact_ms": exact_ms}
+            )
+        return rows
+
+    def save(self, path: Union[str, Path]) -> None:
+        """Save the index to a `.npz` file."""
+        np = _import_numpy()
+        self._compact()
+        size = len(self._ids)
+        dim = self._vectors.shape[1] if self._vectors is not None else 0
+        params = {
+            "nlist": self.nlist,
+            "nprobe": self.nprobe,
+            "min_train_size": self.min_train_size,
+            "n_iter": self.n_iter,
+            "seed": self.seed,
+            "rerank_factor": self.rerank_factor,
+            "trained_size": self._trained_size,
+        }
+        arrays = {}
+        if self.quantizer is not None:
+            state = self.quantizer.state()
+            params["quantizer"] = {"kind": self.quantizer.kind, **state.pop("params")}
+            if self.quantizer.is_trained:
+                arrays = {f"quantizer_{key}": value for key, value in state.items()}
+                assert self._codes is not None
+                arrays["codes"] = self._codes[:size]
+        with open(path, "wb") as f:
+            np.savez(
+                f,
+                params=np.array(json.dumps(params)),
+                norms=(
+                    self._norms[:size]
+                    if self._norms is not None
+                    else np.zeros(0, dtype=np.float32)
+                ),
+                ids=np.array(json.dumps(self._ids)),
+                vectors=(
+                    self._vectors[:size]
+                    if self._vectors is not None
+                    else np.zeros((0, dim), dtype=np.float32)
+                ),
+                centroids=(
+                    self._centroids
+                    if self._centroids is not None
+                    else np.zeros((0, dim), dtype=np.float32)
+                ),
+                **arrays,
+            )
+
+    @classmethod
+    def load(cls, path: Union[str, Path]) -> IVFIndex:
+        """Load an index saved with `save`."""
+        from langchain_core.vectorstores.quantization import (
+            ProductQuantizer,
+            ScalarQuantizer,
+        )
+
+        np = _import_numpy()
+        with np.load(path, allow_pickle=False) as data:
+            params = json.loads(str(data["params"]))
+            trained_size = params.pop("trained_size")
+            quantizer_params = params.pop("quantizer", None)
+            if quantizer_params is not None:
+                quantizer_cls = {
+                    ScalarQuantizer.kind: ScalarQuantizer,
+                    ProductQuantizer.kind: ProductQuantizer,
+                }[quantizer_params.pop("kind")]
+                if "codes" in data:
+                    state = {
+                        key[len("quantizer_") :]: data[key]
+                        for key in data.files
+                        if key.startswith("quantizer_")
+                    }
+                    params["quantizer"] = quantizer_cls.from_state(
+                        {"params": quantizer_params, **state}
+                    )
+                else:
+                    params["quantizer"] = quantizer_cls(**quantizer_params)
+            index = cls(**params)
+            ids = json.loads(str(data["ids"]))
+            vectors = data["vectors"]
+            norms = data["norms"]
+            centroids = data["centroids"]
+            codes = data["codes"] if "codes" in data else None
+        if ids:
+            index._reserve(len(ids), vectors.shape[1])
+            assert index._vectors is not None and index._alive is not None
+            assert index._norms is not None
+            index._vectors[: len(ids)] = vectors
+            index._norms[: len(ids)] = norms
+            if codes is not None:
+                assert index._codes is not None
+                index._codes[: len(ids)] = codes
+            index._alive[: len(ids)] = True
+            index._ids = ids
+            index._positions = {id_: i for i, id_ in enumerate(ids)}
+        if len(centroids):
+            index._centroids = centroids
+            index._assignments = np.zeros(len(index._vectors), dtype=np.int32)
+            index._lists = [None] * len(centroids)
+            index._assign(np.arange(len(ids)))
+            index._trained_size = trained_size
+        return index
+
+    def _search_each(
+        self, queries: Any, k: int, nprobe: Optional[int]
+    ) -> List[List[Tuple[str, float]]]:
+        results = []
+        for query in queries:
+            results.extend(
+                self.search([query], k, nprobe=nprobe, exact=nprobe is None)
+            )
+        return results
+
+    def _scan(
+        self, candidates: np.ndarray, query: np.ndarray, k: Optional[int]
+    ) -> List[Tuple[str, float]]:
+        """Rank candidates, through their codes first if there is a quantizer."""
+        np = _import_numpy()
+        assert self._vectors is not None
+        if self.quantizer is not None and self.quantizer.is_trained:
+            assert self._codes is not None
+            scores = self.quantizer.scores(query, self._codes[candidates])
+            if not self.rerank_factor:
+                return self._top(candidates, scores, k)
+            shortlist = None if k is None else k * self.rerank_factor
+            if shortlist is not None and len(candidates) > shortlist:
+                top = np.argpartition(-scores, shortlist - 1)[:shortlist]
+                candidates = candidates[top]
+        vectors = self._vectors[candidates].astype(np.float32)
+        return self._top(candidates, vectors @ query, k)
+
+    def _top(
+        self, positions: np.ndarray, scores: np.ndarray, k: Optional[int]
+    ) -> List[Tuple[str, float]]:
+        np = _import_numpy()
+        # the exhaustive search scores the deleted positions as -inf
+        keep = np.isfinite(scores)
+        positions, scores = positions[keep], scores[keep]
+        if k is not None and len(scores) > k:
+            top = np.argpartition(-scores, k - 1)[:k]
+            positions, scores = positions[top], scores[top]
+        order = np.argsort(-scores, kind="stable")
+        return [
+            (self._ids[p], float(s))  # type: ignore[misc]
+            for p, s in zip(positions[order], scores[order])
+        ]
+
+    def _list(self, i: int) -> np.ndarray:
+        np = _import_numpy()
+        cached = self._lists[i]
+        if cached is None:
+            assert self._assignments is not None
+            size = len(self._ids)
+            cached = np.flatnonzero(self._assignments[:size] == i)
+            self._lists[i] = cached
+        return cached
+
+    def _assign(self, positions: np.ndarray) -> None:
+        np = _import_numpy()
+        assert self._vectors is not None and self._assignments is not None
+        assert self._centroids is not None
+        labels = np.argmax(self._vectors[positions] @ self._centroids.T, axis=1)
+        self._assignments[positions] = labels
+        for i in np.unique(labels):
+            self._lists[i] = None
+
+    def _reserve(self, size: int, dim: int) -> None:
+        np = _import_numpy()
+        if self._vectors is not None and self._vectors.shape[1] != dim:
+            raise ValueError(
+                f"Expected vectors of dimension {self._vectors.shape[1]}, got {dim}."
+            )
+        capacity = 0 if self._vectors is None else len(self._vectors)
+        if size <= capacity:
+            return
+        capacity = max(size, 2 * capacity, 1024)
+        vectors = np.zeros((capacity, dim), dtype=self._dtype)
+        alive = np.zeros(capacity, dtype=bool)
+        norms = np.zeros(capacity, dtype=np.float32)
+        assignments = np.zeros(capacity, dtype=np.int32)
+        used = len(self._ids)
+        if self._vectors is not None:
+            assert self._alive is not None and self._norms is not None
+            vectors[:used] = self._vectors[:used]
+            alive[:used] = self._alive[:used]
+            norms[:used] = self._norms[:used]
+        if self._assignments is not None:
+            assignments[:used] = self._assignments[:used]
+            self._assignments = assignments
+        if self.quantizer is not None:
+            codes = np.zeros(
+                (capacity, self.quantizer.code_size(dim)), dtype=np.uint8
+            )
+            if self._codes is not None:
+                codes[:used] = self._codes[:used]
+            self._codes = codes
+        self._vectors, self._alive, self._norms = vectors, alive, norms
+
+    def _compact(self) -> None:
+        np = _import_numpy()
+        if len(self._ids) == len(self) or self._vectors is None:
+            return
+        assert self._alive is not None
+        keep = np.flatnonzero(self._alive[: len(self._ids)])
+        self._vectors[: len(keep)] = self._vectors[keep]
+        assert self._norms is not None
+        self._norms[: len(keep)] = self._norms[keep]
+        if self._codes is not None:
+            self._codes[: len(keep)] = self._codes[keep]
+        self._alive[:] = False
+        self._alive[: len(keep)] = True
+        if self._assignments is not None:
+            self._assignments[: len(keep)] = self._assignments[keep]
+            self._lists = [None] * len(self._lists)
+        self._ids = [self._ids[p] for p in keep]
+        self._positions = {id_: i for i, id_ in enumerate(self._ids)}  # type: ignore[misc]
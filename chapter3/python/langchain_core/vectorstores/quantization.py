@@ -0,0 +1,176 @@
+"""Compressed vector codes for the in memory vector store's index."""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Any, Dict
+
+from langchain_core.vectorstores.ivf import _import_numpy
+
+if TYPE_CHECKING:
+    import numpy as np
+
+
+class ScalarQuantizer:
+    """Encode each dimension of a vector as one byte.
+
+    Values are mapped linearly onto 0..255 between a per-dimension offset and
+    scale learned from the 0.1st and 99.9th percentiles of the training
+    vectors, so a vector takes one byte per dimension.
+    """
+
+    kind = "scalar"
+
+    def __init__(self) -> None:
+        self.offset: Any = None
+        self.scale: Any = None
+
+    @property
+    def is_trained(self) -> bool:
+        return self.offset is not None
+
+    def code_size(self, dim: int) -> int:
+        """The number of bytes of the code of a vector."""
+        return dim
+
+    def train(self, vectors: np.ndarray) -> None:
+        np = _import_numpy()
+        low, high = np.quantile(vectors, [0.001, 0.999], axis=0)
+        scale = (high - low) / 255
+        scale[scale == 0] = 1.0
+        self.offset = low.astype(np.float32)
+        self.scale = scale.astype(np.float32)
+
+    def encode(self, vectors: np.ndarray) -> np.ndarray:
+        np = _import_numpy()
+        codes = np.rint((vectors - self.offset) / self.scale)
+        return np.clip(codes, 0, 255).astype(np.uint8)
+
+    def decode(self, codes: np.ndarray) -> np.ndarray:
+        return codes * self.scale + self.offset
+
+    def scores(self, query: np.ndarray, codes: np.ndarray) -> np.ndarray:
+        """Approximate the dot products of the query with the encoded vectors."""
+        np = _import_numpy()
+        return codes.astype(np.float32) @ (query * self.scale) + query @ self.offset
+
+    def state(self) -> Dict[str, Any]:
+        return {"params": {}, "offset": self.offset, "scale": self.scale}
+
+    @classmethod
+    def from_state(cls, state: Dict[str, Any]) -> ScalarQuantizer:
+        quantizer = cls(**state["params"])
+        quantizer.offset, quantizer.scale = state["offset"], state["scale"]
+        return quantizer
+
+
+class ProductQuantizer:
+    """Encode a vector as the nearest centroids of `m` slices of it.
+
+    Each slice of `dim / m` dimensions is replaced by the index of the closest
+    of 256 centroids learned with k-means, so a vector takes `m` bytes. Dot
+    products with a query are sums over a table of the query slices' dot
+    products with the centroids.
+    """
+
+    kind = "product"
+
+    def __init__(self, m: int = 16, n_iter: int = 10, seed: int = 0) -> None:
+        """Create a product quantizer.
+
+        Args:
+            m: The number of slices, which must divide the dimension.
+            n_iter: The number of k-means iterations.
+            seed: The seed of the k-means initialization.
+        """
+        self.m = m
+        self.n_iter = n_iter
+        self.seed = seed
+        self.codebooks: Any = None
+
+    @property
+    def is_trained(self) -> bool:
+        return self.codebooks is not None
+
+    def code_size(self, dim: int) -> int:
+        """The number of bytes of the code of a vector."""
+        return self.m
+
+    def train(self, vectors: np.ndarray) -> None:
+        np = _import_numpy()
+        n, dim = vectors.shape
+        if dim % self.m:
+            raise ValueError(
+                f"The dimension {dim} is not divisible by the number of slices "
+                f"{self.m}."
+            )
+        rng = np.random.default_rng(self.seed)
+        if n > 32 * 256:
+            # 32 points per centroid are enough to place them
+            vectors = vectors[rng.choice(n, 32 * 256, replace=False)]
+            n = len(vectors)
+        ksub = min(256, n)
+        slices = vectors.reshape(n, self.m, -1)
+        codebooks = []
+        for j in range(self.m):
+            points = np.ascontiguousarray(slices[:, j])
+            centroids = points[rng.choice(n, ksub, replace=False)]
+            for _ in range(self.n_iter):
+                labels = _nearest(points, centroids)
+                counts = np.bincount(labels, minlength=ksub)
+                order = np.argsort(labels, kind="stable")
+                starts = np.concatenate(([0], np.cumsum(counts)[:-1]))
+                filled = counts > 0
+                # empty clusters keep their centroid
+                centroids = centroids.copy()
+                centroids[filled] = (
+                    np.add.reduceat(points[order], starts[filled], axis=0)
+                    / counts[filled, None]
+                )
+            codebooks.append(centroids)
+        self.codebooks = np.stack(codebooks).astype(np.float32)
+
+    def encode(self, vectors: np.ndarray) -> np.ndarray:
+        np = _import_numpy()
+        slices = vectors.reshape(len(vectors), self.m, -1)
+        codes = np.empty((len(vectors), self.m), dtype=np.uint8)
+        for j in range(self.m):
+            codes[:, j] = _nearest(
+                np.ascontiguousarray(slices[:, j]), self.codebooks[j]
+            )
+        return codes
+
+    def decode(self, codes: np.ndarray) -> np.ndarray:
+        np = _import_numpy()
+        parts = [self.codebooks[j][codes[:, j]] for j in range(self.m)]
+        return np.concatenate(parts, axis=1)
+
+    def scores(self, query: np.ndarray, codes: np.ndarray) -> np.ndarray:
+        """Approximate the dot products of the query with the encoded vectors."""
+        np = _import_numpy()
+        table = np.einsum("jcd,jd->jc", self.codebooks, query.reshape(self.m, -1))
+        return table[np.arange(self.m), codes].sum(axis=1)
+
+    def state(self) -> Dict[str, Any]:
+        return {
+            "params": {"m": self.m, "n_iter": self.n_iter, "seed": self.seed},
+            "codebooks": self.codebooks,
+        }
+
+    @classmethod
+    def from_state(cls, state: Dict[str, Any]) -> ProductQuantizer:
+        quantizer = cls(**state["params"])
+        quantizer.codebooks = state["codebooks"]
+        return quantizer
+
+
+def _nearest(points: np.ndarray, centroids: np.ndarray) -> np.ndarray:
+    """The index of the closest centroid of each point, in chunks."""
+    np = _import_numpy()
+    squared_norms = (centroids**2).sum(axis=1)
+    labels = np.empty(len(points), dtype=np.int64)
+    for start in range(0, len(points), 16384):
+        chunk = points[start : start + 16384]
+        labels[start : start + 16384] = np.argmin(
+            squared_norms - 2 * chunk @ centroids.T, axis=1
+        )
+    return labels
@@ -2,13 +2,18 @@ from __future__ import annotations
 
 import functools
 import logging
+import random
 import sys
 import threading
+import time
 import weakref
-from queue import Empty, Queue
+from collections import OrderedDict
+from queue import Empty, PriorityQueue, Queue
 from typing import (
     TYPE_CHECKING,
     List,
+    Literal,
+    Optional,
     Union,
     cast,
 )
@@ -24,6 +29,7 @@ from langsmith._internal._operations import (
     SerializedRunOperation,
     combine_serialized_queue_operations,
 )
+from langsmith._internal._spool import TraceSpool
 
 if TYPE_CHECKING:
     from langsmith.client import Client
@@ -39,12 +45,16 @@ class TracingQueueItem:
         priority (str): The priority of the item.
         action (str): The action associated with the item.
         item (Any): The item itself.
+        spool_token (Optional[int]): The token of the item in the trace spool.
+        attempts (int): The number of times sending the item failed.
     """
 
     priority: str
     item: Union[SerializedRunOperation, SerializedFeedbackOperation]
+    spool_token: Optional[int]
+    attempts: int
 
-    __slots__ = ("priority", "item")
+    __slots__ = ("priority", "item", "spool_token", "attempts")
 
     def __init__(
         self,
@@ -53,6 +63,8 @@ class TracingQueueItem:
     ) -> None:
         self.priority = priority
         self.item = item
+        self.spool_token = None
+        self.attempts = 0
 
     def __lt__(self, other: TracingQueueItem) -> bool:
         return (self.priority, self.item.__class__) < (
@@ -67,6 +79,100 @@ class TracingQueueItem:
         ) == (other.priority, other.item.__class__)
 
 
+class TracingQueue(PriorityQueue):
+    """The tracing queue, optionally bounded and backed by a TraceSpool.
+
+    When the queue holds `max_items` items, new items are handled according to
+    `overflow`:
+
+    - "block" waits up to `put_timeout` seconds for room, then drops the item.
+    - "drop" drops the item.
+    - "sample" additionally starts dropping new traces once the queue is half
+      full, with a probability that grows with the queue size.
+
+    A trace whose root run was dropped is dropped as a whole, so the queue
+    doesn't send runs whose parents are missing.
+    """
+
+    def __init__(
+        self,
+        max_items: int = 0,
+        *,
+        overflow: Literal["block", "drop", "sample"] = "block",
+        put_timeout: float = 1.0,
+        spool: Optional[TraceSpool] = None,
+    ) -> None:
+        super().__init__()
+        if overflow not in ("block", "drop", "sample"):
+            raise ValueError(f"Invalid tracing queue overflow policy: {overflow}")
+        self.max_items = max_items
+        self.overflow = overflow
+        self.put_timeout = put_timeout
+        self.spool = spool
+        self.dropped = 0
+        self._dropped_traces: OrderedDict = OrderedDict()
+
+    def put(
+        self,
+        item: TracingQueueItem,
+        block: bool = True,
+        timeout: Optional[float] = None,
+    ) -> None:
+        if self.max_items and not self._admit(item):
+            self.dropped += 1
+            return
+        if self.spool is not None and item.spool_token is None:
+            item.spool_token = self.spool.append(item.priority, item.item)
+        super().put(item, block, timeout)
+
+    def requeue(self, items: List[TracingQueueItem]) -> None:
+        """Queue items again after sending them failed.
+
+        They were admitted (and spooled) before, so they bypass the bound.
+        """
+        for item in items:
+            super().put(item)
+
+    def _admit(self, item: TracingQueueItem) -> bool:
+        op = item.item
+        if op.trace_id in self._dropped_traces:
+            return False
+        is_root = (
+            isinstance(op, SerializedRunOperation)
+            and op.operation == "post"
+            and op.id == op.trace_id
+        )
+        size = self.qsize()
+        if is_root and self.overflow == "sample":
+            low = self.max_items // 2
+            if size >= low and random.random() >= (self.max_items - size) / max(
+                self.max_items - low, 1
+            ):
+                self._drop_trace(op.trace_id)
+                return False
+        if size < self.max_items:
+            return True
+        if self.overflow == "block":
+            deadline = time.monotonic() + self.put_timeout
+            with self.not_full:
+                while self._qsize() >= self.max_items:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    self.not_full.wait(remaining)
+                else:
+                    return True
+        if is_root:
+            self._drop_trace(op.trace_id)
+        logger.debug("Tracing queue is full, dropping %s", op.id)
+        return False
+
+    def _drop_trace(self, trace_id: object) -> None:
+        self._dropped_traces[trace_id] = None
+        while len(self._dropped_traces) > 10_000:
+            self._dropped_traces.popitem(last=False)
+
+
 def _tracing_thread_drain_queue(
     tracing_queue: Queue, limit: int = 100, block: bool = True
 ) -> List[TracingQueueItem]:
@@ -88,12 +194,20 @@ def _tracing_thread_drain_queue(
     return next_batch
 
 
+MAX_SEND_ATTEMPTS = 5
+"""The number of times a spooled item is sent before it is left to the spool."""
+
+
 def _tracing_thread_handle_batch(
     client: Client,
     tracing_queue: Queue,
     batch: List[TracingQueueItem],
     use_multipart: bool,
+    backoff: bool = True,
 ) -> None:
+    # the failures of this thread only, so other batches do not count
+    failures = client._thread_ingest_failures()
+    failed = True
     try:
         ops = combine_serialized_queue_operations([item.item for item in batch])
         if use_multipart:
@@ -107,6 +221,7 @@ def _tracing_thread_handle_batch(
                     op for op in ops if not isinstance(op, SerializedFeedbackOperation)
                 ]
             client._batch_ingest_run_ops(cast(List[SerializedRunOperation], ops))
+        failed = client._thread_ingest_failures() != failures
 
     except Exception:
         logger.error("Error in tracing queue", exc_info=True)
@@ -114,8 +229,54 @@ def _tracing_thread_handle_batch(
         # background thread continues to run
         pass
     finally:
+        retry: List[TracingQueueItem] = []
+        spool = getattr(tracing_queue, "spool", None)
+        if spool is not None:
+            if failed:
+                retry = _retry_spooled(spool, batch)
+            else:
+                spool.ack(item.spool_token for item in batch)
+        if retry and not backoff:
+            cast(TracingQueue, tracing_queue).requeue(retry)
         for _ in batch:
             tracing_queue.task_done()
+        if retry and backoff:
+            # back off on a timer rather than on this thread, and after
+            # task_done, so neither the queue nor flush() waits for the retry
+            timer = threading.Timer(
+                min(2 ** max(item.attempts for item in retry), 30),
+                cast(TracingQueue, tracing_queue).requeue,
+                (retry,),
+            )
+            timer.daemon = True
+            timer.start()
+
+
+def _retry_spooled(
+    spool: TraceSpool, batch: List[TracingQueueItem]
+) -> List[TracingQueueItem]:
+    """Pick the spooled items of a failed batch to send again.
+
+    Items are sent up to MAX_SEND_ATTEMPTS times.
+
+    Items that keep failing are released to the spool, which keeps them for the
+    next client but frees their space, so a long-lived process does not fill
+    the spool with items it cannot send.
+    """
+    retry = []
+    give_up = []
+    for item in batch:
+        if item.spool_token is None:
+            continue
+        item.attempts += 1
+        (retry if item.attempts < MAX_SEND_ATTEMPTS else give_up).append(item)
+    if give_up:
+        logger.warning(
+            "Could not send %d spooled tracing items, leaving them in the spool",
+            len(give_up),
+        )
+        spool.release(item.spool_token for item in give_up)
+    return retry
 
 
 def _ensure_ingest_config(
@@ -155,6 +316,12 @@ def tracing_control_thread_func(client_ref: weakref.ref[Client]) -> None:
     # 1 for this func, 1 for getrefcount, 1 for _get_data_type_cached
     num_known_refs = 3
 
+    spool = getattr(tracing_queue, "spool", None)
+    if spool is not None:
+        # send what earlier processes left in the spool
+        for priority, op in spool.replay_orphans():
+            tracing_queue.put(TracingQueueItem(priority, op))
+
     def keep_thread_active() -> bool:
         # if `client.cleanup()` was called, stop thread
         if not client or (
@@ -197,7 +364,52 @@ def tracing_control_thread_func(client_ref: weakref.ref[Client]) -> None:
     while next_batch := _tracing_thread_drain_queue(
         tracing_queue, limit=size_limit, block=False
     ):
-        _tracing_thread_handle_batch(client, tracing_queue, next_batch, use_multipart)
+        _tracing_thread_handle_batch(
+            client, tracing_queue, next_batch, use_multipart, backoff=False
+        )
+    if spool is not None:
+        spool.close()
+
+
+def tracing_flush(client: Client, timeout: Optional[float] = None) -> bool:
+    """Send the queued items now, waiting for them within a time budget.
+
+    The items are sent by a separate thread, so a slow or failing request does
+    not hold the caller past the timeout. Items that a background thread is
+    waiting to retry after a failed send are not waited for. They stay in the
+    spool, if there is one.
+
+    Returns:
+        Whether the queue, including batches being sent by the background
+        threads, was emptied before the timeout.
+    """
+    tracing_queue = client.tracing_queue
+    if tracing_queue is None:
+        return True
+    deadline = None if timeout is None else time.monotonic() + timeout
+
+    def drain() -> None:
+        batch_ingest_config = _ensure_ingest_config(client.info)
+        size_limit = batch_ingest_config["size_limit"]
+        use_multipart = batch_ingest_config.get("use_multipart_endpoint", False)
+        while next_batch := _tracing_thread_drain_queue(
+            tracing_queue, limit=size_limit, block=False
+        ):
+            _tracing_thread_handle_batch(
+                client, tracing_queue, next_batch, use_multipart, backoff=False
+            )
+
+    threading.Thread(target=drain, name="langsmith-flush", daemon=True).start()
+    with tracing_queue.all_tasks_done:
+        while tracing_queue.unfinished_tasks:
+            if deadline is None:
+                tracing_queue.all_tasks_done.wait()
+                continue
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return False
+            tracing_queue.all_tasks_done.wait(remaining)
+    return True
 
 
 def _tracing_sub_thread_func(
@@ -239,4 +451,6 @@ def _tracing_sub_thread_func(
     while next_batch := _tracing_thread_drain_queue(
         tracing_queue, limit=size_limit, block=False
     ):
-        _tracing_thread_handle_batch(client, tracing_queue, next_batch, use_multipart)
+        _tracing_thread_handle_batch(
+            client, tracing_queue, next_batch, use_multipart, backoff=False
+        )
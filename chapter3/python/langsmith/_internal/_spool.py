@@ -0,0 +1,300 @@
+"""Durable on-disk spool for the tracing queue."""
+
+from __future__ import annotations
+
+import logging
+import os
+import struct
+import threading
+import uuid
+import zlib
+from typing import Dict, Iterable, Iterator, List, Optional, Set, Tuple, Union
+
+from langsmith._internal import _orjson
+from langsmith._internal._operations import (
+    SerializedFeedbackOperation,
+    SerializedRunOperation,
+)
+
+logger = logging.getLogger("langsmith.client")
+
+# crc32 of header and body, header length, body length
+_RECORD_PREFIX = struct.Struct(">III")
+_SEGMENT_SUFFIX = ".seg"
+_DIR_PREFIX = "spool-"
+
+_Operation = Union[SerializedRunOperation, SerializedFeedbackOperation]
+
+# the spool directories of this process, which are never replayed
+_live_dirs: Set[str] = set()
+
+
+def _encode(priority: str, op: _Operation) -> bytes:
+    parts: List[bytes] = []
+    if isinstance(op, SerializedRunOperation):
+        header: dict = {"t": "run", "op": op.operation}
+        fields = [op._none, op.inputs, op.outputs, op.events]
+        header["f"] = [-1 if field is None else len(field) for field in fields]
+        parts.extend(field for field in fields if field is not None)
+        if op.attachments:
+            header["a"] = []
+            for name, (content_type, data) in op.attachments.items():
+                header["a"].append([name, content_type, len(data)])
+                parts.append(data)
+    else:
+        header = {"t": "feedback", "f": [len(op.feedback)]}
+        parts.append(op.feedback)
+    header["p"] = priority
+    header["id"] = str(op.id)
+    header["trace_id"] = str(op.trace_id)
+    header_bytes = _orjson.dumps(header)
+    body = b"".join(parts)
+    crc = zlib.crc32(body, zlib.crc32(header_bytes))
+    return _RECORD_PREFIX.pack(crc, len(header_bytes), len(body)) + header_bytes + body
+
+
+def _decode(header: dict, body: bytes) -> Tuple[str, _Operation]:
+    offset = 0
+    fields: List[Optional[bytes]] = []
+    for length in header["f"]:
+        if length < 0:
+            fields.append(None)
+            continue
+        fields.append(body[offset : offset + length])
+        offset += length
+    id_ = uuid.UUID(header["id"])
+    trace_id = uuid.UUID(header["trace_id"])
+    if header["t"] == "feedback":
+        return header["p"], SerializedFeedbackOperation(
+            id=id_, trace_id=trace_id, feedback=fields[0] or b""
+        )
+    attachments = None
+    if header.get("a"):
+        attachments = {}
+        for name, content_type, length in header["a"]:
+            attachments[name] = (content_type, body[offset : offset + length])
+            offset += length
+    return header["p"], SerializedRunOperation(
+        operation=header["op"],
+        id=id_,
+        trace_id=trace_id,
+        _none=fields[0] or b"{}",
+        inputs=fields[1],
+        outputs=fields[2],
+        events=fields[3],
+        attachments=attachments,
+    )
+
+
+def _read_segment(path: str) -> Iterator[Tuple[str, _Operation]]:
+    with open(path, "rb") as f:
+        data = f.read()
+    offset = 0
+    while offset + _RECORD_PREFIX.size <= len(data):
+        crc, header_length, body_length = _RECORD_PREFIX.unpack_from(data, offset)
+        start = offset + _RECORD_PREFIX.size
+        end = start + header_length + body_length
+        header_bytes = data[start : start + header_length]
+        body = data[start + header_length : end]
+        if end > len(data) or zlib.crc32(body, zlib.crc32(header_bytes)) != crc:
+            # a record torn by a crash, nothing after it can be trusted
+            logger.warning("Skipping the corrupt end of trace spool segment %s", path)
+            return
+        yield _decode(_orjson.loads(header_bytes), body)
+        offset = end
+
+
+def _pid_is_alive(pid: int) -> bool:
+    if pid == os.getpid():
+        # not one of ours, so an earlier process that had the same pid
+        return False
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except (PermissionError, OSError):
+        return True
+    return True
+
+
+class TraceSpool:
+    """An append-only, segmented write-ahead log of tracing queue items.
+
+    Items are appended when they are queued and acknowledged once they have been
+    sent. A segment file is deleted when all of its items are acknowledged, so
+    the files left behind by a process that died are replayed by the next client
+    that uses the same directory. Items that could not be sent are released:
+    their segments are kept on disk for that replay, but no longer count
+    towards `max_bytes`. Delivery is at least once: the sent items of a partly
+    acknowledged segment are sent again.
+
+    Each process writes to its own sub-directory, so several processes can share
+    the spool directory.
+    """
+
+    def __init__(
+        self,
+        directory: str,
+        *,
+        max_bytes: int = 256 * 1024 * 1024,
+        segment_bytes: int = 4 * 1024 * 1024,
+    ) -> None:
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.segment_bytes = segment_bytes
+        self._lock = threading.Lock()
+        self._dir = os.path.join(
+            directory, f"{_DIR_PREFIX}{os.getpid()}-{uuid.uuid4().hex}"
+        )
+        os.makedirs(self._dir, exist_ok=True)
+        _live_dirs.add(self._dir)
+        self._seq = 0
+        self._file = None
+        self._file_size = 0
+        self._total_bytes = 0
+        # outstanding items and size of each segment
+        self._pending: Dict[int, int] = {}
+        self._sizes: Dict[int, int] = {}
+        # segments with released items, which are kept for replay
+        self._kept: Set[int] = set()
+
+    @property
+    def total_bytes(self) -> int:
+        """The size of the segments that are not fully acknowledged."""
+        return self._total_bytes
+
+    def append(self, priority: str, op: _Operation) -> Optional[int]:
+        """Append an item.
+
+        Returns:
+            A token to acknowledge the item with, or None if the spool is full.
+        """
+        record = _encode(priority, op)
+        with self._lock:
+            if self._total_bytes + len(record) > self.max_bytes:
+                return None
+            if self._file is None or (
+                self._file_size and self._file_size + len(record) > self.segment_bytes
+            ):
+                self._roll()
+            assert self._file is not None
+            self._file.write(record)
+            self._file.flush()
+            self._file_size += len(record)
+            self._total_bytes += len(record)
+            self._sizes[self._seq] += len(record)
+            self._pending[self._seq] += 1
+            return self._seq
+
+    def ack(self, tokens: Iterable[Optional[int]]) -> None:
+        """Acknowledge that items were sent."""
+        self._settle(tokens, keep=False)
+
+    def release(self, tokens: Iterable[Optional[int]]) -> None:
+        """Give up sending items, leaving them to be replayed by a later client.
+
+        Their segments stay on disk, where the next client that uses the
+        directory after this process is gone replays them, but no longer count
+        towards `max_bytes`, so items that cannot be sent do not fill the spool.
+        """
+        self._settle(tokens, keep=True)
+
+    def _settle(self, tokens: Iterable[Optional[int]], *, keep: bool) -> None:
+        with self._lock:
+            done = set()
+            for seq in tokens:
+                if seq is None or seq not in self._pending:
+                    continue
+                if keep:
+                    self._kept.add(seq)
+                self._pending[seq] -= 1
+                if not self._pending[seq]:
+                    done.add(seq)
+            for seq in done:
+                if seq == self._seq and self._file is not None:
+                    self._file.close()
+                    self._file = None
+                self._remove_segment(seq)
+
+    def replay_orphans(self) -> Iterator[Tuple[str, _Operation]]:
+        """Yield the items left in the spool by processes that are gone.
+
+        The segments are claimed by this process before they are read, and are
+        removed once they have been read, so callers should append the items
+        again.
+        """
+        try:
+            names = os.listdir(self.directory)
+        except OSError:
+            return
+        for name in names:
+            path = os.path.join(self.directory, name)
+            if not name.startswith(_DIR_PREFIX) or path in _live_dirs:
+                continue
+            try:
+                pid = int(name[len(_DIR_PREFIX) :].split("-", 1)[0])
+            except ValueError:
+                continue
+            if _pid_is_alive(pid):
+                continue
+            claimed = f"{self._dir}-replay-{uuid.uuid4().hex}"
+            try:
+                # atomic, so only one process replays the directory
+                os.rename(path, claimed)
+            except OSError:
+                continue
+            _live_dirs.add(claimed)
+            for segment in sorted(os.listdir(claimed)):
+                segment_path = os.path.join(claimed, segment)
+                if segment.endswith(_SEGMENT_SUFFIX):
+                    try:
+                        yield from _read_segment(segment_path)
+                    except Exception:
+                        logger.warning(
+                            "Error replaying trace spool segment %s",
+                            segment_path,
+                            exc_info=True,
+                        )
+                os.remove(segment_path)
+            os.rmdir(claimed)
+            _live_dirs.discard(claimed)
+
+    def close(self) -> None:
+        """Close the current segment, removing it if everything was sent."""
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+                if not self._pending.get(self._seq):
+                    self._remove_segment(self._seq)
+            if not self._pending:
+                try:
+                    os.rmdir(self._dir)
+                except OSError:
+                    pass
+            _live_dirs.discard(self._dir)
+
+    def _segment_path(self, seq: int) -> str:
+        return os.path.join(self._dir, f"{seq:012d}{_SEGMENT_SUFFIX}")
+
+    def _roll(self) -> None:
+        if self._file is not None:
+            self._file.close()
+            if not self._pending.get(self._seq):
+                self._remove_segment(self._seq)
+        self._seq += 1
+        self._file = open(self._segment_path(self._seq), "ab")
+        self._file_size = 0
+        self._pending[self._seq] = 0
+        self._sizes[self._seq] = 0
+
+    def _remove_segment(self, seq: int) -> None:
+        self._pending.pop(seq, None)
+        self._total_bytes -= self._sizes.pop(seq, 0)
+        if seq in self._kept:
+            self._kept.discard(seq)
+            return
+        try:
+            os.remove(self._segment_path(seq))
+        except OSError:
+            pass
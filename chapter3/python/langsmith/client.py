@@ -70,7 +70,9 @@ from langsmith import schemas as ls_schemas
 from langsmith import utils as ls_utils
 from langsmith._internal import _orjson
 from langsmith._internal._background_thread import (
+    TracingQueue,
     TracingQueueItem,
+    tracing_flush,
 )
 from langsmith._internal._background_thread import (
     tracing_control_thread_func as _tracing_control_thread_func,
@@ -95,6 +97,7 @@ from langsmith._internal._operations import (
     serialized_run_operation_to_multipart_parts_and_context,
 )
 from langsmith._internal._serde import dumps_json as _dumps_json
+from langsmith._internal._spool import TraceSpool
 
 try:
     from zoneinfo import ZoneInfo  # type: ignore[import-not-found]
@@ -244,6 +247,40 @@ def _validate_api_key_if_hosted(api_url: str, api_key: Optional[str]) -> None:
             )
 
 
+def _get_tracing_queue() -> TracingQueue:
+    """Create the tracing queue configured by the environment.
+
+    LANGSMITH_TRACING_MAX_QUEUE_SIZE bounds the number of queued items (0, the
+    default, means no bound) and LANGSMITH_TRACING_QUEUE_OVERFLOW selects what
+    happens when it is reached: "block" (the default), "drop" or "sample".
+    LANGSMITH_TRACING_SPOOL_DIR enables a disk spool of the queue, limited to
+    LANGSMITH_TRACING_SPOOL_MAX_BYTES, whose leftovers are sent by the next
+    client that uses the directory.
+    """
+    spool = None
+    spool_dir = ls_utils.get_env_var("TRACING_SPOOL_DIR")
+    if spool_dir:
+        try:
+            spool = TraceSpool(
+                spool_dir,
+                max_bytes=int(
+                    ls_utils.get_env_var(
+                        "TRACING_SPOOL_MAX_BYTES", str(256 * 1024 * 1024)
+                    )
+                ),
+            )
+        except OSError as e:
+            logger.warning(f"Could not create trace spool in {spool_dir}: {e}")
+    return TracingQueue(
+        int(ls_utils.get_env_var("TRACING_MAX_QUEUE_SIZE", "0")),
+        overflow=cast(
+            Literal["block", "drop", "sample"],
+            ls_utils.get_env_var("TRACING_QUEUE_OVERFLOW", "block"),
+        ),
+        spool=spool,
+    )
+
+
 def _get_tracing_sampling_rate() -> float | None:
     """Get the tracing sampling rate.
 
@@ -361,6 +398,8 @@ class Client:
         "_tenant_id",
         "tracing_sample_rate",
         "_filtered_post_uuids",
+        "_ingest_failures",
+        "_ingest_local",
         "tracing_queue",
         "_anonymizer",
         "_hide_inputs",
@@ -449,6 +488,9 @@ class Client:
 
         self.tracing_sample_rate = _get_tracing_sampling_rate()
         self._filtered_post_uuids: set[uuid.UUID] = set()
+        # requests that could not be sent, in total and per sending thread
+        self._ingest_failures = 0
+        self._ingest_local = threading.local()
         self._write_api_urls: Mapping[str, Optional[str]] = _get_write_api_urls(
             api_urls
         )
@@ -480,7 +522,7 @@ class Client:
         atexit.register(close_session, session_)
         # Initialize auto batching
         if auto_batch_tracing:
-            self.tracing_queue: Optional[PriorityQueue] = PriorityQueue()
+            self.tracing_queue: Optional[PriorityQueue] = _get_tracing_queue()
 
             threading.Thread(
                 target=_tracing_control_thread_func,
@@ -1467,6 +1509,14 @@ class Client:
 
         self._batch_ingest_run_ops(serialized_ops)
 
+    def _record_ingest_failure(self) -> None:
+        self._ingest_failures += 1
+        self._ingest_local.failures = self._thread_ingest_failures() + 1
+
+    def _thread_ingest_failures(self) -> int:
+        """The number of failed ingest requests made by the calling thread."""
+        return getattr(self._ingest_local, "failures", 0)
+
     def _post_batch_ingest_runs(self, body: bytes, *, _context: str):
         for api_url, api_key in self._write_api_urls.items():
             try:
@@ -1485,6 +1535,7 @@ class Client:
                     _context=_context,
                 )
             except Exception as e:
+                self._record_ingest_failure()
                 try:
                     exc_desc_lines = traceback.format_exception_only(type(e), e)
                     exc_desc = "".join(exc_desc_lines).rstrip()
@@ -1642,10 +1693,12 @@ class Client:
                     ls_utils.LangSmithAPIError,
                 ) as exc:
                     if idx == attempts:
+                        self._record_ingest_failure()
                         logger.warning(f"Failed to multipart ingest runs: {exc}")
                     else:
                         continue
                 except Exception as e:
+                    self._record_ingest_failure()
                     try:
                         exc_desc_lines = traceback.format_exception_only(type(e), e)
                         exc_desc = "".join(exc_desc_lines).rstrip()
@@ -5795,6 +5848,26 @@ class Client:
         )
         return url
 
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """Send all queued runs and feedback now.
+
+        Call this at the end of an invocation in environments that may freeze or
+        stop the process once a response is returned, such as AWS Lambda, where
+        the background thread would otherwise not get to send the traces.
+
+        Parameters
+        ----------
+        timeout : float or None, default=None
+            The maximum number of seconds to spend. Items that were not sent stay
+            queued (and spooled, if a spool directory is configured).
+
+        Returns:
+        -------
+        bool
+            Whether everything was sent within the timeout.
+        """
+        return tracing_flush(self, timeout)
+
     def cleanup(self) -> None:
         """Manually trigger cleanup of the background thread."""
         self._manual_cleanup = True
@@ -0,0 +1,135 @@
+"""トレースのスプールと Client.flush をローカルの代替 HTTP サーバーで確認するスクリプト
+
+1. サーバーが失敗を返す間は、flush が予算内に戻ること
+2. 送れなかった実行が、次に起動したクライアントからスプール経由で再送されること
+
+レイヤーの langsmith を使うため、レイヤーと同じ Python 3.9 で、chapter3
+ディレクトリから次のように実行する。
+
+    PYTHONPATH=python python trace_spool_check.py
+"""
+
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import uuid
+from datetime import datetime, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+RUNS = 20
+FLUSH_TIMEOUT = 2.0
+
+
+# LangSmith の代わりに実行を受け取るサーバー
+class StandInHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        self._reply(200, {})
+
+    def do_POST(self):
+        body = self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        if self.server.failing:
+            self._reply(503, {"detail": "unavailable"})
+            return
+        # 受け取った実行の ID を記録（multipart でも batch でも ID は本文に含まれる）
+        with self.server.lock:
+            self.server.bodies.append(body)
+        self._reply(200, {})
+
+    def _reply(self, status, payload):
+        data = json.dumps(payload).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def start_server(failing):
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StandInHandler)
+    server.failing = failing
+    server.lock = threading.Lock()
+    server.bodies = []
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+# 子プロセス: 実行をキューに入れ、短い予算で flush して、そのまま終了する
+def emit(api_url, spool_dir, run_ids):
+    os.environ["LANGSMITH_TRACING_SPOOL_DIR"] = spool_dir
+    from langsmith import Client
+
+    client = Client(api_url=api_url, api_key="stand-in")
+    for run_id in run_ids:
+        start = datetime.now(timezone.utc)
+        client.create_run(
+            "spool-check",
+            {"question": "空が青いのは何故ですか？"},
+            "chain",
+            id=run_id,
+            trace_id=run_id,
+            dotted_order=f"{start:%Y%m%dT%H%M%S%fZ}{run_id}",
+            start_time=start,
+        )
+    started = time.monotonic()
+    sent = client.flush(FLUSH_TIMEOUT)
+    print(json.dumps({"sent": sent, "seconds": time.monotonic() - started}))
+    sys.stdout.flush()
+    # Lambda の凍結やプロセスの強制終了と同じく、後片付けをせずに終了
+    os._exit(0)
+
+
+def received(server, run_ids):
+    with server.lock:
+        data = b"".join(server.bodies)
+    return {run_id for run_id in run_ids if run_id.encode() in data}
+
+
+def main():
+    spool_dir = tempfile.mkdtemp(prefix="trace-spool-")
+    run_ids = [str(uuid.uuid4()) for _ in range(RUNS)]
+
+    # 1. サーバーが失敗を返す間に送信し、flush が予算内に戻ることを確認
+    down = start_server(failing=True)
+    output = subprocess.run(
+        [sys.executable, __file__, "emit", f"http://127.0.0.1:{down.server_port}",
+         spool_dir, *run_ids],
+        capture_output=True,
+        text=True,
+        check=True,
+    ).stdout
+    result = json.loads(output.strip().splitlines()[-1])
+    down.shutdown()
+    print(f"失敗中の flush: sent={result['sent']} {result['seconds']:.2f}秒")
+    assert not result["sent"], "失敗したバッチが送信済みと報告された"
+    assert result["seconds"] < FLUSH_TIMEOUT + 1, "flush が予算を超えて待った"
+
+    # 2. 次のクライアントがスプールを再送することを確認
+    up = start_server(failing=False)
+    os.environ["LANGSMITH_TRACING_SPOOL_DIR"] = spool_dir
+    from langsmith import Client
+
+    client = Client(api_url=f"http://127.0.0.1:{up.server_port}", api_key="stand-in")
+    # 再送はバックグラウンドスレッドが起動時にキューへ戻す
+    deadline = time.monotonic() + 30
+    while len(received(up, run_ids)) < RUNS and time.monotonic() < deadline:
+        client.flush(FLUSH_TIMEOUT)
+        time.sleep(0.1)
+    got = received(up, run_ids)
+    up.shutdown()
+    print(f"再送された実行: {len(got)}/{RUNS}")
+    assert len(got) == RUNS, "スプールの実行が再送されなかった"
+    print("OK")
+
+
+if __name__ == "__main__":
+    if len(sys.argv) > 1 and sys.argv[1] == "emit":
+        emit(sys.argv[2], sys.argv[3], sys.argv[4:])
+    else:
+        main()
@@ -3,6 +3,8 @@ import streamlit as st
 from bs4 import BeautifulSoup
 from langchain import hub
 from langchain.agents import AgentExecutor, Tool, create_xml_agent
+from langchain.agents.format_scratchpad import IncrementalScratchpad
+from langchain.agents.format_scratchpad.xml import format_xml_step
 from langchain_aws import ChatBedrock
 from langchain_community.document_loaders import WebBaseLoader
 from langchain_community.tools import DuckDuckGoSearchRun
@@ -42,7 +44,14 @@ chat = ChatBedrock(
 )
 
 # エージェントの設定
-agent = create_xml_agent(chat, tools, prompt=hub.pull("hwchase17/xml-agent-convo"))
+# Webページの内容は長くなるため、ツールの実行結果は8000文字までに切り詰める
+scratchpad = IncrementalScratchpad(format_xml_step, max_observation_length=8000)
+agent = create_xml_agent(
+    chat,
+    tools,
+    prompt=hub.pull("hwchase17/xml-agent-convo"),
+    format_scratchpad=scratchpad,
+)
 
 agent_executor = AgentExecutor(
     agent=agent,